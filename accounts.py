@@ -0,0 +1,101 @@
+"""
+Accounts - X hesapları ve kategoriye göre yönlendirme
+=====================================================
+Bot birbirinden farklı içerik akışları üretiyor (trademark, weird, SEC,
+tech news). accounts.json ile bu akışlar ayrı X hesaplarına dağıtılır; her
+hesabın kendi istemcisi (clients.py), kotası (post_quota.py) ve outbox
+lane'i var. Lane'ler birbirini beklemeden aynı anda gönderir, hesap
+eklemek toplam gönderim kapasitesini artırır.
+
+accounts.json (Opsiyonel; yoksa tek hesap: main, X_* env):
+    {
+      "accounts": {
+        "main":  {"env_prefix": "X_"},
+        "weird": {"env_prefix": "X_WEIRD_", "routes": ["weird"]},
+        "money": {"env_prefix": "X_MONEY_", "routes": ["sec", "news"]}
+      }
+    }
+
+Route anahtarları: trademark, weird (weird kategorili trademark), sec, news,
+report. Hiçbir hesaba atanmamış anahtar DEFAULT_ACCOUNT'a gider. Key'leri
+env'de eksik olan hesap devre dışı sayılır, içeriği main'e düşer.
+"""
+
+import os
+import json
+import logging
+from typing import Dict, List, NamedTuple, Optional
+
+ACCOUNTS_FILE = os.getenv("ACCOUNTS_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "accounts.json"))
+DEFAULT_ACCOUNT = "main"
+DEFAULT_ENV_PREFIX = "X_"
+REQUIRED_KEYS = ("API_KEY", "API_SECRET", "ACCESS_TOKEN", "ACCESS_TOKEN_SECRET")
+
+
+class Account(NamedTuple):
+    name: str
+    env_prefix: str          # "X_WEIRD_" -> X_WEIRD_API_KEY, X_WEIRD_BEARER_TOKEN...
+    routes: List[str]
+
+    def credential(self, key: str) -> Optional[str]:
+        return os.getenv(f"{self.env_prefix}{key}")
+
+    @property
+    def enabled(self) -> bool:
+        """main her zaman açık (Eksik key post anında hata verir); diğerleri key'leri varsa"""
+        return self.name == DEFAULT_ACCOUNT or all(self.credential(key) for key in REQUIRED_KEYS)
+
+
+def load_accounts(path: str = ACCOUNTS_FILE) -> Dict[str, Account]:
+    """accounts.json -> {isim: Account} (main her zaman var)"""
+    raw = {}
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                raw = json.load(f).get('accounts', {})
+        except (OSError, ValueError, AttributeError) as e:
+            logging.error(f"❌ {path} okunamadı, tek hesap kullanılıyor: {e}")
+            raw = {}
+
+    accounts = {DEFAULT_ACCOUNT: Account(DEFAULT_ACCOUNT, DEFAULT_ENV_PREFIX, [])}
+    for name, config in raw.items():
+        accounts[name] = Account(name, config.get('env_prefix', DEFAULT_ENV_PREFIX), list(config.get('routes', [])))
+    return accounts
+
+
+_accounts: Optional[Dict[str, Account]] = None
+
+
+def get_accounts() -> Dict[str, Account]:
+    global _accounts
+    if _accounts is None:
+        _accounts = load_accounts()
+        disabled = [name for name, account in _accounts.items() if not account.enabled]
+        if disabled:
+            logging.warning(f"🔌 Key'leri eksik hesaplar devre dışı (İçerik {DEFAULT_ACCOUNT}'e): {', '.join(disabled)}")
+    return _accounts
+
+
+def get_account(name: str) -> Account:
+    return get_accounts().get(name) or get_accounts()[DEFAULT_ACCOUNT]
+
+
+def route_key(source: str, record: Optional[Dict] = None) -> str:
+    """Outbox kaynağı + kayıt -> route anahtarı (weird trademark ayrı akış)"""
+    if source == 'trademark' and record and record.get('category') == 'weird':
+        return 'weird'
+    return source
+
+
+def route(source: str, record: Optional[Dict] = None) -> str:
+    """İçeriğin gideceği hesap (Açık hesaplar arasında routes'unda anahtar olan ilk hesap)"""
+    key = route_key(source, record)
+    for name, account in get_accounts().items():
+        if key in account.routes and account.enabled:
+            return name
+    return DEFAULT_ACCOUNT
+
+
+def client_name(kind: str, account: str = DEFAULT_ACCOUNT) -> str:
+    """clients.py registry adı: ('x', 'weird') -> 'x:weird' (main için eski isim: 'x')"""
+    return kind if account == DEFAULT_ACCOUNT else f"{kind}:{account}"
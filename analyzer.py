@@ -3,15 +3,15 @@ import logging
 from collections import Counter
 from typing import List, Dict, Tuple
 from datetime import datetime
-from history_manager import HistoryManager
+from record_store import RecordStore
 
 class Analyzer:
     def __init__(self):
-        self.history = HistoryManager()
+        self.store = RecordStore()
 
     def generate_weekly_report(self) -> str:
         """Son 7 günün trendlerini analiz et ve rapor oluştur"""
-        recent_data = self.history.get_recent_data(days=7)
+        recent_data = self.store.window(days=7)
         
         if not recent_data:
             return "❌ Yeterli veri yok (Son 7 gün boş)."
@@ -32,9 +32,8 @@ class Analyzer:
         top_keywords = keyword_counts.most_common(3)
         
         # 2. Şirket Analizi
-        exclude_owners = ['UNKNOWN', 'N/A', '']
-        owners = [tm.get('owner') for tm in recent_data if tm.get('owner') not in exclude_owners]
-        top_owners = Counter(owners).most_common(3)
+        # Owner varyantları ("Apple Inc." / "APPLE INC") tek entity ID'de toplanır, boş/UNKNOWN owner ID almaz
+        top_owners = self.store.owners.top((tm.get('owner_id') for tm in recent_data), n=3)
         
         # 3. Rapor Oluştur
         report = f"📊 HAFTALIK PATENT RAPORU ({datetime.now().strftime('%d %b')})\n\n"
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+State dosyaları için serializer benchmark'ı
+Gerçek dosyalarımız üzerinde her formatın load/dump süresini ve boyutunu ölçer.
+
+Kullanım:
+    python bench_serialization.py                       # Varsayılan state dosyaları
+    python bench_serialization.py history.json -n 10    # Belirli dosya, 10 tekrar
+"""
+import os
+import sys
+import time
+import argparse
+
+import serializers
+
+DEFAULT_FILES = ["daily_cache.json", "history.json", "posted_tweets.json", "wide_scan.json"]
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_file(path: str, formats: list, repeat: int) -> list:
+    with open(path, 'rb') as f:
+        raw = f.read()
+    obj = serializers.loads(raw)  # State dosyası: pickle kabul edilmez
+
+    rows = []
+    for fmt in formats:
+        ser = serializers.get_serializer(fmt)
+        try:
+            payload = ser.dumps(obj)
+        except Exception as e:
+            print(f"   ⚠️ {fmt}: {e}")
+            continue
+        if ser.loads(payload) != obj:
+            print(f"   ⚠️ {fmt}: round-trip farklı sonuç verdi, atlanıyor")
+            continue
+
+        rows.append({
+            "format": fmt,
+            "size": len(payload),
+            "dump_ms": _best_of(lambda: ser.dumps(obj), repeat) * 1000,
+            "load_ms": _best_of(lambda: ser.loads(payload), repeat) * 1000,
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="State serializer benchmark")
+    parser.add_argument("files", nargs="*", default=DEFAULT_FILES)
+    parser.add_argument("-n", "--repeat", type=int, default=5, help="Tekrar sayısı (en iyisi raporlanır)")
+    parser.add_argument("-f", "--formats", nargs="*", default=None, help="Sadece bu formatlar")
+    args = parser.parse_args()
+
+    formats = args.formats or serializers.available_formats()
+    print(f"⚙️  JSON backend: {'orjson' if serializers.orjson else 'stdlib json'} | "
+          f"msgpack: {'var' if serializers.msgpack else 'yok'}")
+
+    for path in args.files:
+        if not os.path.exists(path):
+            print(f"\n⏩ {path} yok, atlanıyor")
+            continue
+
+        original = os.path.getsize(path)
+        print(f"\n📄 {path} ({original / 1024:.0f} KB)")
+        print(f"   {'FORMAT':<16}{'SIZE KB':>10}{'DUMP ms':>10}{'LOAD ms':>10}")
+
+        rows = bench_file(path, formats, args.repeat)
+        for row in sorted(rows, key=lambda r: r["load_ms"] + r["dump_ms"]):
+            print(f"   {row['format']:<16}{row['size'] / 1024:>10.0f}{row['dump_ms']:>10.1f}{row['load_ms']:>10.1f}")
+
+        if rows:
+            fastest = min(rows, key=lambda r: r["load_ms"] + r["dump_ms"])
+            print(f"   🏆 En hızlı: {fastest['format']}")
+
+    print("\nSeçmek için: FILINGWATCH_STATE_FORMAT=<format>")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
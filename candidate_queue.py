@@ -0,0 +1,205 @@
+"""
+Candidate Queue - Günler arası kalıcı aday kuyruğu
+===================================================
+Eskiden her çalışma günün tüm kayıtlarını sıralayıp ilk N'i alıyordu; kıl payı
+kaybedenler gece yarısı unutuluyordu. Artık puanlanan kayıtlar ingest sırasında
+bu kuyruğa girer, her çalışma sadece en iyileri okur.
+
+    normal  -> score > 0 olan kayıtlar
+    weird   -> WeirdFilter'ın is_weird dediği kayıtlar (weird_score ile)
+
+Yaşa göre azalma: etkin puan = score * 2^(-yaş / yarı ömür). Sıralama anahtarı
+log2(score) + pushed_at / yarı ömür zamandan bağımsızdır (Her an aynı sırayı
+verir), bu yüzden kuyruk bir kere sıralanır, çalışmalar arasında yeniden
+hesaplanmaz. TTL'i geçen kayıtlar düşer, kuyruk QUEUE_MAX_SIZE ile sınırlı.
+Adaylar paylaşılınca (save_posted) kuyruktan çıkar; dry-run kuyruğu bozmaz.
+
+Sıralı lane'ler process içinde bellekte tutulur: dosya (mtime + boyut) ve
+rules_version değişmedikçe peek yeniden yükleyip sıralamaz. Yükleme sırasında
+yeniden puanlanan / süresi dolan kayıtlar diske de yazılır, aynı iş bir
+sonraki çalışmada tekrarlanmaz.
+"""
+
+import os
+import math
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sortedcontainers import SortedKeyList
+
+from state_store import StateStore, StaleStateError
+from scoring import is_stale, rules_version, score_records
+
+CANDIDATE_QUEUE_FILE = "candidate_queue.json"
+LANES = ("normal", "weird")
+
+QUEUE_MAX_SIZE = 500           # Kuyruk (lane) başına max aday
+QUEUE_HALF_LIFE_HOURS = 24     # Etkin puan her 24 saatte yarıya iner
+QUEUE_TTL_HOURS = 72           # 3 günden eski aday düşer
+
+
+def _lane_score(tm: Dict, lane: str) -> Optional[float]:
+    """Kaydın bu lane'deki puanı (Uygun değilse None)"""
+    if lane == "weird":
+        return tm.get('weird_score') if tm.get('is_weird') else None
+    score = tm.get('score') or 0
+    return score if score > 0 else None
+
+
+def _timestamp(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+class CandidateQueue:
+    def __init__(self, path: str = CANDIDATE_QUEUE_FILE, max_size: int = QUEUE_MAX_SIZE,
+                 half_life_hours: float = QUEUE_HALF_LIFE_HOURS, ttl_hours: float = QUEUE_TTL_HOURS):
+        self.path = path
+        self.max_size = max_size
+        self.half_life = half_life_hours * 3600
+        self.ttl = ttl_hours * 3600
+        self.store = StateStore(path, default=lambda: {lane: [] for lane in LANES})
+        self._lock = threading.RLock()   # Outbox lane thread'leri remove çağırabilir
+        self._lanes: Optional[Dict[str, SortedKeyList]] = None
+        self._loaded_as = None           # (Dosya imzası, rules_version) - bellekteki lane'ler bunun
+
+    # ============== ÖNCELİK ==============
+
+    def _key(self, entry: Dict):
+        """Zamandan bağımsız sıralama anahtarı (Büyük öncelik önde)"""
+        return (-(math.log2(entry['score']) + entry['pushed_at'] / self.half_life), entry['serial'])
+
+    def effective_score(self, entry: Dict, now: Optional[float] = None) -> float:
+        """Yaşa göre azalmış puan"""
+        now = now if now is not None else datetime.now().timestamp()
+        return entry['score'] * 2 ** (-(now - entry['pushed_at']) / self.half_life)
+
+    def _load_lanes(self, data: Dict, now: float) -> Tuple[Dict[str, SortedKeyList], bool]:
+        """Süresi dolanları at, eski kurallarla puanlananları yeniden puanla, sırala.
+        Returns: (lane'ler, diske yazılması gereken değişiklik var mı)"""
+        version = rules_version()
+        stale = [entry['record'] for lane in LANES for entry in data.get(lane, [])
+                 if is_stale(entry['record'], version)]
+        if stale:
+            score_records(stale)
+        changed = bool(stale)
+
+        lanes = {}
+        for lane in LANES:
+            entries = []
+            for entry in data.get(lane, []):
+                score = _lane_score(entry['record'], lane) if now - entry['pushed_at'] <= self.ttl else None
+                if score is None:
+                    changed = True
+                    continue
+                if entry['score'] != score:
+                    entry['score'] = score
+                    changed = True
+                entries.append(entry)
+            lanes[lane] = SortedKeyList(entries, key=self._key)
+        return lanes, changed
+
+    @staticmethod
+    def _store_lanes(data: Dict, lanes: Dict[str, SortedKeyList]):
+        for lane, queue in lanes.items():
+            data[lane] = list(queue)
+
+    def _signature(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _remember(self, lanes: Dict[str, SortedKeyList]):
+        self._lanes = lanes
+        self._loaded_as = (self._signature(), rules_version())
+
+    def _current_lanes(self, now: float) -> Dict[str, SortedKeyList]:
+        """Bellekteki sıralı lane'ler; dosya ya da kurallar değiştiyse yeniden yükle"""
+        if self._lanes is not None and self._loaded_as == (self._signature(), rules_version()):
+            return self._lanes
+        data = self.store.load()
+        lanes, changed = self._load_lanes(data, now)
+        if changed:
+            self._store_lanes(data, lanes)
+            try:
+                self.store.save(data, expected_version=StateStore.version_of(data))
+            except StaleStateError:
+                return lanes  # Başka process yazdı: bu sefer bellekteki sonuç, sonraki çağrı yeniden yükler
+        self._remember(lanes)
+        return lanes
+
+    # ============== YAZMA ==============
+
+    def push(self, records: Iterable[Dict], now: Optional[float] = None) -> int:
+        """Puanlanmış kayıtları kuyruğa ekle (Serial bazında tekil). Returns: eklenen sayısı"""
+        now = now if now is not None else datetime.now().timestamp()
+        records = list(records)
+        added = 0
+        with self._lock, self.store.transaction() as data:
+            lanes, _ = self._load_lanes(data, now)
+            for lane, queue in lanes.items():
+                serials = {entry['serial'] for entry in queue}
+                for tm in records:
+                    serial = tm.get('serial_number')
+                    score = _lane_score(tm, lane)
+                    if not serial or score is None or serial in serials:
+                        continue
+                    pushed_at = _timestamp(tm.get('scanned_at')) or now
+                    if now - pushed_at > self.ttl:
+                        continue
+                    queue.add({'serial': serial, 'score': score, 'pushed_at': pushed_at, 'record': tm})
+                    serials.add(serial)
+                    added += 1
+                    if len(queue) > self.max_size:
+                        serials.discard(queue.pop(-1)['serial'])  # En düşük öncelikliyi at
+            self._store_lanes(data, lanes)
+        with self._lock:
+            self._remember(lanes)
+        if added:
+            logging.info(f"📥 Aday kuyruğu: +{added} aday")
+        return added
+
+    def remove(self, serials: Iterable[str]):
+        """Paylaşılan adayları tüm lane'lerden çıkar"""
+        serials = set(serials)
+        if not serials:
+            return
+        with self._lock:
+            with self.store.transaction() as data:
+                lanes, _ = self._load_lanes(data, datetime.now().timestamp())
+                for queue in lanes.values():
+                    for entry in [entry for entry in queue if entry['serial'] in serials]:
+                        queue.remove(entry)
+                self._store_lanes(data, lanes)
+            self._remember(lanes)
+
+    # ============== OKUMA ==============
+
+    def peek(self, n: int, lane: str = "normal", exclude: Optional[Set[str]] = None) -> List[Dict]:
+        """En iyi n adayın kayıtları (Kuyruktan çıkarmaz - paylaşılınca remove edilir)"""
+        now = datetime.now().timestamp()
+        with self._lock:
+            queue = self._current_lanes(now)[lane]
+        exclude = exclude or set()
+        best = []
+        for entry in queue:
+            if len(best) >= n:
+                break
+            if entry['serial'] in exclude or now - entry['pushed_at'] > self.ttl:
+                continue  # Süresi bu çalışmada dolanlar bir sonraki yazmada düşer
+            record = dict(entry['record'])
+            record['queue_score'] = round(self.effective_score(entry, now), 2)
+            best.append(record)
+        return best
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(queue) for queue in self._current_lanes(datetime.now().timestamp()).values())
@@ -0,0 +1,136 @@
+"""
+Clients - Process genelinde tek OpenAI / X istemcisi
+====================================================
+Eskiden her yorum yeni bir OpenAI(...), her tweet yeni tweepy Client + v1.1 API
+kuruyordu; her çağrı TLS el sıkışmasını baştan ödüyordu. Registry istemcileri
+ilk kullanımda bir kere kurar ve saklar, HTTP bağlantıları (httpx / requests
+Session havuzu) çağrılar arasında açık kalır.
+
+    openai  OpenAI(timeout=OPENAI_TIMEOUT, max_retries=0)
+    x       tweepy.Client (v2, tweet atma)
+    x_v1    tweepy.API (v1.1, medya yükleme)
+
+Çoklu hesap (accounts.py): "x:weird" / "x_v1:weird" o hesabın key'leriyle
+kurulur, her hesabın kendi bağlantı havuzu olur. "x" = main hesap.
+
+İstemci sadece yetki hatasında (401 / geçersiz key) atılır, bir sonraki
+kullanımda güncel env ile yeniden kurulur; diğer hatalar sıcak bağlantıyı bozmaz.
+
+Kullanım:
+    with using("openai") as client:
+        client.chat.completions.create(...)
+"""
+
+import os
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import openai
+import requests
+import tweepy
+
+from accounts import DEFAULT_ACCOUNT, get_account
+
+OPENAI_TIMEOUT = 15     # Saniye, tek OpenAI çağrısı (Retry yok: yedek klasik format var)
+X_TIMEOUT = 30          # Saniye, X API (Tweet + medya yükleme)
+
+
+class _TimeoutSession(requests.Session):
+    """
+    Varsayılan timeout'lu Session (tweepy.Client timeout parametresi almıyor).
+    Son cevabın header'larını tutar: tweepy başarılı cevapta header döndürmüyor,
+    post_tweet rate limit kotasını buradan okur.
+    """
+
+    def __init__(self, timeout: float):
+        super().__init__()
+        self.timeout = timeout
+        self.last_headers = None
+
+    def request(self, *args, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        response = super().request(*args, **kwargs)
+        self.last_headers = response.headers
+        return response
+
+
+def _create_openai():
+    return openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"), timeout=OPENAI_TIMEOUT, max_retries=0)
+
+
+def _create_x(account: str = DEFAULT_ACCOUNT):
+    creds = get_account(account).credential
+    client = tweepy.Client(
+        bearer_token=creds("BEARER_TOKEN"),
+        consumer_key=creds("API_KEY"),
+        consumer_secret=creds("API_SECRET"),
+        access_token=creds("ACCESS_TOKEN"),
+        access_token_secret=creds("ACCESS_TOKEN_SECRET")
+    )
+    client.session = _TimeoutSession(X_TIMEOUT)
+    return client
+
+
+def _create_x_v1(account: str = DEFAULT_ACCOUNT):
+    creds = get_account(account).credential
+    auth = tweepy.OAuth1UserHandler(creds("API_KEY"), creds("API_SECRET"),
+                                    creds("ACCESS_TOKEN"), creds("ACCESS_TOKEN_SECRET"))
+    return tweepy.API(auth, timeout=X_TIMEOUT)
+
+
+def is_auth_error(error: BaseException) -> bool:
+    """İstemciyi yeniden kurmayı gerektiren hata mı? (403 X'te genelde içerik hatası, sayılmaz)"""
+    return isinstance(error, (openai.AuthenticationError, openai.PermissionDeniedError, tweepy.Unauthorized))
+
+
+class ClientRegistry:
+    """İsim -> tembel kurulan, paylaşılan istemci (Thread-safe). "tür:hesap" -> factory(hesap)"""
+
+    def __init__(self, factories: Dict[str, Callable[[], Any]]):
+        self._factories = dict(factories)
+        self._clients: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Any:
+        client = self._clients.get(name)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(name)
+                if client is None:
+                    kind, _, account = name.partition(':')
+                    factory = self._factories[kind]
+                    client = self._clients[name] = factory(account) if account else factory()
+        return client
+
+    def reset(self, name: Optional[str] = None):
+        """İstemciyi at (Bir sonraki get yeniden kurar). name=None: hepsi"""
+        with self._lock:
+            if name is None:
+                self._clients.clear()
+            else:
+                self._clients.pop(name, None)
+
+    @contextmanager
+    def using(self, name: str) -> Iterator[Any]:
+        """İstemciyi kullan; yetki hatasında istemciyi sıfırla ve hatayı yükselt"""
+        client = self.get(name)
+        try:
+            yield client
+        except Exception as e:
+            if is_auth_error(e):
+                logging.warning(f"🔑 {name} yetki hatası, istemci yeniden kurulacak: {e}")
+                self.reset(name)
+            raise
+
+
+CLIENTS = ClientRegistry({
+    'openai': _create_openai,
+    'x': _create_x,
+    'x_v1': _create_x_v1,
+})
+
+get_client = CLIENTS.get
+using = CLIENTS.using
+reset_clients = CLIENTS.reset
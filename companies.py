@@ -0,0 +1,295 @@
+"""
+Şirket sözlükleri ve ortak şirket eşleştirici
+=============================================
+KNOWN_COMPANIES / KNOWN_TICKERS (main_v2), INTERESTING_OWNERS (TrademarkFilter)
+ve BIG_COMPANIES (find_interesting) tek bir yerde. Hepsi için import anında
+TEK bir regex derlenir; owner string'i bir kez taranır ve şirket, handle ve
+ticker aynı geçişte bulunur.
+"""
+
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+
+# Company Handles Tracking
+KNOWN_COMPANIES = {
+    "APPLE": "@Apple",
+    "GOOGLE": "@Google",
+    "AMAZON": "@amazon",
+    "MICROSOFT": "@Microsoft",
+    "META PLATFORMS": "@Meta",
+    "FACEBOOK": "@Meta",
+    "TESLA": "@Tesla",
+    "SPACEX": "@SpaceX",
+    "NETFLIX": "@netflix",
+    "DISNEY": "@Disney",
+    "NVIDIA": "@nvidia",
+    "SAMSUNG": "@Samsung",
+    "SONY": "@Sony",
+    "NIKE": "@Nike",
+    "ADIDAS": "@adidas",
+    "INTEL": "@intel",
+    "AMD": "@AMD",
+    "IBM": "@IBM",
+    "ORACLE": "@Oracle",
+    "UBER": "@Uber",
+    "AIRBNB": "@Airbnb",
+    "SPOTIFY": "@Spotify",
+    "PAYPAL": "@PayPal",
+    "SNAP INC": "@Snap",
+    "REDDIT": "@Reddit",
+    "ZOOM VIDEO": "@Zoom",
+    "SALESFORCE": "@Salesforce",
+    "ADOBE": "@Adobe",
+    
+    # AUTO
+    "FORD": "@Ford",
+    "GENERAL MOTORS": "@GM",
+    "TOYOTA": "@Toyota",
+    "HONDA": "@Honda",
+    "BMW": "@BMW",
+    "MERCEDES": "@MercedesBenz",
+    "PORSCHE": "@Porsche",
+    "FERRARI": "@Ferrari",
+    "HYUNDAI": "@Hyundai_Global",
+    "RIVIAN": "@Rivian",
+    "LUCID": "@LucidMotors",
+    
+    # FOOD & BEV
+    "COCA-COLA": "@CocaCola",
+    "PEPSICO": "@PepsiCo",
+    "MCDONALD'S": "@McDonalds",
+    "STARBUCKS": "@Starbucks",
+    "BURGER KING": "@BurgerKing",
+    "KFC": "@kfc",
+    "TACO BELL": "@tacobell",
+    "NESTLE": "@Nestle",
+    "DANONE": "@Danone",
+    "RED BULL": "@redbull",
+    
+    # RETAIL & FASHION
+    "WALMART": "@Walmart",
+    "TARGET": "@Target",
+    "HOME DEPOT": "@HomeDepot",
+    "COSTCO": "@Costco",
+    "LOUIS VUITTON": "@LouisVuitton",
+    "GUCCI": "@gucci",
+    "PRADA": "@Prada",
+    "ROLEX": "@ROLEX",
+    "LEGO": "@LEGO_Group",
+    "IKEA": "@IKEA",
+    
+    # FINANCE
+    "VISA": "@Visa",
+    "MASTERCARD": "@Mastercard",
+    "AMERICAN EXPRESS": "@AmericanExpress",
+    "JPMORGAN": "@jpmorgan",
+    "GOLDMAN SACHS": "@GoldmanSachs",
+    "COINBASE": "@coinbase",
+    "BINANCE": "@binance",
+    "BLOCK INC": "@blocks", # Square
+    
+    # MEDIA & GAMES
+    "WARNER BROS": "@wbd",
+    "UNIVERSAL": "@UniversalPics",
+    "NINTENDO": "@NintendoAmerica",
+    "ACTIVISION": "@Activision",
+    "ELECTRONIC ARTS": "@EA",
+    "EPIC GAMES": "@EpicGames",
+    "ROBLOX": "@Roblox",
+    "OPENAI": "@OpenAI",
+}
+
+# Stock Tickers (Cashtags) - Public Companies Only
+KNOWN_TICKERS = {
+    "APPLE": "$AAPL",
+    "GOOGLE": "$GOOGL",
+    "AMAZON": "$AMZN",
+    "MICROSOFT": "$MSFT",
+    "META PLATFORMS": "$META",
+    "FACEBOOK": "$META",
+    "TESLA": "$TSLA",
+    "NETFLIX": "$NFLX",
+    "DISNEY": "$DIS",
+    "NVIDIA": "$NVDA",
+    "SAMSUNG": "$SSNLF",
+    "SONY": "$SONY",
+    "NIKE": "$NKE",
+    "ADIDAS": "$ADDYY",
+    "INTEL": "$INTC",
+    "AMD": "$AMD",
+    "IBM": "$IBM",
+    "ORACLE": "$ORCL",
+    "UBER": "$UBER",
+    "AIRBNB": "$ABNB",
+    "SPOTIFY": "$SPOT",
+    "PAYPAL": "$PYPL",
+    "SNAP INC": "$SNAP",
+    "REDDIT": "$RDDT",
+    "ZOOM VIDEO": "$ZM",
+    "SALESFORCE": "$CRM",
+    "ADOBE": "$ADBE",
+    "FORD": "$F",
+    "GENERAL MOTORS": "$GM",
+    "TOYOTA": "$TM",
+    "HONDA": "$HMC",
+    "BMW": "$BMWYY",
+    "MERCEDES": "$MBGYY",
+    "PORSCHE": "$DRPRY",
+    "FERRARI": "$RACE",
+    "RIVIAN": "$RIVN",
+    "LUCID": "$LCID",
+    "COCA-COLA": "$KO",
+    "PEPSICO": "$PEP",
+    "MCDONALD'S": "$MCD",
+    "STARBUCKS": "$SBUX",
+    "BURGER KING": "$QSR",
+    "KFC": "$YUM",
+    "TACO BELL": "$YUM",
+    "NESTLE": "$NSRGY",
+    "DANONE": "$DANOY",
+    "WALMART": "$WMT",
+    "TARGET": "$TGT",
+    "HOME DEPOT": "$HD",
+    "COSTCO": "$COST",
+    "LOUIS VUITTON": "$LVMUY",
+    "GUCCI": "$PPRUY",
+    "VISA": "$V",
+    "MASTERCARD": "$MA",
+    "AMERICAN EXPRESS": "$AXP",
+    "JPMORGAN": "$JPM",
+    "GOLDMAN SACHS": "$GS",
+    "COINBASE": "$COIN",
+    "BLOCK INC": "$SQ",
+    "WARNER BROS": "$WBD",
+    "UNIVERSAL": "$CMCSA",
+    "NINTENDO": "$NTDOY",
+    "ELECTRONIC ARTS": "$EA",
+    "ROBLOX": "$RBLX"
+}
+
+# İlginç şirketler
+INTERESTING_OWNERS = [
+    "apple", "google", "meta", "microsoft", "amazon", "nvidia", "tesla",
+    "openai", "anthropic", "alphabet", "facebook", "instagram", "whatsapp",
+    "netflix", "disney", "warner", "sony", "samsung", "huawei", "xiaomi",
+    "tiktok", "bytedance", "twitter", "spacex", "uber", "airbnb", "stripe",
+    "coinbase", "binance", "palantir", "snowflake", "databricks", "figma"
+]
+
+# BÜYÜK ŞİRKETLER (owner'da aranacak)
+BIG_COMPANIES = [
+    'APPLE', 'GOOGLE', 'ALPHABET', 'META', 'FACEBOOK', 'MICROSOFT', 
+    'AMAZON', 'TESLA', 'NVIDIA', 'OPENAI', 'ANTHROPIC', 'SPACEX',
+    'NETFLIX', 'DISNEY', 'WARNER', 'SONY', 'SAMSUNG', 'INTEL',
+    'AMD', 'QUALCOMM', 'ORACLE', 'SALESFORCE', 'ADOBE', 'PAYPAL',
+    'STRIPE', 'COINBASE', 'ROBINHOOD', 'UBER', 'LYFT', 'AIRBNB',
+    'DOORDASH', 'INSTACART', 'SNAP', 'TWITTER', 'X CORP', 'TIKTOK',
+    'BYTEDANCE', 'ALIBABA', 'TENCENT', 'BAIDU', 'HUAWEI', 'XIAOMI'
+]
+
+# ÜNLÜ MARKALAR (Lookalike tespiti için - sadece ayırt edici isimler,
+# "APPLE", "TARGET", "SHELL" gibi sözlük kelimeleri yanlış alarm üretir)
+FAMOUS_MARKS = [
+    'GOOGLE', 'YOUTUBE', 'MICROSOFT', 'WINDOWS', 'AMAZON', 'NETFLIX', 'FACEBOOK',
+    'INSTAGRAM', 'WHATSAPP', 'TWITTER', 'TIKTOK', 'SNAPCHAT', 'LINKEDIN', 'REDDIT',
+    'NVIDIA', 'TESLA', 'SPACEX', 'SAMSUNG', 'IPHONE', 'MACBOOK', 'PLAYSTATION',
+    'NINTENDO', 'POKEMON', 'DISNEY', 'SPOTIFY', 'PAYPAL', 'COINBASE', 'BINANCE',
+    'OPENAI', 'CHATGPT', 'ANTHROPIC', 'UBER', 'AIRBNB', 'DOORDASH', 'ROBLOX',
+    'MINECRAFT', 'FORTNITE', 'STARBUCKS', 'MCDONALDS', 'COCA-COLA', 'PEPSI',
+    'RED BULL', 'DORITOS', 'NIKE', 'ADIDAS', 'REEBOK', 'GUCCI', 'PRADA', 'ROLEX',
+    'CHANEL', 'LOUIS VUITTON', 'LEGO', 'BARBIE', 'WALMART', 'COSTCO', 'IKEA',
+    'FERRARI', 'PORSCHE', 'LAMBORGHINI', 'TOYOTA', 'HYUNDAI', 'MASTERCARD',
+]
+
+# Ünlü markalara yazımca / okunuşça yakın sözlük kelimeleri, isimler ve yer adları
+# (Lookalike / soundalike sinyali vermez: "CHANNEL" kanal demek, Chanel taklidi değil)
+COMMON_WORDS = {
+    'CHANNEL', 'CHANNELS', 'WINDOW', 'OPENAIR', 'FINANCE', 'LINKED', 'GOGGLE', 'GOGGLES',
+    'GOOGOL', 'LEGGO', 'PEPSIN', 'MASTERCARE', 'AMAZONS', 'AMAZONIA', 'AMAZONIAN',
+    'AMAZONAS', 'PRADO', 'PRAVDA', 'INVIDIA', 'ENVIDIA', 'SAMSUN', 'FERRARA', 'BARBIER',
+    'STARBUCK', 'MCDONALD', 'NIKKI', 'NIKKY', 'NICKY', 'NIKKO',
+}
+
+
+class CompanyMatch(NamedTuple):
+    company: str            # KNOWN_COMPANIES anahtarı (örn: "APPLE")
+    handle: Optional[str]   # "@Apple"
+    ticker: Optional[str]   # "$AAPL"
+
+
+class CompanyMatcher:
+    """
+    Birden çok sözlük için tek derlenmiş matcher (Tam kelime eşleşmesi, büyük/küçük harf duyarsız).
+    Sözlük sırası önceliktir: birden çok şirket eşleşirse, eski döngülerdeki gibi
+    sözlükte ilk sırada olan kazanır.
+    """
+
+    def __init__(self, vocabularies: Dict[str, Iterable[str]]):
+        # vocab -> {lower_name: (priority, display_name)}
+        self.vocabularies: Dict[str, Dict[str, tuple]] = {}
+        names: Set[str] = set()
+        for vocab, entries in vocabularies.items():
+            table = {}
+            for priority, display in enumerate(entries):
+                key = display.lower()
+                table.setdefault(key, (priority, display))
+                names.add(key)
+            self.vocabularies[vocab] = table
+
+        # Uzun isimler önce denenir; lookahead sayesinde çakışan eşleşmeler de yakalanır
+        alternation = '|'.join(re.escape(n) for n in sorted(names, key=len, reverse=True))
+        self._regex = re.compile(r'(?=\b(' + alternation + r')\b)')
+
+        # Aynı noktadan başlayan daha kısa isimler (örn: "snap" / "snap inc")
+        self._prefixes: Dict[str, List[re.Pattern]] = {}
+        for name in names:
+            self._prefixes[name] = [
+                re.compile(re.escape(other) + r'\b')
+                for other in names if other != name and name.startswith(other)
+            ]
+
+    def find_all(self, text: Optional[str]) -> Set[str]:
+        """Metindeki tüm şirket isimleri (lowercase) - tek geçiş"""
+        if not text:
+            return set()
+        text = text.lower()
+        found = set()
+        for m in self._regex.finditer(text):
+            name = m.group(1)
+            found.add(name)
+            for prefix in self._prefixes[name]:
+                short = prefix.match(text, m.start(1))
+                if short:
+                    found.add(short.group(0))
+        return found
+
+    def first(self, text: Optional[str], vocab: str, found: Optional[Set[str]] = None) -> Optional[str]:
+        """Sözlükteki en öncelikli eşleşme (Orijinal yazımıyla)"""
+        if found is None:
+            found = self.find_all(text)
+        table = self.vocabularies[vocab]
+        hits = [table[name] for name in found if name in table]
+        return min(hits)[1] if hits else None
+
+    def match(self, owner: Optional[str]) -> Optional[CompanyMatch]:
+        """Owner -> (şirket, handle, ticker) tek geçişte"""
+        found = self.find_all(owner)
+        if not found:
+            return None
+        company = self.first(owner, 'companies', found)
+        ticker_company = self.first(owner, 'tickers', found)
+        if not company and not ticker_company:
+            return None
+        return CompanyMatch(
+            company=company or ticker_company,
+            handle=KNOWN_COMPANIES.get(company) if company else None,
+            ticker=KNOWN_TICKERS.get(ticker_company) if ticker_company else None,
+        )
+
+
+COMPANY_MATCHER = CompanyMatcher({
+    'companies': KNOWN_COMPANIES,
+    'tickers': KNOWN_TICKERS,
+    'interesting_owners': INTERESTING_OWNERS,
+    'big_companies': BIG_COMPANIES,
+})
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Fake LLM Server - OpenAI chat completions taklidi (Offline deneme)
+==================================================================
+Gerçek API'ye para ödemeden hook akışını denemek için: /v1/chat/completions
+isteklerine OpenAI şeklinde cevap döner. Batch prompt'u ("Items (JSON)")
+tanır ve her serial için {"hooks": {serial: hook}} üretir, diğer istekler
+tek satırlık hook alır.
+
+    --bad-every N   Batch'te her N. hook geçersiz (Tekil isteğe düşüş denemesi)
+    --delay SN      Her cevaptan önce bekle (Bütçe aşımı denemesi)
+
+Kullanım:
+    python fake_llm_server.py [--port 8765] [--bad-every 3] [--delay 0]
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=test python main_v2.py preview
+"""
+
+import re
+import json
+import time
+import logging
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
+
+DEFAULT_PORT = 8765
+BATCH_MARKER = "Items (JSON):"
+
+
+def _batch_items(prompt: str) -> List[Dict]:
+    """Batch prompt'undaki aday listesi (Batch değilse boş)"""
+    if BATCH_MARKER not in prompt:
+        return []
+    match = re.search(r'\[.*\]', prompt.split(BATCH_MARKER, 1)[1], re.S)
+    try:
+        return json.loads(match.group(0)) if match else []
+    except ValueError:
+        return []
+
+
+def _hook(mark: str, category: str) -> str:
+    if category == 'weird':
+        return f"Someone really filed '{mark}' with a straight face 💀"
+    return f"{mark} sounds like another pivot waiting to happen 🤨"
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    bad_every = 0
+    delay = 0.0
+    calls = 0
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _send(self, status: int, body: Dict):
+        payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self._send(404, {'error': {'message': f'unknown path {self.path}'}})
+            return
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            request = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            self._send(400, {'error': {'message': 'invalid JSON'}})
+            return
+        if self.delay:
+            time.sleep(self.delay)
+
+        FakeLLMHandler.calls += 1
+        prompt = (request.get('messages') or [{}])[-1].get('content', '')
+        items = _batch_items(prompt)
+        if items:
+            hooks = {}
+            for i, item in enumerate(items, 1):
+                bad = self.bad_every and i % self.bad_every == 0
+                hooks[str(item.get('serial'))] = "" if bad else _hook(item.get('mark', ''), item.get('category'))
+            content = json.dumps({'hooks': hooks}, ensure_ascii=False)
+            logging.info(f"📦 Batch #{FakeLLMHandler.calls}: {len(items)} aday")
+        else:
+            mark = re.search(r'Trademark: "?([^"\n]*)', prompt)
+            content = _hook(mark.group(1).strip() if mark else 'This', 'normal')
+            logging.info(f"💬 Tekil #{FakeLLMHandler.calls}")
+
+        self._send(200, {
+            'id': f'chatcmpl-fake-{FakeLLMHandler.calls}',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': request.get('model', 'fake'),
+            'choices': [{'index': 0, 'finish_reason': 'stop',
+                         'message': {'role': 'assistant', 'content': content}}],
+            'usage': {'prompt_tokens': len(prompt) // 4, 'completion_tokens': len(content) // 4,
+                      'total_tokens': (len(prompt) + len(content)) // 4},
+        })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI chat completions taklidi")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--bad-every', type=int, default=0, help="Batch'te her N. hook geçersiz")
+    parser.add_argument('--delay', type=float, default=0.0, help="Cevap gecikmesi (sn)")
+    args = parser.parse_args()
+
+    FakeLLMHandler.bad_every = args.bad_every
+    FakeLLMHandler.delay = args.delay
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), FakeLLMHandler)
+    logging.info(f"🧪 Fake LLM: http://127.0.0.1:{args.port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,56 +3,14 @@
 İlginç trademark'ları bul - AI, Crypto, Tech, Büyük Şirketler
 """
 import json
-import re
 from typing import List, Dict
 
-# İLGİNÇ PATTERNLER
-AI_PATTERNS = [
-    r'\bAI\b', r'\bA\.I\.', r'ARTIFICIAL', r'INTELLIGEN', r'NEURAL', r'GPT', 
-    r'MACHINE\s*LEARN', r'DEEP\s*LEARN', r'COGNITIVE', r'\bML\b', r'GENAI',
-    r'COPILOT', r'CHATBOT', r'LLM', r'LANGUAGE\s*MODEL', r'OPENAI',
-    r'ANTHROPIC', r'GEMINI', r'CLAUDE', r'MISTRAL'
-]
+from companies import COMPANY_MATCHER
+from rules import categorize
+from scoring import score_batch
 
-CRYPTO_PATTERNS = [
-    r'\bCRYPTO', r'\bCOIN\b', r'\bTOKEN', r'BLOCKCHAIN', r'\bNFT\b',
-    r'WEB3', r'WEB\s*3', r'DEFI', r'DECENTRALIZ', r'\bDAO\b', r'METAVERSE',
-    r'ETHEREUM', r'BITCOIN', r'SOLANA', r'WALLET'
-]
-
-TECH_PATTERNS = [
-    r'QUANTUM', r'CYBER', r'\bCLOUD\b', r'SMART\s', r'NEURAL', r'ROBOT',
-    r'AUTOMAT', r'AUTONOMOUS', r'DRONE', r'SPATIAL', r'\bXR\b', r'\bVR\b',
-    r'\bAR\b', r'VIRTUAL\s*REALITY', r'AUGMENTED', r'HOLOGRAPH'
-]
-
-STARTUP_PATTERNS = [
-    r'LABS?\b', r'\.IO\b', r'\.AI\b', r'\.XYZ', r'TECH\b', r'VERSE\b',
-    r'FINTECH', r'HEALTHTECH', r'PROPTECH', r'EDTECH', r'INSURTECH'
-]
-
-# BÜYÜK ŞİRKETLER (owner'da aranacak)
-BIG_COMPANIES = [
-    'APPLE', 'GOOGLE', 'ALPHABET', 'META', 'FACEBOOK', 'MICROSOFT', 
-    'AMAZON', 'TESLA', 'NVIDIA', 'OPENAI', 'ANTHROPIC', 'SPACEX',
-    'NETFLIX', 'DISNEY', 'WARNER', 'SONY', 'SAMSUNG', 'INTEL',
-    'AMD', 'QUALCOMM', 'ORACLE', 'SALESFORCE', 'ADOBE', 'PAYPAL',
-    'STRIPE', 'COINBASE', 'ROBINHOOD', 'UBER', 'LYFT', 'AIRBNB',
-    'DOORDASH', 'INSTACART', 'SNAP', 'TWITTER', 'X CORP', 'TIKTOK',
-    'BYTEDANCE', 'ALIBABA', 'TENCENT', 'BAIDU', 'HUAWEI', 'XIAOMI'
-]
-
-
-def matches_patterns(text: str, patterns: List[str]) -> str:
-    """Pattern'a uyan ilk match'i döndür"""
-    if not text:
-        return None
-    text_upper = text.upper()
-    for pattern in patterns:
-        if re.search(pattern, text_upper):
-            match = re.search(pattern, text_upper)
-            return match.group(0) if match else pattern
-    return None
+# İLGİNÇ PATTERNLER - rules.json "categories" (Kategori başına tek derlenmiş regex)
+# BÜYÜK ŞİRKETLER (owner'da aranacak) - companies.py'de
 
 
 def analyze_trademark(tm: Dict) -> Dict:
@@ -69,37 +27,16 @@ def analyze_trademark(tm: Dict) -> Dict:
         'matches': []
     }
     
-    # AI check
-    match = matches_patterns(mark_name, AI_PATTERNS)
-    if match:
-        result['categories'].append('🤖 AI')
-        result['matches'].append(f"AI: {match}")
-    
-    # Crypto check
-    match = matches_patterns(mark_name, CRYPTO_PATTERNS)
-    if match:
-        result['categories'].append('🪙 CRYPTO')
-        result['matches'].append(f"Crypto: {match}")
-    
-    # Tech check
-    match = matches_patterns(mark_name, TECH_PATTERNS)
-    if match:
-        result['categories'].append('⚡ TECH')
-        result['matches'].append(f"Tech: {match}")
-    
-    # Startup name patterns
-    match = matches_patterns(mark_name, STARTUP_PATTERNS)
-    if match:
-        result['categories'].append('🚀 STARTUP')
-        result['matches'].append(f"Startup: {match}")
+    # AI / Crypto / Tech / Startup (rules.json sırasıyla)
+    for category, match in categorize(mark_name):
+        result['categories'].append(category.label)
+        result['matches'].append(f"{category.name}: {match}")
     
-    # Big company check
-    owner_upper = owner.upper()
-    for company in BIG_COMPANIES:
-        if company in owner_upper:
-            result['categories'].append('🏢 BIG CORP')
-            result['matches'].append(f"Company: {company}")
-            break
+    # Big company check (Ortak derlenmiş matcher, tam kelime)
+    company = COMPANY_MATCHER.first(owner, 'big_companies')
+    if company:
+        result['categories'].append('🏢 BIG CORP')
+        result['matches'].append(f"Company: {company}")
     
     return result
 
@@ -107,10 +44,12 @@ def analyze_trademark(tm: Dict) -> Dict:
 def find_interesting(trademarks: List[Dict]) -> List[Dict]:
     """İlginç trademark'ları bul ve sırala"""
     interesting = []
+    scores, _ = score_batch(trademarks)  # Bot'un önem puanı (Vektörel, tüm dosya tek seferde)
     
-    for tm in trademarks:
+    for tm, score in zip(trademarks, scores.tolist()):
         analysis = analyze_trademark(tm)
         if analysis['categories']:
+            analysis['score'] = score
             interesting.append(analysis)
     
     # Kategori sayısına göre sırala (çok kategorili = çok ilginç)
@@ -152,7 +91,7 @@ def main():
         for item in items[:10]:  # Her kategoriden max 10
             tm = item['trademark']
             print(f"  📌 {tm['mark_name']}")
-            print(f"     Serial: {tm['serial_number']} | Owner: {tm['owner'][:40]}...")
+            print(f"     Serial: {tm['serial_number']} | Owner: {(tm['owner'] or '')[:40]}... | Puan: {item['score']}")
             print(f"     Matches: {', '.join(item['matches'])}")
             print()
     
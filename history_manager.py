@@ -1,95 +1,281 @@
 
-import json
 import os
+import re
 import logging
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterator
+
+from state_store import StateStore
+from serializers import get_serializer
 
 HISTORY_FILE = "history.json"
 
+# Katmanlı depolama (Tiered Storage)
+# Sıcak katman: history.json (son HOT_DAYS gün, düz kayıt listesi; serial
+#   set'i indeks olarak tutulmaz, her ekleme transaction'ında listeden kurulur)
+# Soğuk katman: history_archive/ altında sıkıştırılmış, değişmez bloklar
+ARCHIVE_DIR = "history_archive"
+ARCHIVE_INDEX_FILE = "index.json"
+HOT_DAYS = 30              # Bu günden eski kayıtlar arşive taşınır
+ARCHIVE_BLOCK_SIZE = 2000  # Blok başına max kayıt
+ARCHIVE_FORMAT = "json+gzip"
+
+# Tek kayıt şeması (daily cache ve history artık aynı kaydı paylaşır)
+RECORD_FIELDS = (
+    'serial_number', 'mark_name', 'owner', 'goods_services',
+    'filing_date', 'filing_date_raw', 'international_class',
+    'mark_type', 'drawing_type', 'image_url',
+)
+# Ingest sırasında hesaplanan puan alanları (scoring.score_records)
+SCORE_FIELDS = ('score', 'reasons', 'is_weird', 'weird_score', 'weird_reason', 'rules_version')
+# Ingest sırasında eklenen türetilmiş alanlar (Varsa korunur)
+DERIVED_FIELDS = SCORE_FIELDS + ('owner_id',)
+ISO_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+
+def normalize_record(tm: Dict, scanned_at: Optional[str] = None) -> Dict:
+    """Scraper çıktısını depo kaydına çevir (filing_date=ISO, filing_date_raw=ham)"""
+    record = {field: tm.get(field) for field in RECORD_FIELDS}
+    record.update((field, tm[field]) for field in DERIVED_FIELDS if field in tm)
+    record['scanned_at'] = tm.get('scanned_at') or scanned_at or datetime.now().isoformat()
+    return record
+
+
+def migrate_legacy_record(tm: Dict) -> Dict:
+    """Eski history kaydı: 'filing_date' ham tarihi tutuyordu"""
+    if 'filing_date_raw' not in tm:
+        raw = tm.get('filing_date')
+        tm['filing_date_raw'] = raw
+        tm['filing_date'] = raw if raw and ISO_DATE_RE.match(raw) else None
+    return tm
+
+
 class HistoryManager:
-    def __init__(self, filename: str = HISTORY_FILE):
+    def __init__(self, filename: str = HISTORY_FILE, archive_dir: Optional[str] = None,
+                 hot_days: int = HOT_DAYS):
         self.filename = filename
+        self.archive_dir = archive_dir or os.path.join(os.path.dirname(filename), ARCHIVE_DIR)
+        self.hot_days = hot_days
+        self._block_cache: Dict[str, List[Dict]] = {}  # Lazy açılan bloklar
+        self._block_serials: Dict[str, Dict[str, Dict]] = {}  # Blok -> serial -> kayıt (Açılışta bir kere)
+        self._index: Optional[List[Dict]] = None
+        self.store = StateStore(filename, default=lambda: {"trademarks": [], "last_updated": None})
+        self.index_store = StateStore(os.path.join(self.archive_dir, ARCHIVE_INDEX_FILE),
+                                      default=lambda: {"blocks": []}, fmt="json")
         self._ensure_file_exists()
 
     def _ensure_file_exists(self):
         if not os.path.exists(self.filename):
-            with open(self.filename, 'w', encoding='utf-8') as f:
-                json.dump({"trademarks": [], "last_updated": None}, f)
+            self.store.save(self.store.default())
+
+    # ============== SICAK KATMAN ==============
+
+    # history.json tarama imlecini de tutuyor: bozuksa varsayılanla devam etmek
+    # imleci eski değere döndürür ve sıradaki yazma tüm sıcak geçmişi siler.
+    # Bu yüzden tüm okuma/yazmalar strict (StateCorruptError yukarı çıkar).
 
     def load_history(self) -> List[Dict]:
-        """Tüm geçmişi yükle"""
-        try:
-            with open(self.filename, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return data.get("trademarks", [])
-        except Exception as e:
-            logging.error(f"Geçmiş yüklenemedi: {e}")
-            return []
-
-    def append_to_history(self, new_trademarks: List[Dict]):
-        """Yeni trademarkları geçmişe ekle (Duplicate kontrolü ile)"""
-        if not new_trademarks:
+        """Sıcak katmandaki geçmişi yükle (Arşiv hariç)"""
+        return [migrate_legacy_record(tm) for tm in self.store.load(strict=True).get("trademarks", [])]
+
+    @staticmethod
+    def _set_hot(data: Dict, trademarks: List[Dict]):
+        data["trademarks"] = trademarks
+        data["last_updated"] = datetime.now().isoformat()
+        data["total_count"] = len(trademarks)
+
+    def load_meta(self) -> Dict:
+        """Sıcak dosyanın tamamı (trademarks + cursor gibi meta alanlar)"""
+        return self.store.load(strict=True)
+
+    def append_to_history(self, new_trademarks: List[Dict], meta: Optional[Dict] = None):
+        """Yeni trademarkları geçmişe ekle (Duplicate kontrolü ile)
+        meta: Aynı atomic yazmada güncellenecek üst seviye alanlar (örn: last_serial)
+        Hata yutulmaz: kaydedilemeyen imleç ilerlemiş gibi görünmesin"""
+        if not new_trademarks and not meta:
             return
 
-        current_data = []
-        try:
-            with open(self.filename, 'r', encoding='utf-8') as f:
-                full_data = json.load(f)
-                current_data = full_data.get("trademarks", [])
-        except Exception:
-            current_data = []
+        with self.store.transaction(strict=True) as full_data:
+            self._append_locked(full_data, new_trademarks or [])
+            if meta:
+                full_data.update(meta)
+
+    def _append_locked(self, full_data: Dict, new_trademarks: List[Dict]):
+        current_data = [migrate_legacy_record(tm) for tm in full_data.get("trademarks", [])]
 
         # Mevcut Serial numaralarını bir set'e al (Hızlı kontrol için)
         existing_serials = {tm.get('serial_number') for tm in current_data if tm.get('serial_number')}
-        
+
         added_count = 0
+        scanned_at = datetime.now().isoformat()
         for tm in new_trademarks:
             serial = tm.get('serial_number')
-            if serial and serial not in existing_serials:
+            if serial and serial not in existing_serials and not self.in_archive(serial):
                 # Sadece gerekli alanları sakla (Disk tasarrufu)
-                clean_tm = {
-                    'serial_number': serial,
-                    'mark_name': tm.get('mark_name'),
-                    'owner': tm.get('owner'),
-                    'goods_services': tm.get('goods_services'),
-                    'filing_date': tm.get('filing_date_raw') or datetime.now().strftime("%Y-%m-%d"),
-                    'international_class': tm.get('international_class'),
-                    'scanned_at': datetime.now().isoformat()
-                }
-                current_data.append(clean_tm)
+                current_data.append(normalize_record(tm, scanned_at))
                 existing_serials.add(serial)
                 added_count += 1
-        
+
         # Dosyayı güncelle
         if added_count > 0:
-            try:
-                with open(self.filename, 'w', encoding='utf-8') as f:
-                    json.dump({
-                        "trademarks": current_data,
-                        "last_updated": datetime.now().isoformat(),
-                        "total_count": len(current_data)
-                    }, f, ensure_ascii=False, indent=2)
-                logging.info(f"📚 History güncellendi: +{added_count} yeni kayıt (Toplam: {len(current_data)})")
-            except Exception as e:
-                logging.error(f"History kaydedilemedi: {e}")
+            logging.info(f"📚 History güncellendi: +{added_count} yeni kayıt")
         else:
             logging.info("📚 History: Eklenecek yeni kayıt yok (Hepsi mevcut).")
+        self._set_hot(full_data, self._archive_cold_records(current_data))
 
     def get_recent_data(self, days: int = 7) -> List[Dict]:
         """Son X günün verisini getir"""
-        all_data = self.load_history()
         cutoff_date = datetime.now() - timedelta(days=days)
-        
+        if days <= self.hot_days:
+            all_data = self.load_history()
+        else:
+            # Sıcak pencereden uzun: sadece aralığa düşen blokları aç
+            all_data = []
+            for block in self._load_index():
+                newest = self._parse_time(block.get('newest_scanned'))
+                if newest and newest >= cutoff_date:
+                    all_data.extend(self._read_block(block['file']))
+            all_data.extend(self.load_history())
+
         recent = []
         for tm in all_data:
             # scanned_at'e göre filtrele (daha güvenilir)
-            scanned_str = tm.get('scanned_at')
-            if scanned_str:
-                try:
-                    scanned_date = datetime.fromisoformat(scanned_str)
-                    if scanned_date >= cutoff_date:
-                        recent.append(tm)
-                except:
-                    pass
+            scanned_date = self._parse_time(tm.get('scanned_at'))
+            if scanned_date and scanned_date >= cutoff_date:
+                recent.append(tm)
         return recent
+
+    # ============== SOĞUK KATMAN (ARŞİV) ==============
+
+    @staticmethod
+    def _parse_time(value: Optional[str]) -> Optional[datetime]:
+        if not value:
+            return None
+        try:
+            return datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            return None
+
+    def _load_index(self) -> List[Dict]:
+        """Serial aralığı indeksini yükle (first_serial'a göre sıralı)"""
+        if self._index is None:
+            self._index = self.index_store.load().get("blocks", [])
+        return list(self._index)
+
+    def _save_index(self, blocks: List[Dict]):
+        blocks.sort(key=lambda b: b['first_serial'])
+        self.index_store.save({"blocks": blocks, "updated_at": datetime.now().isoformat()})
+        self._index = list(blocks)
+
+    def _read_block(self, block_file: str) -> List[Dict]:
+        """Bloğu lazy aç (bir kez açılan blok bellekte tutulur)"""
+        if block_file not in self._block_cache:
+            path = os.path.join(self.archive_dir, block_file)
+            with open(path, 'rb') as f:
+                records = get_serializer(ARCHIVE_FORMAT).loads(f.read())
+            self._block_cache[block_file] = [migrate_legacy_record(tm) for tm in records]
+        return self._block_cache[block_file]
+
+    def _block_lookup(self, block_file: str) -> Dict[str, Dict]:
+        """Bloğun serial -> kayıt sözlüğü (Blok başına bir kere kurulur, blokla birlikte tutulur)"""
+        lookup = self._block_serials.get(block_file)
+        if lookup is None:
+            records = self._read_block(block_file)
+            lookup = self._block_serials[block_file] = {tm.get('serial_number'): tm for tm in reversed(records)}
+        return lookup
+
+    def _write_block(self, records: List[Dict]) -> Dict:
+        """Değişmez arşiv bloğu yaz, indeks girdisini döndür"""
+        records = sorted(records, key=lambda tm: int(tm['serial_number']))
+        first, last = records[0]['serial_number'], records[-1]['serial_number']
+        block_file = f"block_{first}_{last}.json.gz"
+        path = os.path.join(self.archive_dir, block_file)
+
+        # Aynı isimli blok varsa üzerine yazma (bloklar immutable)
+        suffix = 1
+        while os.path.exists(path):
+            block_file = f"block_{first}_{last}_{suffix}.json.gz"
+            path = os.path.join(self.archive_dir, block_file)
+            suffix += 1
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(get_serializer(ARCHIVE_FORMAT).dumps(records))
+        os.replace(tmp_path, path)
+
+        scanned = [tm.get('scanned_at') for tm in records if tm.get('scanned_at')]
+        return {
+            "file": block_file,
+            "first_serial": int(first),
+            "last_serial": int(last),
+            "count": len(records),
+            "oldest_scanned": min(scanned) if scanned else None,
+            "newest_scanned": max(scanned) if scanned else None,
+            "created_at": datetime.now().isoformat()
+        }
+
+    def _archive_cold_records(self, records: List[Dict]) -> List[Dict]:
+        """HOT_DAYS'ten eski kayıtları bloklara taşı, sıcak kalanları döndür
+        (Bloklar sıcak dosyadan önce yazılır; arada yarım kalan taşımada kayıt
+        iki yerde de durur. Zaten arşivde olan serial tekrar yazılmaz, sadece
+        sıcak dosyadan düşer - taşıma tekrarlanabilir)"""
+        cutoff = datetime.now() - timedelta(days=self.hot_days)
+        hot, cold = [], []
+        for tm in records:
+            scanned = self._parse_time(tm.get('scanned_at'))
+            if scanned and scanned < cutoff:
+                cold.append(tm)
+            else:
+                hot.append(tm)
+
+        if not cold:
+            return records
+
+        archived = {tm.get('serial_number') for tm in cold if self.in_archive(tm.get('serial_number'))}
+        if archived:
+            logging.info(f"🧊 Arşiv: {len(archived)} kayıt zaten arşivde (Yarım kalan taşıma), sıcak dosyadan düşülüyor")
+            cold = [tm for tm in cold if tm.get('serial_number') not in archived]
+            if not cold:
+                return hot
+
+        os.makedirs(self.archive_dir, exist_ok=True)
+        cold.sort(key=lambda tm: int(tm['serial_number']))
+
+        blocks = self._load_index()
+        for i in range(0, len(cold), ARCHIVE_BLOCK_SIZE):
+            blocks.append(self._write_block(cold[i:i + ARCHIVE_BLOCK_SIZE]))
+        self._save_index(blocks)
+
+        logging.info(f"🧊 Arşiv: {len(cold)} kayıt soğuk katmana taşındı ({len(blocks)} blok)")
+        return hot
+
+    def archive_cold_records(self):
+        """Sıcak dosyayı elle sıkıştır (Yeni kayıt eklemeden)"""
+        with self.store.transaction(strict=True) as data:
+            current = data.get("trademarks", [])
+            self._set_hot(data, self._archive_cold_records(current))
+
+    def in_archive(self, serial: str) -> bool:
+        """Serial arşivde mi? (Önce indeks aralığı, sonra o bloğun serial sözlüğü)"""
+        return self.find_archived(serial) is not None
+
+    def find_archived(self, serial: str) -> Optional[Dict]:
+        try:
+            serial_int = int(serial)
+        except (TypeError, ValueError):
+            return None
+        for block in self._load_index():
+            if block['first_serial'] <= serial_int <= block['last_serial']:
+                tm = self._block_lookup(block['file']).get(serial)
+                if tm is not None:
+                    return tm
+        return None
+
+    def iter_all_records(self) -> Iterator[Dict]:
+        """Tüm geçmiş (Arşiv + Sıcak) - Analitik için, bloklar tek tek açılır"""
+        for block in self._load_index():
+            yield from self._read_block(block['file'])
+            # Tam taramada belleği şişirmemek için cache'i bırak
+            self._block_cache.pop(block['file'], None)
+            self._block_serials.pop(block['file'], None)
+        yield from self.load_history()
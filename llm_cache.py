@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+LLM Cache - OpenAI yorumları için kalıcı önbellek
+=================================================
+format_tweet her çalışmada OpenAI'ı çağırıyordu: preview + run aynı aday için
+iki kere ödüyor, çöken çalışma tekrar denenince bir kere daha ödüyordu.
+
+Anahtar: sha1(model + prompt şablonu + girdiler + parametreler). Şablon
+değişince anahtar da değişir, eski yorumlar kendiliğinden devre dışı kalır.
+
+    LLM_CACHE_TTL_HOURS    Bu süreden eski yorum kullanılmaz (Aday kuyruğu TTL'i kadar)
+    LLM_CACHE_MAX_ENTRIES  Aşılınca en uzun süredir kullanılmayan (LRU) atılır
+
+Başarısız çağrılar (None) önbelleğe girmez. Hit / miss / expired sayaçları
+process içinde (stats) ve dosyada kümülatif tutulur.
+
+Okuma dosyaya yazmaz: dosya process başına bir kere yüklenir, kullanım
+zamanları ve sayaçlar bellekte birikir, çalışma sonunda flush() ile tek
+yazmada kaydedilir. Aynı anahtara bir çalışmada ikinci bakış (prefetch ->
+get_or_create) önceki sonucu döndürür, tekrar sayılmaz.
+
+Kullanım:
+    python llm_cache.py stats
+    python llm_cache.py clear
+"""
+
+import sys
+import json
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Set
+
+from state_store import StateStore
+
+LLM_CACHE_FILE = "llm_cache.json"
+LLM_CACHE_TTL_HOURS = 72        # Aday kuyruğundaki en eski aday kadar
+LLM_CACHE_MAX_ENTRIES = 1000
+
+COUNTERS = ("hits", "misses", "expired")
+
+
+def cache_key(model: str, template: str, inputs: Dict[str, Any], **params) -> str:
+    """Model + şablon + girdiler + parametreler -> sabit anahtar"""
+    payload = json.dumps({'model': model, 'template': template, 'inputs': inputs, 'params': params},
+                         sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha1(payload).hexdigest()
+
+
+class LLMCache:
+    def __init__(self, path: str = LLM_CACHE_FILE, ttl_hours: float = LLM_CACHE_TTL_HOURS,
+                 max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl_hours * 3600
+        self.max_entries = max_entries
+        self.store = StateStore(path, default=lambda: {"entries": {}, "stats": dict.fromkeys(COUNTERS, 0)})
+        self.counters = dict.fromkeys(COUNTERS, 0)   # Bu process
+        self._lock = threading.Lock()                # Hook thread'leri aynı anda okur / yazar
+        self._entries: Optional[Dict[str, Dict]] = None   # Dosyanın bu process'teki kopyası
+        self._lookups: Dict[str, Optional[str]] = {}      # Bu çalışmada bakılan anahtarlar
+        self._used: Dict[str, float] = {}                 # Flush bekleyen kullanım zamanları
+        self._expired: Set[str] = set()                   # Flush'ta silinecekler
+        self._unflushed = dict.fromkeys(COUNTERS, 0)      # Flush bekleyen sayaçlar
+
+    def _load_entries(self) -> Dict[str, Dict]:
+        if self._entries is None:
+            self._entries = self.store.load().get("entries", {})
+        return self._entries
+
+    def get(self, key: str) -> Optional[str]:
+        """Geçerli kayıt varsa değeri, yoksa None (Dosyaya yazmaz, bkz. flush)"""
+        with self._lock:
+            if key in self._lookups:
+                return self._lookups[key]
+            now = datetime.now().timestamp()
+            entry = self._load_entries().get(key)
+            if entry is None:
+                value, counter = None, "misses"
+            elif now - entry['created_at'] > self.ttl:
+                value, counter = None, "expired"
+                self._expired.add(key)
+            else:
+                value, counter = entry['value'], "hits"
+                self._used[key] = now
+            self.counters[counter] += 1
+            self._unflushed[counter] += 1
+            self._lookups[key] = value
+            return value
+
+    def _apply_pending(self, data: Dict, now: float):
+        """Bellekte biriken kullanım zamanı / silme / sayaçları dosya verisine işle"""
+        entries = data.setdefault("entries", {})
+        for key in self._expired:
+            if key in entries and now - entries[key]['created_at'] > self.ttl:
+                del entries[key]
+        for key, used_at in self._used.items():
+            if key in entries:
+                entries[key]['used_at'] = max(entries[key]['used_at'], used_at)
+        stats = data.setdefault("stats", dict.fromkeys(COUNTERS, 0))
+        for counter, count in self._unflushed.items():
+            stats[counter] = stats.get(counter, 0) + count
+        self._expired.clear()
+        self._used.clear()
+        self._unflushed = dict.fromkeys(COUNTERS, 0)
+
+    def put(self, key: str, value: str):
+        self.put_many({key: value})
+
+    def put_many(self, values: Dict[str, str]):
+        """Yeni değerleri tek yazmada sakla (Bekleyen kullanım / sayaçlar da yazılır)"""
+        if not values:
+            return
+        now = datetime.now().timestamp()
+        with self._lock, self.store.transaction() as data:
+            self._apply_pending(data, now)
+            entries = data["entries"]
+            for key, value in values.items():
+                entries[key] = {'value': value, 'created_at': now, 'used_at': now}
+                self._lookups[key] = value
+            if len(entries) > self.max_entries:
+                # Önce süresi dolanlar, sonra en uzun süredir kullanılmayanlar
+                for old in [k for k, e in entries.items() if now - e['created_at'] > self.ttl]:
+                    del entries[old]
+                overflow = len(entries) - self.max_entries
+                if overflow > 0:
+                    for old in sorted(entries, key=lambda k: entries[k]['used_at'])[:overflow]:
+                        del entries[old]
+            self._entries = entries
+
+    def flush(self):
+        """Bu çalışmada biriken kullanım zamanları ve sayaçları tek yazmada kaydet"""
+        with self._lock:
+            if not (self._used or self._expired or any(self._unflushed.values())):
+                return
+            with self.store.transaction() as data:
+                self._apply_pending(data, datetime.now().timestamp())
+                self._entries = data["entries"]
+
+    def get_or_create(self, model: str, template: str, inputs: Dict[str, Any],
+                      generate: Callable[[str], Optional[str]], **params) -> Optional[str]:
+        """
+        Önbellekte varsa onu, yoksa generate(prompt) sonucunu döndür (ve sakla).
+        prompt = template.format(**inputs); params (max_tokens, temperature...) anahtara dahil.
+        """
+        key = cache_key(model, template, inputs, **params)
+        value = self.get(key)  # prefetch zaten baktıysa aynı sonuç, tekrar sayılmaz
+        if value is not None:
+            logging.info(f"🧠 LLM cache hit ({key[:8]})")
+            return value
+        value = generate(template.format(**inputs))
+        if value:
+            self.put(key, value)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        """Bu process'in sayaçları + kümülatif sayaçlar (Flush bekleyenler dahil)"""
+        data = self.store.load()
+        total = data.get("stats", {})
+        total = {counter: total.get(counter, 0) + self._unflushed[counter] for counter in COUNTERS}
+        lookups = self.counters["hits"] + self.counters["misses"] + self.counters["expired"]
+        return {
+            **self.counters,
+            'hit_rate': round(self.counters["hits"] / lookups, 3) if lookups else None,
+            'entries': len(data.get("entries", {})),
+            'total': total,
+        }
+
+    def clear(self):
+        with self._lock:
+            self.store.replace({"entries": {}, "stats": dict.fromkeys(COUNTERS, 0)})
+            self._entries = None
+            self._lookups.clear()
+            self._used.clear()
+            self._expired.clear()
+            self._unflushed = dict.fromkeys(COUNTERS, 0)
+
+
+_llm_cache = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMCache:
+    global _llm_cache
+    if _llm_cache is None:
+        with _llm_cache_lock:  # Hook thread'leri aynı anda ilk çağrıyı yapabilir
+            if _llm_cache is None:
+                _llm_cache = LLMCache()
+    return _llm_cache
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    cache = get_llm_cache()
+    if command == "stats":
+        stats = cache.stats()
+        total = stats['total']
+        lookups = sum(total.values())
+        print(f"🧠 LLM cache: {stats['entries']} kayıt")
+        print(f"   Toplam: {total['hits']} hit / {total['misses']} miss / {total['expired']} expired"
+              + (f" (Hit oranı %{100 * total['hits'] / lookups:.0f})" if lookups else ""))
+    elif command == "clear":
+        cache.clear()
+        print("🧹 LLM cache temizlendi")
+    else:
+        print("Kullanım: python llm_cache.py [stats|clear]")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Lookalike - Ünlü marka benzeri başvuruları yakala ("G00GLE AI", "NETFL1X")
+===========================================================================
+Harf 3-gramı ters indeksi (trigram -> marka ID listesi). Sorgu sadece ortak
+trigramı olan markaları sayar, ikili karşılaştırma yok; tek isim için
+mikrosaniyeler sürer.
+
+    FAMOUS_INDEX        companies.FAMOUS_MARKS (Küratörlü liste, import anında kurulur)
+
+Leet normalizasyonu (0->o, 1->i, 3->e, 4->a, 5->s, 7->t, @->a, $->s)
+trigramlardan önce uygulanır. Puanlamada sinyal sayılması için: benzerlik
+>= LOOKALIKE_MIN_SIMILARITY, marka birebir aynı değil (ya da leet ile
+yazılmış), token bir sözlük kelimesi değil (companies.COMMON_WORDS:
+CHANNEL, PRADO...) ve sahibi de o markanın şirketi değil.
+
+Puan sadece sürümlü kurallara bağlı (scoring.rules_version): geçmiş
+kayıtlardan indeks kurulmaz, aynı isim her gün aynı puanı alır.
+
+Kullanım:
+    python lookalike.py "G00GLE AI"
+"""
+
+import re
+import sys
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from companies import COMMON_WORDS, FAMOUS_MARKS
+
+LOOKALIKE_MIN_SIMILARITY = 0.6   # Trigram Jaccard ("GOOOGLE" 0.86, "AMAZONN" 0.63, "APPLES" 0.57)
+MIN_TOKEN_LENGTH = 4             # Daha kısa tokenlar çok fazla yanlış alarm verir
+
+LEET_TABLE = str.maketrans({'0': 'o', '1': 'i', '3': 'e', '4': 'a', '5': 's', '7': 't',
+                            '8': 'b', '@': 'a', '$': 's', '!': 'i', '|': 'l'})
+_NON_ALPHA_RE = re.compile(r'[^a-z]+')
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9]+')
+
+
+def compact(text: str) -> str:
+    """'Coca-Cola' -> 'cocacola' (Leet yok, sadece harf/rakam)"""
+    return _NON_ALNUM_RE.sub('', (text or '').lower())
+
+
+def leet_normalize(text: str) -> str:
+    """'G00GLE' -> 'google' (Leet çevrilir, harf dışı her şey atılır)"""
+    return _NON_ALPHA_RE.sub('', (text or '').lower().translate(LEET_TABLE))
+
+
+def trigrams(key: str) -> Set[str]:
+    padded = f"${key}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class Lookalike(NamedTuple):
+    mark: str          # Benzetilen ünlü marka
+    similarity: float
+    token: str         # Başvurudaki benzer kısım
+
+
+class TrigramIndex:
+    """Marka ismi -> trigram ters indeksi (Top-k benzer sorgusu)"""
+
+    def __init__(self, marks: Iterable[str] = ()):
+        self.marks: List[str] = []
+        self.keys: List[str] = []
+        self._sizes: List[int] = []
+        self._ids: Dict[str, int] = {}
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        for mark in marks:
+            self.add(mark)
+
+    def __len__(self) -> int:
+        return len(self.marks)
+
+    def add(self, mark: str):
+        key = leet_normalize(mark)
+        if len(key) < 3 or key in self._ids:
+            return
+        mark_id = len(self.marks)
+        grams = trigrams(key)
+        self.marks.append(mark)
+        self.keys.append(key)
+        self._sizes.append(len(grams))
+        self._ids[key] = mark_id
+        for gram in grams:
+            self._postings[gram].append(mark_id)
+
+    def query(self, text: str, k: int = 3, min_similarity: float = 0.0) -> List[Tuple[str, float]]:
+        """En benzer k marka: [(marka, jaccard)]"""
+        key = leet_normalize(text)
+        if not key:
+            return []
+        grams = trigrams(key)
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for mark_id in self._postings.get(gram, ()):
+                shared[mark_id] += 1
+        scored = []
+        for mark_id, common in shared.items():
+            sim = common / (len(grams) + self._sizes[mark_id] - common)
+            if sim >= min_similarity:
+                scored.append((sim, mark_id))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [(self.marks[mark_id], round(sim, 3)) for sim, mark_id in scored[:k]]
+
+
+FAMOUS_INDEX = TrigramIndex(FAMOUS_MARKS)
+COMMON_KEYS = frozenset(leet_normalize(word) for word in COMMON_WORDS)
+
+# Puanı etkileyen parametreler (scoring.rules_version hash'ine girer; yeni eşik buraya da)
+SCORING_PARAMS = {
+    'min_similarity': LOOKALIKE_MIN_SIMILARITY,
+    'min_token_length': MIN_TOKEN_LENGTH,
+    'leet': sorted((chr(code), value) for code, value in LEET_TABLE.items()),
+    'marks': list(FAMOUS_MARKS),
+    'common_words': sorted(COMMON_WORDS),
+}
+
+
+def is_common_word(token: str) -> bool:
+    """Sözlük kelimesi / isim mi? (Leet ile yazılmışı da: "CH4NNEL")"""
+    return leet_normalize(token) in COMMON_KEYS
+
+
+def split_tokens(name: str) -> List[str]:
+    return [token for token in re.split(r'[\s\-_/.,+]+', (name or '').strip()) if token]
+
+
+def token_pairs(tokens: List[str]) -> List[str]:
+    """Bitişik ikililer ("COCA COLA" -> "COCACOLA" da denensin)"""
+    return [a + b for a, b in zip(tokens, tokens[1:])]
+
+
+def candidate_tokens(name: str) -> List[str]:
+    """Tek tokenlar + bitişik ikililer"""
+    tokens = split_tokens(name)
+    return tokens + token_pairs(tokens)
+
+
+def find_lookalike(name: str, owner: str = '', index: TrigramIndex = FAMOUS_INDEX) -> Optional[Lookalike]:
+    """Ünlü marka benzeri mi? En iyi eşleşme ya da None"""
+    owner_key = compact(owner)
+    best = None
+    for token in candidate_tokens(name):
+        key = leet_normalize(token)
+        if len(key) < MIN_TOKEN_LENGTH or key in COMMON_KEYS:
+            continue
+        for mark, sim in index.query(key, k=1, min_similarity=LOOKALIKE_MIN_SIMILARITY):
+            famous_key = leet_normalize(mark)
+            if sim >= 1.0 and compact(token) == famous_key:
+                continue  # Markanın kendisi (Taklit değil)
+            if famous_key in owner_key:
+                continue  # Sahibi zaten o şirket
+            if best is None or sim > best.similarity:
+                best = Lookalike(mark, sim, token)
+    return best
+
+
+def main():
+    if len(sys.argv) < 2:
+        print('Kullanım: python lookalike.py "MARKA ADI" [owner]')
+        return 1
+    name = sys.argv[1]
+    owner = sys.argv[2] if len(sys.argv) > 2 else ''
+
+    print(f"🔎 {name}")
+    print(f"   Ünlü markalar: {FAMOUS_INDEX.query(name, k=5)}")
+    print(f"   Lookalike sinyali: {find_lookalike(name, owner)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
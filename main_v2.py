@@ -10,23 +10,32 @@ FilingWatch v2.1 - USPTO Trademark Filing Bot
 
 import os
 import sys
-import tweepy
 from dotenv import load_dotenv
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 import json
 import time
 import logging
 import logging
 import random
+import threading
 import re
-from typing import Optional, List, Dict
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Optional, List, Dict, Tuple
 
 from tsdr_scraper import TSDRScraper
-from visuals import generate_trademark_card
-from history_manager import HistoryManager
+from history_manager import normalize_record
+from record_store import RecordStore
 from analyzer import Analyzer
-from weird_filter import WeirdFilter
-from openai import OpenAI
+from companies import KNOWN_TICKERS, COMPANY_MATCHER
+from state_store import StateStore, StateCorruptError
+from candidate_queue import CandidateQueue
+from near_dup import NearDupIndex
+from llm_cache import cache_key, get_llm_cache
+from clients import get_client, using
+from outbox import get_outbox
+from post_quota import get_post_quota
+from accounts import DEFAULT_ACCOUNT, client_name, route
+from media_pipeline import get_media_cache, media_id_fresh, prepare_media_batch, prepare_one, upload_media
 
 # ============== LOGGING ==============
 logging.basicConfig(
@@ -50,195 +59,73 @@ X_BEARER_TOKEN = os.getenv("X_BEARER_TOKEN")
 
 X_BEARER_TOKEN = os.getenv("X_BEARER_TOKEN")
 
-# Company Handles Tracking
-KNOWN_COMPANIES = {
-    "APPLE": "@Apple",
-    "GOOGLE": "@Google",
-    "AMAZON": "@amazon",
-    "MICROSOFT": "@Microsoft",
-    "META PLATFORMS": "@Meta",
-    "FACEBOOK": "@Meta",
-    "TESLA": "@Tesla",
-    "SPACEX": "@SpaceX",
-    "NETFLIX": "@netflix",
-    "DISNEY": "@Disney",
-    "NVIDIA": "@nvidia",
-    "SAMSUNG": "@Samsung",
-    "SONY": "@Sony",
-    "NIKE": "@Nike",
-    "ADIDAS": "@adidas",
-    "INTEL": "@intel",
-    "AMD": "@AMD",
-    "IBM": "@IBM",
-    "ORACLE": "@Oracle",
-    "UBER": "@Uber",
-    "AIRBNB": "@Airbnb",
-    "SPOTIFY": "@Spotify",
-    "PAYPAL": "@PayPal",
-    "SNAP INC": "@Snap",
-    "REDDIT": "@Reddit",
-    "ZOOM VIDEO": "@Zoom",
-    "SALESFORCE": "@Salesforce",
-    "ADOBE": "@Adobe",
-    
-    # AUTO
-    "FORD": "@Ford",
-    "GENERAL MOTORS": "@GM",
-    "TOYOTA": "@Toyota",
-    "HONDA": "@Honda",
-    "BMW": "@BMW",
-    "MERCEDES": "@MercedesBenz",
-    "PORSCHE": "@Porsche",
-    "FERRARI": "@Ferrari",
-    "HYUNDAI": "@Hyundai_Global",
-    "RIVIAN": "@Rivian",
-    "LUCID": "@LucidMotors",
-    
-    # FOOD & BEV
-    "COCA-COLA": "@CocaCola",
-    "PEPSICO": "@PepsiCo",
-    "MCDONALD'S": "@McDonalds",
-    "STARBUCKS": "@Starbucks",
-    "BURGER KING": "@BurgerKing",
-    "KFC": "@kfc",
-    "TACO BELL": "@tacobell",
-    "NESTLE": "@Nestle",
-    "DANONE": "@Danone",
-    "RED BULL": "@redbull",
-    
-    # RETAIL & FASHION
-    "WALMART": "@Walmart",
-    "TARGET": "@Target",
-    "HOME DEPOT": "@HomeDepot",
-    "COSTCO": "@Costco",
-    "LOUIS VUITTON": "@LouisVuitton",
-    "GUCCI": "@gucci",
-    "PRADA": "@Prada",
-    "ROLEX": "@ROLEX",
-    "LEGO": "@LEGO_Group",
-    "IKEA": "@IKEA",
-    
-    # FINANCE
-    "VISA": "@Visa",
-    "MASTERCARD": "@Mastercard",
-    "AMERICAN EXPRESS": "@AmericanExpress",
-    "JPMORGAN": "@jpmorgan",
-    "GOLDMAN SACHS": "@GoldmanSachs",
-    "COINBASE": "@coinbase",
-    "BINANCE": "@binance",
-    "BLOCK INC": "@blocks", # Square
-    
-    # MEDIA & GAMES
-    "WARNER BROS": "@wbd",
-    "UNIVERSAL": "@UniversalPics",
-    "NINTENDO": "@NintendoAmerica",
-    "ACTIVISION": "@Activision",
-    "ELECTRONIC ARTS": "@EA",
-    "EPIC GAMES": "@EpicGames",
-    "ROBLOX": "@Roblox",
-    "OPENAI": "@OpenAI",
-}
-
-# Stock Tickers (Cashtags) - Public Companies Only
-KNOWN_TICKERS = {
-    "APPLE": "$AAPL",
-    "GOOGLE": "$GOOGL",
-    "AMAZON": "$AMZN",
-    "MICROSOFT": "$MSFT",
-    "META PLATFORMS": "$META",
-    "FACEBOOK": "$META",
-    "TESLA": "$TSLA",
-    "NETFLIX": "$NFLX",
-    "DISNEY": "$DIS",
-    "NVIDIA": "$NVDA",
-    "SAMSUNG": "$SSNLF",
-    "SONY": "$SONY",
-    "NIKE": "$NKE",
-    "ADIDAS": "$ADDYY",
-    "INTEL": "$INTC",
-    "AMD": "$AMD",
-    "IBM": "$IBM",
-    "ORACLE": "$ORCL",
-    "UBER": "$UBER",
-    "AIRBNB": "$ABNB",
-    "SPOTIFY": "$SPOT",
-    "PAYPAL": "$PYPL",
-    "SNAP INC": "$SNAP",
-    "REDDIT": "$RDDT",
-    "ZOOM VIDEO": "$ZM",
-    "SALESFORCE": "$CRM",
-    "ADOBE": "$ADBE",
-    "FORD": "$F",
-    "GENERAL MOTORS": "$GM",
-    "TOYOTA": "$TM",
-    "HONDA": "$HMC",
-    "BMW": "$BMWYY",
-    "MERCEDES": "$MBGYY",
-    "PORSCHE": "$DRPRY",
-    "FERRARI": "$RACE",
-    "RIVIAN": "$RIVN",
-    "LUCID": "$LCID",
-    "COCA-COLA": "$KO",
-    "PEPSICO": "$PEP",
-    "MCDONALD'S": "$MCD",
-    "STARBUCKS": "$SBUX",
-    "BURGER KING": "$QSR",
-    "KFC": "$YUM",
-    "TACO BELL": "$YUM",
-    "NESTLE": "$NSRGY",
-    "DANONE": "$DANOY",
-    "WALMART": "$WMT",
-    "TARGET": "$TGT",
-    "HOME DEPOT": "$HD",
-    "COSTCO": "$COST",
-    "LOUIS VUITTON": "$LVMUY",
-    "GUCCI": "$PPRUY",
-    "VISA": "$V",
-    "MASTERCARD": "$MA",
-    "AMERICAN EXPRESS": "$AXP",
-    "JPMORGAN": "$JPM",
-    "GOLDMAN SACHS": "$GS",
-    "COINBASE": "$COIN",
-    "BLOCK INC": "$SQ",
-    "WARNER BROS": "$WBD",
-    "UNIVERSAL": "$CMCSA",
-    "NINTENDO": "$NTDOY",
-    "ELECTRONIC ARTS": "$EA",
-    "ROBLOX": "$RBLX"
-}
-
 # Dosyalar
-DAILY_CACHE_FILE = "daily_cache.json"  # Günlük cache
+DAILY_CACHE_FILE = "daily_cache.json"  # Eski günlük cache (Sadece RecordStore'a geçiş için okunur)
 POSTED_FILE = "posted_tweets.json"     # Atılan tweetler
 STATE_FILE = "bot_state.json"          # Bot durumu
+CANDIDATE_QUEUE_FILE = "candidate_queue.json"  # Kalıcı aday kuyruğu (Günler arası)
+
+# Ortak state katmanı (Atomic yazma + Lock) - cron, Actions ve sec_bot aynı anda çalışabilir
+posted_store = StateStore(POSTED_FILE, default=lambda: {"serial_numbers": [], "tweets": []})
 
 # Rate limit - Daha hızlı çekmek için düşürdük (USPTO'yu zorlamayalım ama)
 RATE_LIMIT_DELAY = 0.15  # 0.15 saniye = ~7 istek/saniye
 MAX_TWEETS_PER_RUN = 2   # Her çalışmada max 2 tweet (User isteği)
+DEDUP_LOOKAHEAD = 5      # Kopyalar elenince boşluk kalmasın diye kuyruktan slot x 5 aday oku
 
 
 # ============== GÜNLÜK CACHE ==============
 
+_record_store = None
+_candidate_queue = None
+_lazy_lock = threading.RLock()   # Outbox lane thread'leri (save_posted) ilk çağrıda yarışmasın
+
+
+def get_record_store() -> RecordStore:
+    """Tek kayıt deposu (Lazy - sec_bot/tech_news import edince dosya açmasın)"""
+    global _record_store
+    if _record_store is None:
+        with _lazy_lock:
+            if _record_store is None:
+                _record_store = RecordStore(legacy_cache_file=DAILY_CACHE_FILE)
+    return _record_store
+
+
+def get_candidate_queue() -> CandidateQueue:
+    """Günler arası aday kuyruğu (İlk kurulumda bugünün kayıtlarıyla doldurulur)"""
+    global _candidate_queue
+    if _candidate_queue is None:
+        with _lazy_lock:
+            if _candidate_queue is None:
+                is_new = not os.path.exists(CANDIDATE_QUEUE_FILE)
+                queue = CandidateQueue(CANDIDATE_QUEUE_FILE)
+                if is_new:
+                    queue.push(get_record_store().today())
+                _candidate_queue = queue  # Doldurulmadan diğer thread'lere görünmesin
+    return _candidate_queue
+
+
 def get_today_str() -> str:
     """Bugünün tarihini YYYY-MM-DD formatında döndür"""
     return date.today().isoformat()
 
 
 def load_daily_cache() -> Dict:
-    """Günlük cache'i yükle - last_serial'ı her zaman koru!"""
+    """Günlük görünüm - bugünün kayıtları + last_serial (RecordStore'dan)"""
     try:
-        if os.path.exists(DAILY_CACHE_FILE):
-            with open(DAILY_CACHE_FILE, 'r', encoding='utf-8') as f:
-                cache = json.load(f)
-                # Bugünün cache'i mi kontrol et
-                if cache.get('date') == get_today_str():
-                    logging.info(f"📦 Cache yüklendi: {len(cache.get('trademarks', []))} trademark")
-                    return cache
-                else:
-                    # Yeni gün ama last_serial'ı koru!
-                    old_serial = cache.get('last_serial')
-                    logging.info(f"📅 Cache eski, yeni gün - son serial {old_serial}'den devam edilecek")
-                    return {'date': None, 'trademarks': [], 'last_serial': old_serial}
+        store = get_record_store()
+        store.rescore_stale()  # Kurallar değiştiyse (rules_version) eski puanları yenile
+        trademarks, last_serial = store.today_with_cursor()
+        if trademarks:
+            logging.info(f"📦 Cache yüklendi: {len(trademarks)} trademark")
+            return {'date': get_today_str(), 'trademarks': trademarks, 'last_serial': last_serial}
+        # Yeni gün ama last_serial'ı koru!
+        logging.info(f"📅 Bugün henüz kayıt yok - son serial {last_serial}'den devam edilecek")
+        return {'date': None, 'trademarks': [], 'last_serial': last_serial}
+    except StateCorruptError as e:
+        # İmleç bu dosyada: varsayılanla devam etmek yanlış serial'dan taramak olur
+        logging.error(f"❌ history.json bozuk, elle kontrol edin: {e}")
+        raise
     except Exception as e:
         logging.error(f"Cache yükleme hatası: {e}")
     
@@ -246,17 +133,13 @@ def load_daily_cache() -> Dict:
 
 
 def save_daily_cache(trademarks: List[Dict], last_serial: int):
-    """Günlük cache'i kaydet"""
+    """Yeni kayıtları ve imleci depoya yaz (Tek yazma: history + cursor)"""
     try:
-        cache = {
-            'date': get_today_str(),
-            'trademarks': trademarks,
-            'last_serial': last_serial,
-            'saved_at': datetime.now().isoformat()
-        }
-        with open(DAILY_CACHE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(cache, f, ensure_ascii=False)
-        logging.info(f"💾 Cache kaydedildi: {len(trademarks)} trademark")
+        get_record_store().ingest(trademarks, last_serial)  # Puanlar burada hesaplanır
+        get_candidate_queue().push(trademarks)
+        logging.info(f"💾 Depo güncellendi: +{len(trademarks)} trademark (Son serial: {last_serial})")
+    except StateCorruptError:
+        raise
     except Exception as e:
         logging.error(f"Cache kaydetme hatası: {e}")
 
@@ -265,23 +148,19 @@ def get_trademarks_for_today() -> List[Dict]:
     """
     Bugünkü trademark'ları al - AKILLI TARAMA (Incremental)
     
-    1. Cache'i yükle (varsa)
+    1. Depodan bugünün kayıtlarını ve son serial'ı al
     2. USPTO'dan en son serial'i kontrol et
-    3. Cache'deki son serial ile USPTO arasındaki farkı kapat
-    4. Sadece YENİ olanları listeye ve cache'e ekle
+    3. Depodaki son serial ile USPTO arasındaki farkı kapat
+    4. Sadece YENİ olanları depoya ekle (Tek yazma)
     """
     cache = load_daily_cache()
-    cached_trademarks = []
-    last_known_serial = None
-
-    # Cache varsa yükle
-    if cache.get('date') == get_today_str():
-        cached_trademarks = cache.get('trademarks', [])
-        last_known_serial = cache.get('last_serial')
-        print(f"📦 Cache'de {len(cached_trademarks)} kayıt var (Son serial: {last_known_serial})")
+    cached_trademarks = cache.get('trademarks', [])
+    last_known_serial = cache.get('last_serial')
+
+    if cached_trademarks:
+        print(f"📦 Depoda bugün {len(cached_trademarks)} kayıt var (Son serial: {last_known_serial})")
     else:
-        # Cache yoksa veya tarih eskiyse last_serial'ı koru (dünden kalan) ama listeyi sıfırla
-        last_known_serial = cache.get('last_serial')
+        # Bugün henüz kayıt yoksa last_serial'ı koru (dünden kalan) ama listeyi sıfırla
         print(f"🔄 Günlük liste sıfır (Dünden kalan serial: {last_known_serial})")
 
     # TSDR Scraper Başlat
@@ -289,9 +168,7 @@ def get_trademarks_for_today() -> List[Dict]:
     
     # Şu anki en son serial kaç?
     latest_serial = scraper.find_latest_serial()
-    
-    # Initialize History Manager
-    history_manager = HistoryManager()
+    new_trademarks = []
 
     # Eğer hiç last_known yoksa (ilk kurulum), simülasyon için son 200'ü al
     if not last_known_serial:
@@ -302,13 +179,6 @@ def get_trademarks_for_today() -> List[Dict]:
         print(f"   {INITIAL_SERIAL_RANGE} serial taranacak (~3 saatlik güncel veri)")
         new_trademarks = scraper.scan_range(start_serial, latest_serial)
         
-        # Save to History (PERSISTENCE)
-        if new_trademarks:
-            history_manager.append_to_history(new_trademarks)
-        
-        # Hepsini ekle
-        cached_trademarks.extend(new_trademarks)
-        
     else:
         # INCREMENTAL TARAMA: Aradaki farkı bul
         diff = latest_serial - last_known_serial
@@ -325,187 +195,58 @@ def get_trademarks_for_today() -> List[Dict]:
             
             new_trademarks = scraper.scan_range(last_known_serial + 1, latest_serial)
             
-            # Save to History (PERSISTENCE)
             if new_trademarks:
-                history_manager.append_to_history(new_trademarks)
-            
-            # Yenileri ekle
-            if new_trademarks:
-                cached_trademarks.extend(new_trademarks)
                 print(f"✅ {len(new_trademarks)} yeni trademark eklendi.")
         else:
             print("😴 Yeni başvuru yok, her şey güncel.")
     
-    # Cache'i güncelle
-    if cached_trademarks:
-        # En büyük serial'ı bul (garanti olsun)
-        all_serials = [int(tm.get('serial_number', 0)) for tm in cached_trademarks]
-        final_last_serial = max(all_serials) if all_serials else latest_serial
-        save_daily_cache(cached_trademarks, final_last_serial)
-    else:
-        # Hiçbir şey yoksa bile latest_serial'ı kaydet ki bir dahakine baştan başlamasın
-        save_daily_cache([], latest_serial)
+    # Depoyu güncelle (PERSISTENCE) - Hiçbir şey yoksa bile latest_serial'ı kaydet ki bir dahakine baştan başlamasın
+    new_records = [normalize_record(tm) for tm in new_trademarks]
+    save_daily_cache(new_records, max(last_known_serial or 0, latest_serial))
+    cached_trademarks.extend(new_records)
         
     return cached_trademarks
 
 
 # ============== FİLTRELEME ==============
-
-# 🔴 SIKICI - Bunları çıkar
-BORING_PATTERNS = [
-    # Eğitim
-    'elementary school', 'high school', 'middle school', 'university', 'college', 'academy',
-    # Din
-    'church', 'ministry', 'chapel', 'cathedral', 'baptist', 'methodist', 'lutheran',
-    # Kurumsal sıkıcı
-    'foundation', 'association', 'society', 'federation', 'council', 'committee',
-    # Hukuk
-    'law office', 'law firm', 'attorney', 'legal services', 'lawyers', 'law group',
-    # Emlak
-    'realty', 'real estate', 'properties', 'mortgage', 'title company', 'homes',
-    # Finans sıkıcı
-    'insurance', 'accounting', 'tax service', 'bookkeeping', 'cpa',
-    # Danışmanlık
-    'consulting group', 'advisory', 'management consulting', 'solutions group',
-    # Yatırım
-    'holdings', 'investments', 'capital group', 'asset management', 'equity',
-    # Cenaze
-    'funeral', 'cemetery', 'memorial', 'mortuary',
-    # Ev hizmetleri
-    'plumbing', 'hvac', 'roofing', 'landscaping', 'lawn care', 'pest control',
-    # Sağlık sıkıcı
-    'dental', 'dentistry', 'orthodontic', 'chiropractic', 'physical therapy',
-]
-
-# 🟢 İLGİNÇ - Bunlara öncelik ver
-INTERESTING_PATTERNS = [
-    # Tech/AI - En önemli
-    ' ai', 'ai ', '-ai', 'a.i.', 'gpt', 'llm', 'neural', 'quantum',
-    'cyber', 'crypto', 'bitcoin', 'ethereum', 'nft', 'web3', 'defi',
-    'blockchain', 'metaverse', 'virtual reality', 'vr', 'augmented',
-    'machine learning', 'deep learning', 'artificial intelligence',
-    'robot', 'automation', 'autonomous', 'self-driving', 'drone',
-    'cloud', 'saas', 'fintech', 'biotech', 'cleantech', 'healthtech',
-    'chatbot', 'copilot', 'assistant', 'smart',
-    
-    # Gaming/Entertainment
-    'game', 'gaming', 'esport', 'streamer', 'twitch', 'discord',
-    'anime', 'manga', 'cosplay', 'comic', 'superhero',
-    
-    # Lifestyle/Trendy
-    'vibe', 'zen', 'mindful', 'wellness', 'organic', 'sustainable',
-    'plant-based', 'vegan', 'eco-', 'green',
-    
-    # Fun/Creative
-    'ninja', 'wizard', 'dragon', 'phoenix', 'cosmic', 'stellar', 'galaxy',
-    'pixel', 'neon', 'retro', 'vintage', 'artisan', 'craft',
-    'hustle', 'grind', 'boss', 'empire', 'kingdom', 'squad',
-    
-    # Trendy Food
-    'brew', 'coffee', 'boba', 'matcha', 'acai', 'kombucha', 'sushi',
-]
+# Puanlama kuralları ve motoru scoring.py'de (Tekli + vektörel batch)
 
 
+_POSTED_MARK_RE = re.compile(r'📌 (.+)')
+_POSTED_GOODS_RE = re.compile(r'📝 (.+)')
 
 
-# 🟢 SCORE WEIGHTS
-SCORE_RULES = {
-    'known_company': 50,    # Apple, Google vs
-    'ai_keyword': 25,       # AI, GPT, Neural
-    'tech_keyword': 15,     # Crypto, Cloud, Cyber
-    'cool_keyword': 10,     # Game, Vibe, Zen
-    'tech_class': 10,       # Software, Electronics classes
-    'boring_match': -100,   # Furniture, Law firm
-    'short_name': 5         # < 6 chars
-}
+def build_posted_dup_index(posted: Dict) -> NearDupIndex:
+    """Son paylaşılan tweetlerin benzerlik indeksi (Eski kayıtlarda isim tweet metninden çıkarılır)"""
+    index = NearDupIndex()
+    for tweet in posted.get('tweets', []):
+        mark = tweet.get('mark')
+        goods = tweet.get('goods')
+        if mark is None:
+            text = tweet.get('text') or ''
+            mark_match, goods_match = _POSTED_MARK_RE.search(text), _POSTED_GOODS_RE.search(text)
+            mark = mark_match.group(1) if mark_match else None
+            goods = goods_match.group(1) if goods_match else None
+        if tweet.get('serial') and mark:
+            index.add(tweet['serial'], mark, goods)
+    return index
 
-# 🏷️ INTERESTING CLASSES (International Class)
-TECH_CLASSES = ['009', '035', '036', '038', '041', '042']
 
-def calculate_importance_score(tm: Dict) -> tuple[int, List[str]]:
+def filter_and_select(trademarks: Optional[List[Dict]] = None, max_tweets: int = 4) -> List[Dict]:
     """
-    Trademark'a puan ver
-    Returns: (score, reasons)
+    Kalıcı aday kuyruğundan en iyileri seç + 1 Tane Weird Candidate (Opsiyonel)
+    Kayıtlar ingest sırasında kuyruğa girer; trademarks verilirse (eski çağrılar,
+    kuyrukta olmayan kayıtlar) önce onlar eklenir.
     """
-    score = 0
-    reasons = []
-    
-    name = (tm.get('mark_name') or '').lower().strip()
-    owner = (tm.get('owner') or '').lower()
-    goods = (tm.get('goods_services') or '').lower()
-    int_class = str(tm.get('international_class', '')).zfill(3)
-    
-    # 0. Geçersiz isimler
-    if not name or name == 'none' or len(name) < 2:
-        return -999, ['❌ Geçersiz isim']
-    
-    # 1. Bilinen Şirketler (+50)
-    for company in KNOWN_COMPANIES:
-        # Regex ile tam kelime eşleşmesi (örn: "Intel" -> "Intelligent" eşleşmesin)
-        pattern = r'\b' + re.escape(company.lower()) + r'\b'
-        if re.search(pattern, owner):
-            score += SCORE_RULES['known_company']
-            reasons.append(f"🏢 {company.title()}")
-            break
-            
-    # 2. Sıkıcı mı? (-100)
-    for pattern in BORING_PATTERNS:
-        if pattern in name or pattern in owner:
-            score += SCORE_RULES['boring_match']
-            reasons.append(f"❌ {pattern}")
-            return score, reasons # Direkt dön, boşa işlem yapma
-    
-    # 3. AI Keywords (+25)
-    # Regex ile tam kelime kontrolü (Cleaner AIR vs AI karışmaması için)
-    ai_keywords = ['ai', 'gpt', 'llm', 'neural', 'machine learning', 'deep learning']
-    for kw in ai_keywords:
-        pattern = r'\b' + re.escape(kw) + r'\b'
-        if re.search(pattern, name):
-            score += SCORE_RULES['ai_keyword']
-            reasons.append(f"🤖 {kw.upper()}")
-            break
-            
-    # 4. Tech Keywords (+15)
-    tech_keywords = ['crypto', 'metaverse', 'quantum', 'cyber', 'web3', 'blockchain', 'robot', 'drone', 'autonomous']
-    for kw in tech_keywords:
-        if kw in name or kw in goods:
-            score += SCORE_RULES['tech_keyword']
-            reasons.append(f"💡 {kw.title()}")
-            break
-
-    # 5. Cool/Trendy Keywords (+10)
-    cool_keywords = ['game', 'gaming', 'studio', 'lab', 'labs', 'future', 'space', 'star', 'hyper', 'super']
-    for kw in cool_keywords:
-        if kw in name:
-            score += SCORE_RULES['cool_keyword']
-            reasons.append(f"✨ {kw.title()}")
-            break
-            
-    # 6. Tech Classes (+10)
-    if int_class in TECH_CLASSES:
-        score += SCORE_RULES['tech_class']
-        reasons.append(f"🏷️ Tech Class ({int_class})")
-        
-    # 7. Kısa İsim (+5)
-    if len(name) <= 5 and name.isalpha():
-        score += SCORE_RULES['short_name']
-        reasons.append("📝 Short Name")
-        
-    return score, reasons
+    queue = get_candidate_queue()
+    if trademarks:
+        queue.push(trademarks)
 
-
-def filter_and_select(trademarks: List[Dict], max_tweets: int = 4) -> List[Dict]:
-    """
-    Puanlama sistemine göre en iyileri seç + 1 Tane Weird Candidate (Opsiyonel)
-    """
     # Daha önce paylaşılanları yükle
     posted = load_posted()
-    posted_serials = set(posted.get('serial_numbers', []))
-    
-    scored_items = []
+    posted_serials = set(posted.get('serial_numbers', [])) | get_outbox().pending_ids()  # Outbox'ta bekleyenler de
     
     # --- PHASE 7: Weird Filter (with 24h Cooldown) ---
-    weird_filter = WeirdFilter()
     weird_candidate = None
     
     # Son atılan weird tweet zamanını kontrol et
@@ -521,111 +262,98 @@ def filter_and_select(trademarks: List[Dict], max_tweets: int = 4) -> List[Dict]
         except:
             pass # Tarih bozuksa yoksay, izin ver
 
-    for tm in trademarks:
-        serial = tm.get('serial_number', '')
-        
-        if serial in posted_serials:
-            continue
-            
-        score, reasons = calculate_importance_score(tm)
-        
-        # WEIRD CHECK (Sadece izin varsa)
-        if can_post_weird:
-            w_res = weird_filter.check_weirdness(tm.get('mark_name', ''), tm.get('goods_services', ''))
-            if w_res['is_weird']:
-                tm['weird_score'] = w_res['score']
-                tm['weird_reason'] = w_res['reason']
-                # En komiğini sakla
-                if not weird_candidate or tm['weird_score'] > weird_candidate['weird_score']:
-                    weird_candidate = tm
-        
-        # Normal Puanlama
-        if score > 0:
-            tm['score'] = score
-            tm['reasons'] = reasons
-            tm['category'] = 'must_post' if score >= 50 else 'interesting'
-            tm['interest_reason'] = ', '.join(reasons[:2])
-            scored_items.append(tm)
-            
-    # Puana göre sırala (Büyükten küçüğe)
-    scored_items.sort(key=lambda x: x['score'], reverse=True)
-    
-    logging.info(f"📊 Puanlama sonucu: {len(scored_items)} aday tweet")
-    
+    # Benzer marka kontrolü (MinHash/LSH): son paylaşılanlar + bu çalışmada seçilenler
+    dup_index = build_posted_dup_index(posted)
+    posted_dups = []
+
+    def is_near_duplicate(tm: Dict) -> bool:
+        duplicate = dup_index.add_if_new(tm['serial_number'], tm.get('mark_name'), tm.get('goods_services'))
+        if duplicate is None:
+            return False
+        logging.info(f"♊ Benzer marka atlandı: {tm.get('mark_name')} (~ {duplicate})")
+        if duplicate in posted_serials:
+            posted_dups.append(tm['serial_number'])  # Zaten paylaşılmışın kopyası: kuyruktan da çıkar
+        return True
+
     final_selection = []
     
     # 1. Weird Candidate Ekle (ALTIN VURUŞ - Max 1)
-    if weird_candidate:
-        logging.info(f"🤪 Weird USPTO Bulundu: {weird_candidate['mark_name']} (Puan: {weird_candidate['weird_score']})")
-        weird_candidate['category'] = 'weird'
-        # Listede varsa çıkar (tekrar etmesin)
-        scored_items = [item for item in scored_items if item['serial_number'] != weird_candidate['serial_number']]
-        final_selection.append(weird_candidate)
+    if can_post_weird:
+        for tm in queue.peek(DEDUP_LOOKAHEAD, lane='weird', exclude=posted_serials):
+            if is_near_duplicate(tm):
+                continue
+            weird_candidate = tm
+            logging.info(f"🤪 Weird USPTO Bulundu: {weird_candidate['mark_name']} (Puan: {weird_candidate['weird_score']})")
+            weird_candidate['category'] = 'weird'
+            final_selection.append(weird_candidate)
+            break
     
-    # 2. Geriye kalan boşlukları normal iyilerle doldur
+    # 2. Geriye kalan boşlukları normal iyilerle doldur (Yaşa göre azalmış puan sırasıyla)
     remaining = max_tweets - len(final_selection)
     if remaining > 0:
-        final_selection.extend(scored_items[:remaining])
-        
+        exclude = posted_serials | {tm['serial_number'] for tm in final_selection}  # Weird tekrar etmesin
+        for tm in queue.peek(remaining * DEDUP_LOOKAHEAD, lane='normal', exclude=exclude):
+            if len(final_selection) >= max_tweets:
+                break
+            if is_near_duplicate(tm):
+                continue
+            tm['category'] = 'must_post' if tm['score'] >= 50 else 'interesting'
+            tm['interest_reason'] = ', '.join(tm['reasons'][:2])
+            final_selection.append(tm)
+
+    if posted_dups:
+        queue.remove(posted_dups)
+
+    logging.info(f"📊 Kuyruktan seçim: {len(final_selection)} aday tweet")
     return final_selection
 
 
 # ============== TWEET ==============
 
 def load_posted() -> Dict:
-    try:
-        if os.path.exists(POSTED_FILE):
-            with open(POSTED_FILE, 'r') as f:
-                return json.load(f)
-    except:
-        pass
-    return {"serial_numbers": [], "tweets": []}
-
-
-def save_posted(serial: str, text: str, tweet_id: str, category: str = ''):
-    data = load_posted()
-    data["serial_numbers"].append(serial)
-    data["tweets"].append({
-        "serial": serial,
-        "tweet_id": tweet_id,
-        "text": text[:80],
-        "category": category, # Kategori bilgisini de tut
-        "time": datetime.now().isoformat()
-    })
-    
-    # WEIRD TIMESTAMPS
-    if category == 'weird':
-        data['last_weird_time'] = datetime.now().isoformat()
-        
-    # Max 500 kayıt tut
-    data["serial_numbers"] = data["serial_numbers"][-500:]
-    data["tweets"] = data["tweets"][-500:]
-    with open(POSTED_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
+    return posted_store.load()
+
+
+def save_posted(serial: str, text: str, tweet_id: str, category: str = '',
+                mark: Optional[str] = None, goods: Optional[str] = None):
+    # Oku-değiştir-yaz tek lock altında (Eşzamanlı botlar birbirinin kaydını ezmesin)
+    with posted_store.transaction() as data:
+        data.setdefault("serial_numbers", []).append(serial)
+        data.setdefault("tweets", []).append({
+            "serial": serial,
+            "tweet_id": tweet_id,
+            "text": text[:80],
+            "category": category, # Kategori bilgisini de tut
+            "mark": mark,                            # Benzer marka kontrolü için
+            "goods": (goods or '')[:200] or None,
+            "time": datetime.now().isoformat()
+        })
+        
+        # WEIRD TIMESTAMPS
+        if category == 'weird':
+            data['last_weird_time'] = datetime.now().isoformat()
+            
+        # Max 500 kayıt tut
+        data["serial_numbers"] = data["serial_numbers"][-500:]
+        data["tweets"] = data["tweets"][-500:]
+
+    # Paylaşılan aday kuyruktan çıkar
+    get_candidate_queue().remove([serial])
 
 
 def get_x_client():
-    return tweepy.Client(
-        bearer_token=X_BEARER_TOKEN,
-        consumer_key=X_API_KEY,
-        consumer_secret=X_API_SECRET,
-        access_token=X_ACCESS_TOKEN,
-        access_token_secret=X_ACCESS_TOKEN_SECRET
-    )
+    """Paylaşılan v2 client (clients.py registry, bağlantılar açık kalır)"""
+    return get_client('x')
 
 
 # ============== TWEET FORMATTING (AI & CLASSIC) ==============
 
-def generate_ai_commentary(mark: str, goods: str, owner: str) -> str:
-    """OpenAI kullanarak tweeti gazeteci gibi yorumla"""
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        return None
-        
-    try:
-        client = OpenAI(api_key=api_key)
-        
-        prompt = f"""
+AI_MODEL = "gpt-4o-mini"
+AI_HOOK_BUDGET = 25       # Saniye, tüm adayların hook'ları için toplam bekleme
+AI_BATCH_HOOKS = os.getenv("AI_BATCH_HOOKS", "1") != "0"  # Tüm adaylar tek JSON isteğinde (0: aday başına istek)
+HOOK_MAX_CHARS = 150      # Batch cevabında bundan uzun hook geçersiz
+
+COMMENTARY_PROMPT = """
         Act as a snarky, cynical tech journalist (like TechCrunch or The Verge style).
         Write a SHORT tweet hook (max 130 chars) about this new trademark filing.
         Don't include the trademark name or owner in the hook unless necessary for the joke.
@@ -634,32 +362,12 @@ def generate_ai_commentary(mark: str, goods: str, owner: str) -> str:
         
         Trademark: "{mark}"
         Owner: "{owner}"
-        Description: "{goods[:200]}..."
+        Description: "{goods}..."
         
         Output only the tweet text. No quotes.
         """
-        
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=60,
-            temperature=0.8
-        )
-        
-        return resp.choices[0].message.content.strip()
-    except Exception as e:
-        logging.error(f"AI Generation Error: {e}")
-        return None
 
-def generate_ai_weird_commentary(mark: str, goods: str, owner: str) -> str:
-    """OpenAI ile garip markaları komedyen gibi yorumla"""
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key: return None
-        
-    try:
-        client = OpenAI(api_key=api_key)
-        
-        prompt = f"""
+WEIRD_COMMENTARY_PROMPT = """
         Act as a stand-up comedian or a confused internet user.
         We found a very weird/funny trademark filing. Roast it gently or express your confusion.
         Keep it SHORT (max 130 chars).
@@ -667,25 +375,212 @@ def generate_ai_weird_commentary(mark: str, goods: str, owner: str) -> str:
         Use 1 funny emoji (like 💀, 😭, 🤨, 🤡).
         
         Trademark: "{mark}"
-        Description: "{goods[:200]}..."
+        Description: "{goods}..."
         
         Output only the tweet text.
         """
+
+BATCH_COMMENTARY_PROMPT = """
+        You write tweet hooks for new USPTO trademark filings. Write ONE hook per item.
+        - category "normal": act as a snarky, cynical tech journalist (like TechCrunch or The Verge style).
+          Be opinionated. Speculate (responsibly). Use 1 emoji.
+        - category "weird": act as a stand-up comedian or a confused internet user. Roast it gently
+          or express your confusion. Use 1 funny emoji (like 💀, 😭, 🤨, 🤡).
+        Every hook: SHORT (max 130 chars), no link, no hashtags, no quotes. Don't include the
+        trademark name or owner unless necessary for the joke.
+        
+        Items (JSON):
+        {items}
         
+        Reply with a JSON object only: {{"hooks": {{"<serial>": "<hook text>"}}}}
+        """
+
+COMMENTARY_PARAMS = {'max_tokens': 60, 'temperature': 0.8}
+WEIRD_COMMENTARY_PARAMS = {'max_tokens': 60, 'temperature': 0.9}  # Biraz daha yaratıcı olsun
+
+
+def _complete(prompt: str, max_tokens: int, temperature: float) -> str:
+    with using('openai') as client:  # Paylaşılan client (Timeout: clients.OPENAI_TIMEOUT)
+        resp = client.chat.completions.create(
+            model=AI_MODEL,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=max_tokens,
+            temperature=temperature
+        )
+    return resp.choices[0].message.content.strip()
+
+
+def _complete_json(prompt: str, max_tokens: int) -> Dict:
+    """Tek istek, JSON nesnesi cevap (response_format=json_object)"""
+    with using('openai') as client:
         resp = client.chat.completions.create(
-            model="gpt-4o-mini",
+            model=AI_MODEL,
             messages=[{"role": "user", "content": prompt}],
-            max_tokens=60,
-            temperature=0.9 # Biraz daha yaratıcı olsun
+            max_tokens=max_tokens,
+            temperature=0.85,
+            response_format={"type": "json_object"}
+        )
+    return json.loads(resp.choices[0].message.content)
+
+
+def _commentary_request(mark: str, goods: str, owner: str, weird: bool = False) -> Tuple[str, Dict, Dict]:
+    """Yorum isteği: (şablon, girdiler, parametreler) - önbellek anahtarı bunlardan çıkar"""
+    if weird:
+        return WEIRD_COMMENTARY_PROMPT, {'mark': mark, 'goods': goods[:200]}, WEIRD_COMMENTARY_PARAMS
+    return COMMENTARY_PROMPT, {'mark': mark, 'owner': owner, 'goods': goods[:200]}, COMMENTARY_PARAMS
+
+
+def generate_ai_commentary(mark: str, goods: str, owner: str) -> str:
+    """OpenAI kullanarak tweeti gazeteci gibi yorumla (Önbellekli: preview + run tek çağrı)"""
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        return None
+        
+    try:
+        template, inputs, params = _commentary_request(mark, goods, owner)
+        return get_llm_cache().get_or_create(
+            AI_MODEL, template, inputs,
+            lambda prompt: _complete(prompt, **params),
+            **params
         )
+    except Exception as e:
+        logging.error(f"AI Generation Error: {e}")
+        return None
+
+def generate_ai_weird_commentary(mark: str, goods: str, owner: str) -> str:
+    """OpenAI ile garip markaları komedyen gibi yorumla (Önbellekli)"""
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key: return None
         
-        return resp.choices[0].message.content.strip()
+    try:
+        template, inputs, params = _commentary_request(mark, goods, owner, weird=True)
+        return get_llm_cache().get_or_create(
+            AI_MODEL, template, inputs,
+            lambda prompt: _complete(prompt, **params),
+            **params
+        )
     except Exception as e:
         logging.error(f"AI Weird Gen Error: {e}")
         return None
 
-def format_tweet(tm: Dict) -> str:
-    """Tweet formatla - AI destekli hibrit yapı"""
+def _hook_fields(tm: Dict) -> Tuple[str, str, str]:
+    """Hook prompt'una giren alanlar: (mark, owner, açıklama)"""
+    mark = (tm.get('mark_name') or 'Unknown')[:40]
+    owner = (tm.get('owner') or '')[:40]
+    desc = (tm.get('goods_services') or '').strip()
+    return mark, owner, desc
+
+
+def _hook_request(tm: Dict) -> Tuple[str, Dict, Dict]:
+    """Adayın tekil isteği (generate_hook ile aynı alanlar -> aynı önbellek anahtarı)"""
+    mark, owner, desc = _hook_fields(tm)
+    return _commentary_request(mark, desc, owner, weird=tm.get('category') == 'weird')
+
+
+def generate_hook(tm: Dict) -> Optional[str]:
+    """Adayın AI hook'u (Kategoriye göre prompt seç, başarısızsa None)"""
+    mark, owner, desc = _hook_fields(tm)
+    if tm.get('category') == 'weird':
+        return generate_ai_weird_commentary(mark, desc, owner)
+    return generate_ai_commentary(mark, desc, owner)
+
+
+def _valid_hook(value) -> Optional[str]:
+    """Batch cevabındaki tek hook'u doğrula (Geçersizse None -> tekil istek)"""
+    if not isinstance(value, str):
+        return None
+    hook = value.strip().strip('"').strip()
+    if not hook or len(hook) > HOOK_MAX_CHARS or 'http' in hook.lower() or '#' in hook:
+        return None
+    return hook
+
+
+def generate_batch_hooks(candidates: List[Dict]) -> Dict[str, Optional[str]]:
+    """
+    Tüm adaylar için tek yapılandırılmış istek: {"hooks": {serial: hook}}.
+    Her hook ayrı doğrulanır; geçerli olanlar tekil anahtarlarıyla önbelleğe
+    yazılır (preview -> run tekrar sormaz), geçersizler None döner.
+    """
+    requests_by_serial = {str(tm.get('serial_number')): _hook_request(tm) for tm in candidates}
+    items = [{'serial': serial, 'category': 'weird' if template is WEIRD_COMMENTARY_PROMPT else 'normal', **inputs}
+             for serial, (template, inputs, _) in requests_by_serial.items()]
+    try:
+        prompt = BATCH_COMMENTARY_PROMPT.format(items=json.dumps(items, ensure_ascii=False, indent=2))
+        hooks = _complete_json(prompt, max_tokens=80 * len(items)).get('hooks')
+    except Exception as e:
+        logging.error(f"AI Batch Generation Error: {e}")
+        hooks = None
+    if not isinstance(hooks, dict):
+        hooks = {}
+
+    result, valid = {}, {}
+    for tm in candidates:
+        serial = str(tm.get('serial_number'))
+        hook = _valid_hook(hooks.get(serial))
+        if hook:
+            template, inputs, params = requests_by_serial[serial]
+            valid[cache_key(AI_MODEL, template, inputs, **params)] = hook
+        result[tm.get('serial_number')] = hook
+    get_llm_cache().put_many(valid)
+    return result
+
+
+def prefetch_hooks(candidates: List[Dict], budget: float = AI_HOOK_BUDGET) -> Dict[str, Optional[str]]:
+    """
+    Tüm adayların hook'larını aynı anda üret. AI_BATCH_HOOKS açıksa önce tek
+    JSON isteği (generate_batch_hooks), geçersiz dönenler aday başına paralel
+    isteğe düşer. Batch ve tekil istekler aynı bütçeyi paylaşır: toplam bekleme
+    en fazla budget saniye, yetişmeyen aday klasik formata düşer (Geç kalan
+    batch tekil isteklere süre bırakmaz).
+    Offline deneme: python fake_llm_server.py + OPENAI_BASE_URL
+    Returns: {serial: hook ya da None}
+    """
+    if not candidates or not os.getenv("OPENAI_API_KEY"):
+        return {tm.get('serial_number'): None for tm in candidates}
+
+    started = time.monotonic()
+    remaining = lambda: max(0.0, budget - (time.monotonic() - started))
+    hooks: Dict[str, Optional[str]] = {tm.get('serial_number'): None for tm in candidates}
+    pending = list(candidates)
+    late = 0
+
+    pool = ThreadPoolExecutor(max_workers=len(candidates), thread_name_prefix="hook")
+    try:
+        # 1. Batch: önbellekte olmayanlar tek istekte
+        if AI_BATCH_HOOKS and len(candidates) > 1:
+            cache = get_llm_cache()
+            for tm in candidates:
+                template, inputs, params = _hook_request(tm)
+                hooks[tm.get('serial_number')] = cache.get(cache_key(AI_MODEL, template, inputs, **params))
+            missing = [tm for tm in candidates if hooks[tm.get('serial_number')] is None]
+            if len(missing) > 1:
+                batch = pool.submit(generate_batch_hooks, missing)
+                done, _ = wait([batch], timeout=remaining())
+                if batch not in done:
+                    late = len(missing)
+                    missing = []  # Bütçe bitti: tekil isteğe de süre yok
+                elif not batch.exception():
+                    hooks.update(batch.result())
+            pending = [tm for tm in missing if hooks[tm.get('serial_number')] is None]
+
+        # 2. Kalanlar (Batch'te geçersiz / batch kapalı): aday başına paralel istek
+        if pending:
+            futures = {pool.submit(generate_hook, tm): tm.get('serial_number') for tm in pending}
+            done, not_done = wait(futures, timeout=remaining())
+            late += len(not_done)
+            for future, serial in futures.items():
+                hooks[serial] = future.result() if future in done and not future.exception() else None
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)  # Geç kalanlar beklenmez
+
+    fallback = sum(hook is None for hook in hooks.values())
+    logging.info(f"🤖 {len(hooks) - fallback}/{len(hooks)} AI hook hazır ({time.monotonic() - started:.1f} sn)"
+                 + (f", {late} bütçeyi aştı" if late else ""))
+    return hooks
+
+
+def format_tweet(tm: Dict, hooks: Optional[Dict[str, Optional[str]]] = None) -> str:
+    """Tweet formatla - AI destekli hibrit yapı (hooks: prefetch_hooks sonucu, yoksa burada üretilir)"""
     mark = (tm.get('mark_name') or 'Unknown')[:40]
     serial = tm.get('serial_number', '')
     date_str = tm.get('filing_date_raw', '')
@@ -695,11 +590,7 @@ def format_tweet(tm: Dict) -> str:
 
     # 1. AI YORUMU DENE (Graceful Fallback)
     try:
-        # Kategoriye göre prompt seç
-        if tm.get('category') == 'weird':
-            ai_text = generate_ai_weird_commentary(mark, desc, owner)
-        else:
-            ai_text = generate_ai_commentary(mark, desc, owner)
+        ai_text = hooks.get(serial) if hooks is not None else generate_hook(tm)
             
         if ai_text:
             # Başarılı! Hibrid Formatı Oluştur
@@ -721,11 +612,9 @@ def format_tweet(tm: Dict) -> str:
                 if 'game' in text_lower: hashtags.append("#Gaming")
                 
                 # Ticker check
-                owner_lower = owner.lower()
-                for company, ticker in KNOWN_TICKERS.items():
-                    if company.lower() in owner_lower:
-                        hashtags.append(ticker)
-                        break
+                match = COMPANY_MATCHER.match(owner)
+                if match and match.ticker:
+                    hashtags.append(match.ticker)
                         
                 if hashtags:
                     tweet += "\n\n" + " ".join(hashtags)
@@ -766,13 +655,10 @@ def format_tweet(tm: Dict) -> str:
         emoji = '📝'
     
     # Replace Owner with Twitter Handle if known
-    # Regex ile güvenli değişim
-    owner_lower = owner.lower()
-    for company, handle in KNOWN_COMPANIES.items():
-        pattern = r'\b' + re.escape(company.lower()) + r'\b'
-        if re.search(pattern, owner_lower):
-             owner = f"{handle} ({owner})"
-             break
+    # Şirket, handle ve ticker tek geçişte (companies.COMPANY_MATCHER)
+    company_match = COMPANY_MATCHER.match(owner)
+    if company_match and company_match.handle:
+        owner = f"{company_match.handle} ({owner})"
              
     # Insider Text / Intro
     intro = ""
@@ -833,13 +719,8 @@ def format_tweet(tm: Dict) -> str:
         hashtags.append("#Tech")
 
     # Stock Ticker Logic ($CASHTAGS)
-    found_ticker = None
-    for company, ticker in KNOWN_TICKERS.items():
-        pattern = r'\b' + re.escape(company.lower()) + r'\b'
-        if re.search(pattern, owner_lower):
-             hashtags.append(ticker) # $AAPL vb ekle
-             found_ticker = ticker
-             break
+    if company_match and company_match.ticker:
+        hashtags.append(company_match.ticker) # $AAPL vb ekle
         
     tags_str = " ".join(hashtags)
     tweet += f"\n\n🔗 {url}\n\n{tags_str}"
@@ -848,34 +729,34 @@ def format_tweet(tm: Dict) -> str:
 
 
 def get_x_api_v1():
-    """Media upload için v1.1 API client"""
-    auth = tweepy.OAuthHandler(X_API_KEY, X_API_SECRET)
-    auth.set_access_token(X_ACCESS_TOKEN, X_ACCESS_TOKEN_SECRET)
-    return tweepy.API(auth)
+    """Media upload için paylaşılan v1.1 API client"""
+    return get_client('x_v1')
 
 
-def post_tweet(text: str, media_path: Optional[str] = None) -> Optional[str]:
-    """Tweet at (Opsiyonel görsel ile)"""
+def post_tweet(text: str, media_path: Optional[str] = None, media_id: Optional[str] = None,
+               account: str = DEFAULT_ACCOUNT) -> Optional[str]:
+    """
+    Tweet at (Opsiyonel görsel ile; media_id verilirse önceden yüklenmiş görsel kullanılır).
+    account: accounts.py hesabı (İstemci, kota ve media_id hesaba ait)
+    """
+    quota = get_post_quota(account)
     try:
-        client = get_x_client() # v2.0
-        media_id = None
-        
-        # 1. Görsel yükle (varsa)
-        if media_path and os.path.exists(media_path):
-            try:
-                api_v1 = get_x_api_v1()
-                media = api_v1.media_upload(media_path)
-                media_id = media.media_id
+        # 1. Görsel yükle (varsa, önceden yüklenmediyse)
+        if not media_id and media_path and os.path.exists(media_path):
+            media_id = upload_media(media_path, account)
+            if media_id:
                 print(f"🖼️ Görsel yüklendi: {media_path} (ID: {media_id})")
-            except Exception as e:
-                logging.error(f"Görsel yükleme hatası: {e}")
+            else:
                 print(f"⚠️ Görsel yüklenemedi, twistsiz devam ediliyor...")
         
-        # 2. Tweet at
-        if media_id:
-            response = client.create_tweet(text=text, media_ids=[media_id])
-        else:
-            response = client.create_tweet(text=text)
+        # 2. Tweet at (v2.0)
+        with using(client_name('x', account)) as client:
+            if media_id:
+                response = client.create_tweet(text=text, media_ids=[media_id])
+            else:
+                response = client.create_tweet(text=text)
+        # Kalan kota (Hesabın tüm botları paylaşıyor - outbox buna göre erteler)
+        quota.record_post(getattr(client.session, 'last_headers', None))
             
         tweet_id = str(response.data['id'])
         print(f"✅ https://twitter.com/i/status/{tweet_id}")
@@ -885,6 +766,7 @@ def post_tweet(text: str, media_path: Optional[str] = None) -> Optional[str]:
         if hasattr(e, 'response') and e.response is not None:
              # Headerları yazdır (Rate limit için)
              headers = e.response.headers
+             quota.observe(headers, limited=getattr(e.response, 'status_code', None) == 429)
              if headers:
                  limit = headers.get('x-rate-limit-remaining')
                  reset = headers.get('x-rate-limit-reset')
@@ -899,64 +781,96 @@ def post_tweet(text: str, media_path: Optional[str] = None) -> Optional[str]:
         logging.error(error_msg)
         print(f"❌ {error_msg}")
 
+def send_outbox_entry(entry: Dict) -> Optional[str]:
+    """
+    Outbox girdisini gönder (Tüm botlar). Trademark girdisinde görsel bu
+    makinede yoksa yeniden hazırlanır ve paylaşım kaydedilir. Returns: tweet id
+    """
+    tm = entry.get('record')
+    account = entry.get('account') or DEFAULT_ACCOUNT
+    if not tm:
+        return post_tweet(entry['text'], entry.get('media_path'), account=account)
+
+    media_path = entry.get('media_path')
+    media_id = None
+    if not media_path or not os.path.exists(media_path):
+        # Görsel bu makinede yok (Yeni runner): önceden yüklenen media_id hâlâ geçerliyse onu kullan
+        media_id = entry.get('media_id') if media_id_fresh(entry.get('media_uploaded_at')) else None
+        if not media_id:
+            media_path = prepare_one(tm)
+
+    tweet_id = post_tweet(entry['text'], media_path, media_id=media_id, account=account)
+    if not tweet_id and media_id and not get_post_quota(account).blocked_until():
+        # Önceden yüklenen görsel reddedilmiş olabilir: önbellekten sil, bir kere taze yüklemeyle dene
+        get_media_cache().forget(media_id)
+        if not media_path or not os.path.exists(media_path):
+            media_path = prepare_one(tm)
+        tweet_id = post_tweet(entry['text'], media_path, account=account)
+    if tweet_id:
+        save_posted(tm.get('serial_number'), entry['text'], tweet_id, category=tm.get('category', ''),
+                    mark=tm.get('mark_name'), goods=tm.get('goods_services'))
+        # Temizlik
+        if media_path and os.path.exists(media_path):
+            os.remove(media_path)
+    return tweet_id
+
+
+def dispatch_outbox() -> Dict[str, Optional[str]]:
+    """Her hesabın lane'inden hazır en öncelikli tweeti (Lane'ler aynı anda) gönder ve çık"""
+    outbox = get_outbox()
+    sent = outbox.dispatch_lanes(send_outbox_entry)
+    next_due = outbox.next_due()
+    if next_due is not None:
+        wait_time = max(0, int(next_due - time.time()))
+        print(f"📤 Outbox: {len(outbox)} tweet bekliyor, sıradaki {wait_time // 60} dk sonra "
+              f"({datetime.fromtimestamp(next_due):%H:%M})")
+    elif not any(sent.values()):
+        print("📭 Outbox boş.")
+    return sent
+
+
 def tweet_candidates(candidates: List[Dict], dry_run: bool = False):
     """
-    Seçilen adayları tweet at (veya preview yap)
+    Seçilen adayları outbox'a yaz ve zamanı gelenleri gönder (veya preview yap).
+    Tweetler arası bekleme sleep değil due_at: kalanlar sonraki dispatch'lerde gider.
     """
     print(f"\n📢 Tweet atılıyor{'(DRY RUN)' if dry_run else ''}...")
     
     # Görsel indirmek için scraper (sadece download methodu için)
     scraper = TSDRScraper()
     
+    # AI hook'ları (Tek seferde, paralel) ve görseller (İndirme / kart / yükleme) aynı anda
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="hooks") as pool:
+        hooks_future = pool.submit(prefetch_hooks, candidates)
+        media = prepare_media_batch(candidates, upload=not dry_run, scraper=scraper,
+                                    account_for=lambda tm: route('trademark', tm))
+        hooks = hooks_future.result()
+    
+    prepared = []
     for i, tm in enumerate(candidates, 1):
         print(f"\n[{i}/{len(candidates)}] {tm.get('mark_name')} (Score: {tm.get('score', 0)})")
         print(f"   Reasons: {', '.join(tm.get('reasons', []))}")
         
-        tweet_text = format_tweet(tm)
-        
-        # --- GÖRSEL HAZIRLIĞI ---
-        media_path = None
-        try:
-            # 1. Önce resmi var mı bak (Drawing)
-            if tm.get('image_url'):
-                print(f"   📥 Görsel indiriliyor: {tm['image_url']}")
-                media_path = scraper.download_image(tm['image_url'], tm.get('serial_number'))
-            
-            # 2. Yoksa Kart Oluştur (Card Gen)
-            if not media_path:
-                print(f"   🎨 Kartvizit oluşturuluyor...")
-                media_path = generate_trademark_card(
-                    mark_name=tm.get('mark_name', 'UNKNOWN'),
-                    owner=tm.get('owner', 'Unknown'),
-                    date_str=tm.get('filing_date_raw', '2025'),
-                    serial=tm.get('serial_number'),
-                    description=tm.get('goods_services', '') # Görselde açıklama göster
-                )
-        except Exception as e:
-            logging.error(f"Görsel hazırlama hatası: {e}")
-            print(f"⚠️ Görsel hatası: {e}")
-            
+        tweet_text = format_tweet(tm, hooks)
+        media_path = media[tm.get('serial_number')]['media_path']
         
         if dry_run:
             print(f"\n--- PREVIEW ---\n{tweet_text}")
             if media_path:
                 print(f"[Görsel Eklendi: {media_path}]")
             print("---------------")
-            
         else:
-            tweet_id = post_tweet(tweet_text, media_path)
-            if tweet_id:
-                save_posted(tm.get('serial_number'), tweet_text, tweet_id, category=tm.get('category', ''))
-            
-            # Temizlik
-            if media_path and os.path.exists(media_path):
-                os.remove(media_path)
-                
-            # Tweetler arası rastgele bekleme (3-7 dk) - Bot Detection Önlemi
-            wait_time = random.randint(180, 420)
-            print(f"⏳ Bekleniyor: {wait_time // 60} dakika ({wait_time} sn)...")
-            time.sleep(wait_time)
+            prepared.append({'id': tm.get('serial_number'), 'text': tweet_text, 'record': tm,
+                             'account': route('trademark', tm), **media[tm.get('serial_number')]})
+    get_llm_cache().flush()  # Kullanım zamanları + sayaçlar: çalışma başına tek yazma
+    
+    if prepared:
+        get_outbox().schedule(prepared, source='trademark')
+        dispatch_outbox()
     
+    llm_stats = get_llm_cache().stats()
+    if llm_stats['hits'] or llm_stats['misses'] or llm_stats['expired']:
+        logging.info(f"🧠 LLM cache: {llm_stats['hits']} hit / {llm_stats['misses']} miss / {llm_stats['expired']} expired")
     print(f"\n✅ Tamamlandı!")
 
 
@@ -975,7 +889,7 @@ def run_bot(max_tweets: int = 4, dry_run: bool = False):
         return
     
     # DÜZELTME: Doğru fonksiyon ismi filter_and_select
-    candidates = filter_and_select(trademarks, max_tweets)
+    candidates = filter_and_select(max_tweets=max_tweets)
     # filter_and_select zaten max_tweets kadar döndürüyor ama yine de slicing yapalım ne olur ne olmaz
     selected = candidates[:max_tweets]
 
@@ -986,7 +900,7 @@ def parse_arguments():
     if len(sys.argv) < 2:
         return 'run', False, False # default
     
-    command = sys.argv[1] # run, preview, clear
+    command = sys.argv[1] # run, preview, dispatch, clear
     
     # Flags
     dry_run = '--dry-run' in sys.argv
@@ -1010,6 +924,11 @@ def main():
         clear_cache()
         return
     
+    elif command == 'dispatch':
+        # Outbox'ta zamanı gelen tweeti gönder ve çık (cron / Actions sık çağırır)
+        dispatch_outbox()
+        return
+    
     elif command == 'stats-weekly':
         analyzer = Analyzer()
         report = analyzer.generate_weekly_report()
@@ -1018,13 +937,14 @@ def main():
         # Tweet at (Eğer --tweet argümanı varsa)
         if '--tweet' in sys.argv:
             print("📢 Rapor tweetleniyor...")
-            client = get_x_client() # Client init
             # Rapor zaten kısa (280 char kontrolü analyzer içinde yapılmalı veya burada)
             # Analyzer raporu biraz uzun olabilir, kontrol edelim
             if len(report) > 280:
                 report = report[:277] + "..."
             
-            post_tweet(report)
+            # Ortak outbox (Kota / aralık diğer botlarla paylaşılır)
+            get_outbox().schedule([{'id': f"report:{date.today().isoformat()}", 'text': report}], source='report')
+            dispatch_outbox()
         return
 
     elif command == 'stats':
@@ -1055,8 +975,8 @@ def main():
 
     # 2. Filter & Score
     print("🔍 Filtreleniyor...")
-    # filter_and_select hem puanlar hem de en iyileri seçer
-    selected = filter_and_select(trademarks, MAX_TWEETS_PER_RUN)
+    # Puanlar ingest'te hesaplandı; filter_and_select kalıcı kuyruktan en iyileri seçer
+    selected = filter_and_select(max_tweets=MAX_TWEETS_PER_RUN)
     print(f"INFO - 📊 Puanlama sonucu ve seçim: {len(selected)} aday tweet")
     
     # Top N selection (filter_and_select zaten yaptı ama değişken adı uyumu için)
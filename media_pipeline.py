@@ -0,0 +1,231 @@
+"""
+Media Pipeline - Seçilen adayların görsellerini paralel hazırla
+===============================================================
+tweet_candidates her aday için sırayla görsel indiriyor ya da kart çiziyor,
+yükleme de tweet anında yapılıyordu; hepsi kritik yolda seri çalışıyordu.
+Artık tüm adayların görselleri aynı anda hazırlanır:
+
+    İndirme   I/O thread havuzu (MEDIA_IO_WORKERS)
+    Kart      Aynı havuzda, sırayla (_render_lock; aday başına ayrı dosya)
+    Yükleme   Görsel hazır olur olmaz I/O havuzunda X'e yüklenir (upload=True);
+              media_id outbox girdisine yazılır, slot gelince tweet direkt atılır
+
+İndirme başarısız olursa o aday hemen kart kuyruğuna düşer (Diğerlerini
+beklemez). Kartlar için process havuzu yok: çalışma başına ~2 kart çiziliyor
+ve hook thread'leri çalışırken fork etmek kilitlenmeye yol açabilir. Fontlar
+ve arka plan şablonu (visuals.py) process içinde paylaşıldığı için çizimler
+birbirini bekler; indirme ve yüklemeler beklemez.
+X media_id'leri ~24 saat geçerli: MEDIA_ID_TTL_HOURS'tan eskisi yeniden yüklenir.
+
+Yükleme önbelleği (media_cache.json): sha256(dosya) -> media_id. Tekrar
+denenen tweet ya da aynı görselle atılan takip tweeti dosyayı yeniden
+yüklemez. Süre X'in döndürdüğü expires_after_secs'ten (Yoksa
+MEDIA_ID_TTL_HOURS) MEDIA_EXPIRY_MARGIN düşülerek hesaplanır. media_id
+yükleyen hesaba ait: anahtar hesap + hash, görsel her hesabın kendi
+istemcisiyle yüklenir (accounts.py).
+"""
+
+import time
+import hashlib
+import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from tsdr_scraper import TSDRScraper
+from visuals import generate_trademark_card
+from clients import using
+from accounts import DEFAULT_ACCOUNT, client_name
+from state_store import StateStore
+
+MEDIA_IO_WORKERS = 8         # İndirme + yükleme + kart
+MEDIA_ID_TTL_HOURS = 20      # X media_id ~24 saat geçerli (Pay bırak)
+MEDIA_CACHE_FILE = "media_cache.json"
+MEDIA_EXPIRY_MARGIN = 3600   # Saniye, X'in bildirdiği süreden düşülen pay (Tweet anında geçerli olsun)
+
+
+def card_path(serial: str) -> str:
+    """Aday başına ayrı kart dosyası (Outbox'ta birden fazla kart bekleyebilir)"""
+    return f"temp_card_{serial}.png"
+
+
+_render_lock = threading.Lock()   # Önbellekteki PIL font / şablon nesneleri thread-safe değil
+
+
+def render_card(tm: Dict) -> str:
+    """Kartı çiz (Media havuzu ve outbox lane thread'lerinden çağrılır, çizimler sırayla)"""
+    with _render_lock:
+        return generate_trademark_card(
+            mark_name=tm.get('mark_name', 'UNKNOWN'),
+            owner=tm.get('owner', 'Unknown'),
+            date_str=tm.get('filing_date_raw', '2025'),
+            serial=tm.get('serial_number'),
+            description=tm.get('goods_services', ''), # Görselde açıklama göster
+            output_path=card_path(tm.get('serial_number'))
+        )
+
+
+def prepare_one(tm: Dict, scraper: Optional[TSDRScraper] = None) -> Optional[str]:
+    """Tek aday, seri: önce resmi çizim, yoksa kart (Dispatch'te görsel kaybolmuşsa)"""
+    media_path = None
+    try:
+        if tm.get('image_url'):
+            media_path = (scraper or TSDRScraper()).download_image(tm['image_url'], tm.get('serial_number'))
+        if not media_path:
+            media_path = render_card(tm)
+    except Exception as e:
+        logging.error(f"Görsel hazırlama hatası: {e}")
+    return media_path
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class MediaIdCache:
+    """(Hesap, içerik hash'i) -> X media_id (Süresi dolan kayıt kullanılmaz, yazarken temizlenir)"""
+
+    def __init__(self, path: str = MEDIA_CACHE_FILE):
+        self.path = path
+        self.store = StateStore(path, default=lambda: {"media": {}})
+
+    def get(self, digest: str, now: Optional[float] = None) -> Optional[str]:
+        now = now if now is not None else datetime.now().timestamp()
+        entry = self.store.load().get("media", {}).get(digest)
+        if entry and entry['expires_at'] > now:
+            return entry['media_id']
+        return None
+
+    def put(self, digest: str, media_id: str, expires_after: Optional[float] = None, now: Optional[float] = None):
+        now = now if now is not None else datetime.now().timestamp()
+        ttl = expires_after - MEDIA_EXPIRY_MARGIN if expires_after else MEDIA_ID_TTL_HOURS * 3600
+        with self.store.transaction() as data:
+            media = data.setdefault("media", {})
+            for old in [key for key, entry in media.items() if entry['expires_at'] <= now]:
+                del media[old]
+            media[digest] = {'media_id': media_id, 'uploaded_at': now, 'expires_at': now + ttl}
+
+    def uploaded_at(self, media_id: str) -> Optional[float]:
+        """media_id'nin gerçek yüklenme zamanı (Önbellekten dönmüş olabilir)"""
+        for entry in self.store.load().get("media", {}).values():
+            if entry['media_id'] == media_id:
+                return entry['uploaded_at']
+        return None
+
+    def forget(self, media_id: str):
+        """X bu media_id'yi reddetti: bir daha verme"""
+        with self.store.transaction() as data:
+            media = data.setdefault("media", {})
+            for key in [key for key, entry in media.items() if entry['media_id'] == media_id]:
+                del media[key]
+
+
+_media_cache = None
+_media_cache_lock = threading.Lock()
+
+
+def get_media_cache() -> MediaIdCache:
+    global _media_cache
+    if _media_cache is None:
+        with _media_cache_lock:  # Upload / outbox lane thread'leri
+            if _media_cache is None:
+                _media_cache = MediaIdCache()
+    return _media_cache
+
+
+def upload_media(media_path: str, account: str = DEFAULT_ACCOUNT) -> Optional[str]:
+    """Görseli hesabın X istemcisiyle yükle (v1.1; aynı içerik daha önce yüklendiyse önbellekten). Returns: media_id ya da None"""
+    try:
+        cache = get_media_cache()
+        key = f"{account}:{file_sha256(media_path)}"
+        media_id = cache.get(key)
+        if media_id:
+            logging.info(f"♻️ Görsel zaten yüklü ({key[:len(account) + 9]}): {media_id}")
+            return media_id
+        with using(client_name('x_v1', account)) as api_v1:
+            media = api_v1.media_upload(media_path)
+        media_id = str(media.media_id)
+        cache.put(key, media_id, expires_after=getattr(media, 'expires_after_secs', None))
+        return media_id
+    except Exception as e:
+        logging.error(f"Görsel yükleme hatası: {e}")
+        return None
+
+
+def media_id_fresh(uploaded_at: Optional[float], now: Optional[float] = None) -> bool:
+    """Önceden yüklenen media_id hâlâ kullanılabilir mi"""
+    now = now if now is not None else datetime.now().timestamp()
+    return bool(uploaded_at) and now - uploaded_at < MEDIA_ID_TTL_HOURS * 3600
+
+
+def prepare_media_batch(candidates: List[Dict], upload: bool = False, scraper: Optional[TSDRScraper] = None,
+                        account_for: Optional[Callable[[Dict], str]] = None) -> Dict[str, Dict]:
+    """
+    Tüm adayların görsellerini paralel hazırla (ve upload=True ise yükle).
+    account_for: aday -> tweeti atacak hesap (media_id o hesaba yüklenir)
+    Returns: {serial: {'media_path', 'media_id', 'media_uploaded_at'}}
+    """
+    results = {tm.get('serial_number'): {'media_path': None, 'media_id': None, 'media_uploaded_at': None}
+               for tm in candidates}
+    if not candidates:
+        return results
+
+    started = time.monotonic()
+    scraper = scraper or TSDRScraper()
+    io_pool = ThreadPoolExecutor(max_workers=MEDIA_IO_WORKERS, thread_name_prefix="media")
+    pending: Dict[Future, tuple] = {}
+    counts = {'download': 0, 'render': 0, 'upload': 0}
+
+    def submit_render(tm: Dict):
+        pending[io_pool.submit(render_card, tm)] = ('render', tm)
+
+    def media_ready(tm: Dict, media_path: str):
+        results[tm.get('serial_number')]['media_path'] = media_path
+        if upload:
+            account = account_for(tm) if account_for else DEFAULT_ACCOUNT
+            pending[io_pool.submit(upload_media, media_path, account)] = ('upload', tm)
+
+    try:
+        for tm in candidates:
+            if tm.get('image_url'):
+                pending[io_pool.submit(scraper.download_image, tm['image_url'], tm.get('serial_number'))] = ('download', tm)
+            else:
+                submit_render(tm)
+
+        while pending:
+            done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, tm = pending.pop(future)
+                try:
+                    value = future.result()
+                except Exception as e:
+                    logging.error(f"Görsel hazırlama hatası ({stage}, {tm.get('serial_number')}): {e}")
+                    value = None
+
+                if stage == 'download':
+                    if value:
+                        counts['download'] += 1
+                        media_ready(tm, value)
+                    else:
+                        submit_render(tm)  # Çizim yok / indirilemedi: kart
+                elif stage == 'render':
+                    if value:
+                        counts['render'] += 1
+                        media_ready(tm, value)
+                elif value:
+                    counts['upload'] += 1
+                    uploaded_at = get_media_cache().uploaded_at(value) or datetime.now().timestamp()
+                    results[tm.get('serial_number')].update(media_id=value, media_uploaded_at=uploaded_at)
+    finally:
+        io_pool.shutdown(wait=False)
+
+    logging.info(f"🖼️ {counts['download'] + counts['render']}/{len(candidates)} görsel hazır "
+                 f"({counts['download']} indirildi, {counts['render']} kart"
+                 + (f", {counts['upload']} yüklendi" if upload else "")
+                 + f") {time.monotonic() - started:.1f} sn")
+    return results
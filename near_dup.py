@@ -0,0 +1,130 @@
+"""
+Near-Duplicate - MinHash + LSH ile benzer marka tespiti
+=======================================================
+Aynı sahip aynı markayı farklı sınıf / stilize versiyon olarak ardışık
+serial'larla defalarca başvuruyor; serial bazlı dedup bunları yakalamıyor ve
+iki tweet slotu da aynı markaya gidebiliyor.
+
+Her kayıt için iki MinHash imzası:
+    isim   -> harf 3-gramları ("PERSONA AI" ~ "PERSONA AI PRO")
+    goods  -> kelimeler
+İsim imzası LSH bantlarına bölünür; sorgu sadece aynı kovaya düşen adaylarla
+karşılaştırılır (Kayıt başına alt-doğrusal). Kopya kuralı:
+    isim benzerliği >= NAME_DUP_THRESHOLD
+    veya isim >= NAME_MIN_THRESHOLD ve goods >= GOODS_DUP_THRESHOLD
+"""
+
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+NUM_PERM = 64                 # İmza uzunluğu
+LSH_BANDS = 16                # 16 bant x 4 satır -> ~%50 benzerlikte aday olma eşiği
+LSH_ROWS = NUM_PERM // LSH_BANDS
+
+NAME_DUP_THRESHOLD = 0.8      # İsim neredeyse aynı (Stilize/farklı sınıf)
+NAME_MIN_THRESHOLD = 0.6      # İsim benzer...
+GOODS_DUP_THRESHOLD = 0.5     # ...ve goods da benzer (Varyant)
+GOODS_MAX_WORDS = 40          # Goods'un ilk 40 kelimesi yeterli
+
+_MERSENNE_PRIME = (1 << 31) - 1
+_rng = np.random.RandomState(20240601)  # Sabit tohum: imzalar çalışmalar arası aynı
+_PERM_A = _rng.randint(1, _MERSENNE_PRIME, size=NUM_PERM).astype(np.uint64)
+_PERM_B = _rng.randint(0, _MERSENNE_PRIME, size=NUM_PERM).astype(np.uint64)
+_EMPTY_SIGNATURE = np.full(NUM_PERM, _MERSENNE_PRIME, dtype=np.uint64)
+
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9 ]+')
+_WORD_RE = re.compile(r'[a-z0-9]+')
+
+
+def name_shingles(name: Optional[str]) -> Set[str]:
+    """İsmin harf 3-gramları (Boşluk ve noktalama normalize)"""
+    text = ' '.join(_NON_ALNUM_RE.sub(' ', (name or '').lower()).split())
+    if text == 'none':  # Scraper'ın isimsiz kayıtları
+        return set()
+    if len(text) < 3:
+        return {text} if text else set()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def goods_shingles(goods: Optional[str]) -> Set[str]:
+    return set(_WORD_RE.findall((goods or '').lower())[:GOODS_MAX_WORDS])
+
+
+def minhash(shingles: Iterable[str]) -> np.ndarray:
+    """(a*x + b) mod p permütasyonlarıyla MinHash imzası (Vektörel)"""
+    hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) % _MERSENNE_PRIME for s in shingles), dtype=np.uint64)
+    if not len(hashes):
+        return _EMPTY_SIGNATURE
+    return ((np.outer(_PERM_A, hashes) + _PERM_B[:, None]) % _MERSENNE_PRIME).min(axis=1)
+
+
+def similarity(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    """İki imzadan tahmini Jaccard benzerliği"""
+    if sig_a is _EMPTY_SIGNATURE or sig_b is _EMPTY_SIGNATURE:
+        return 0.0
+    return float(np.count_nonzero(sig_a == sig_b)) / NUM_PERM
+
+
+class NearDupIndex:
+    """İsim imzası üzerinde LSH; her ekleme/sorgu sadece kendi kovalarına bakar"""
+
+    def __init__(self):
+        self._buckets: List[Dict[bytes, List[Hashable]]] = [defaultdict(list) for _ in range(LSH_BANDS)]
+        self._signatures: Dict[Hashable, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    @staticmethod
+    def signatures(name: Optional[str], goods: Optional[str]) -> Tuple[np.ndarray, np.ndarray]:
+        return minhash(name_shingles(name)), minhash(goods_shingles(goods))
+
+    @staticmethod
+    def _bands(name_sig: np.ndarray) -> List[bytes]:
+        return [name_sig[i * LSH_ROWS:(i + 1) * LSH_ROWS].tobytes() for i in range(LSH_BANDS)]
+
+    def _add(self, key: Hashable, name_sig: np.ndarray, goods_sig: np.ndarray):
+        self._signatures[key] = (name_sig, goods_sig)
+        for band, bucket in zip(self._buckets, self._bands(name_sig)):
+            band[bucket].append(key)
+
+    def _find(self, name_sig: np.ndarray, goods_sig: np.ndarray) -> Optional[Hashable]:
+        seen = set()
+        for band, bucket in zip(self._buckets, self._bands(name_sig)):
+            for key in band.get(bucket, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                other_name, other_goods = self._signatures[key]
+                name_sim = similarity(name_sig, other_name)
+                if name_sim >= NAME_DUP_THRESHOLD:
+                    return key
+                if name_sim >= NAME_MIN_THRESHOLD and similarity(goods_sig, other_goods) >= GOODS_DUP_THRESHOLD:
+                    return key
+        return None
+
+    def add(self, key: Hashable, name: Optional[str], goods: Optional[str]):
+        name_sig, goods_sig = self.signatures(name, goods)
+        if name_sig is not _EMPTY_SIGNATURE:
+            self._add(key, name_sig, goods_sig)
+
+    def find(self, name: Optional[str], goods: Optional[str]) -> Optional[Hashable]:
+        """Kopya sayılan ilk kayıt (Yoksa None)"""
+        name_sig, goods_sig = self.signatures(name, goods)
+        if name_sig is _EMPTY_SIGNATURE:
+            return None
+        return self._find(name_sig, goods_sig)
+
+    def add_if_new(self, key: Hashable, name: Optional[str], goods: Optional[str]) -> Optional[Hashable]:
+        """Kopyası varsa onun anahtarını döndür, yoksa ekle ve None döndür"""
+        name_sig, goods_sig = self.signatures(name, goods)
+        if name_sig is _EMPTY_SIGNATURE:
+            return None
+        duplicate = self._find(name_sig, goods_sig)
+        if duplicate is None:
+            self._add(key, name_sig, goods_sig)
+        return duplicate
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Outbox - Tüm botların ortak, kalıcı tweet kuyruğu
+=================================================
+tweet_candidates eskiden tweetler arasında time.sleep(180-420) yapıyordu:
+2 tweetlik bir çalışma process'i (ve Actions runner'ı) 7 dakika boşta tutuyordu.
+sec_bot ve tech_news de aynı hesaptan birbirinden habersiz tweet atıyordu.
+Artık her bot hazırladığı tweeti (metin + görsel + kayıt) buraya yazar, her
+çalışma sadece gönderilmeye hazır olan tek tweeti gönderip çıkar.
+
+    schedule   Girdi ekle (source -> öncelik: PRIORITIES)
+    dispatch   Hazır girdilerden en yüksek öncelikliyi gönder (Eşitse en eski)
+    Hazır      due_at geçti + son gönderimden bu yana girdinin aralığı
+               (OUTBOX_GAP_SECONDS) geçti + X kotası açık (post_quota.py)
+    Kota       Kota bitmişse ya da 429 geldiyse gönderim reset'e ertelenir,
+               deneme hakkı yemez
+    Hata       attempts++, OUTBOX_RETRY_SECONDS sonra tekrar; OUTBOX_MAX_ATTEMPTS'ta düşer
+    Claim      Gönderilen girdi OUTBOX_CLAIM_SECONDS boyunca kilitli (Aynı anda
+               çalışan iki dispatch aynı tweeti atmasın)
+    Lane       Girdi schedule'da hesabına yönlendirilir (accounts.route). Aralık
+               ve kota hesap başına; dispatch_lanes her lane'den birer tweeti
+               aynı anda gönderir, dolu bir lane diğerlerini bekletmez
+
+Kullanım:
+    python main_v2.py dispatch      # Hazır tweeti gönder (cron / Actions)
+    python outbox.py [list]         # Bekleyenler
+    python outbox.py due            # Hazır tweet var mı? (exit 0 / 1, shell için)
+"""
+
+import sys
+import random
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from state_store import StateStore
+from post_quota import PostQuota, get_post_quota
+from accounts import DEFAULT_ACCOUNT, route
+
+OUTBOX_FILE = "outbox.json"
+OUTBOX_GAP_SECONDS = (180, 420)   # Tweetler arası rastgele aralık (3-7 dk) - Bot Detection Önlemi
+OUTBOX_RETRY_SECONDS = 600        # Başarısız gönderim 10 dk sonra tekrar denenir
+OUTBOX_MAX_ATTEMPTS = 3
+OUTBOX_CLAIM_SECONDS = 300        # Gönderimdeki girdi bu süre boyunca başka dispatch'e verilmez
+OUTBOX_TTL_HOURS = 24             # Bundan fazla gecikmiş girdi atılmaz (Güncelliğini yitirdi)
+
+# Kaynak -> öncelik (Büyük önce gider; haber değeri en hızlı düşen en önde)
+PRIORITIES = {
+    'sec': 30,          # Form D funding alert
+    'news': 20,         # Techmeme / Product Hunt / GitHub
+    'report': 15,       # Haftalık istatistik
+    'trademark': 10,    # USPTO adayları (Kuyrukta bekleyebilir)
+}
+
+
+def _order(entry: Dict):
+    """Gönderim sırası: öncelik, sonra en eski (Öncelik alanı olmayan eski girdiler: trademark)"""
+    return -entry.get('priority', PRIORITIES['trademark']), entry['due_at']
+
+
+def _lane(entry: Dict) -> str:
+    return entry.get('account') or DEFAULT_ACCOUNT
+
+
+def _last_sent(data: Dict) -> Dict[str, float]:
+    """Hesap -> son gönderim (Tek hesaplı eski formattaki last_sent_at main'e taşınır)"""
+    last_sent = data.setdefault("last_sent", {})
+    if data.get("last_sent_at"):
+        last_sent.setdefault(DEFAULT_ACCOUNT, data["last_sent_at"])
+    data.pop("last_sent_at", None)
+    return last_sent
+
+
+class Outbox:
+    def __init__(self, path: str = OUTBOX_FILE, gap: Tuple[int, int] = OUTBOX_GAP_SECONDS,
+                 ttl_hours: float = OUTBOX_TTL_HOURS, quota: Optional[Callable[[str], PostQuota]] = None):
+        self.path = path
+        self.gap = gap
+        self.ttl = ttl_hours * 3600
+        self.quota = quota   # Hesap -> PostQuota
+        self.store = StateStore(path, default=lambda: {"entries": [], "last_sent": {}})
+
+    def _gap(self) -> int:
+        return random.randint(*self.gap)
+
+    def _blocked_until(self, account: str, now: float) -> Optional[float]:
+        return self.quota(account).blocked_until(now) if self.quota else None
+
+    @staticmethod
+    def _ready_at(entry: Dict, data: Dict) -> float:
+        """Girdinin gönderilebileceği ilk an (Kota hariç; aralık kendi lane'inin son gönderiminden)"""
+        return max(entry['due_at'], (_last_sent(data).get(_lane(entry)) or 0) + entry['gap'])
+
+    # ============== YAZMA ==============
+
+    def schedule(self, items: Iterable[Dict], source: str = 'trademark', priority: Optional[int] = None,
+                 now: Optional[float] = None) -> List[Dict]:
+        """
+        items: {'id', 'text', 'media_path'?, 'record'?, 'account'?} (Zaten bekleyen id atlanır;
+        account verilmezse accounts.route ile kaynağa / kategoriye göre seçilir)
+        Returns: eklenen girdiler
+        """
+        now = now if now is not None else datetime.now().timestamp()
+        priority = priority if priority is not None else PRIORITIES.get(source, 0)
+        added = []
+        with self.store.transaction() as data:
+            entries = data.setdefault("entries", [])
+            pending = {entry['id'] for entry in entries}
+            for item in items:
+                if item['id'] in pending:
+                    continue
+                entry = {'media_path': None, 'record': None, **item, 'source': source, 'priority': priority,
+                         'account': item.get('account') or route(source, item.get('record')),
+                         'due_at': now, 'gap': self._gap(), 'created_at': now, 'attempts': 0, 'claimed_at': None}
+                entries.append(entry)
+                pending.add(item['id'])
+                added.append(entry)
+        if added:
+            lanes = sorted({entry['account'] for entry in added})
+            logging.info(f"📤 Outbox: +{len(added)} tweet ({source}, öncelik {priority} -> {', '.join(lanes)})")
+        return added
+
+    def claim(self, account: str = DEFAULT_ACCOUNT, now: Optional[float] = None) -> Optional[Dict]:
+        """Lane'in hazır girdilerinden en öncelikliyi kilitle ve döndür (Süresi dolanlar atılır)"""
+        now = now if now is not None else datetime.now().timestamp()
+        if self._blocked_until(account, now):
+            return None
+        with self.store.transaction() as data:
+            entries = data.setdefault("entries", [])
+            kept = []
+            for entry in entries:
+                if now - entry['due_at'] > self.ttl:
+                    logging.warning(f"🗑️ Outbox: {entry['id']} {self.ttl / 3600:.0f} saatten fazla gecikti, atıldı")
+                else:
+                    kept.append(entry)
+            entries[:] = kept
+
+            ready = [entry for entry in entries if _lane(entry) == account and self._ready_at(entry, data) <= now
+                     and (not entry.get('claimed_at') or now - entry['claimed_at'] > OUTBOX_CLAIM_SECONDS)]
+            if not ready:
+                return None
+            entry = min(ready, key=_order)
+            entry['claimed_at'] = now
+            return dict(entry)
+
+    def complete(self, entry_id: str, account: str = DEFAULT_ACCOUNT, now: Optional[float] = None):
+        """Gönderildi: girdiyi çıkar (Lane'deki sonrakilerin aralığı bu andan sayılır)"""
+        now = now if now is not None else datetime.now().timestamp()
+        with self.store.transaction() as data:
+            data["entries"] = [entry for entry in data.get("entries", []) if entry['id'] != entry_id]
+            _last_sent(data)[account] = now
+
+    def release(self, entry_id: str):
+        """Gönderilmedi ama hata değil (Kota): kilidi kaldır, deneme sayma"""
+        with self.store.transaction() as data:
+            for entry in data.get("entries", []):
+                if entry['id'] == entry_id:
+                    entry['claimed_at'] = None
+
+    def fail(self, entry_id: str, error: str = '', now: Optional[float] = None) -> bool:
+        """Gönderilemedi: sonra tekrar dene. Returns: girdi hâlâ kuyrukta mı"""
+        now = now if now is not None else datetime.now().timestamp()
+        with self.store.transaction() as data:
+            entries = data.setdefault("entries", [])
+            for entry in entries:
+                if entry['id'] != entry_id:
+                    continue
+                entry['attempts'] += 1
+                entry['claimed_at'] = None
+                entry['last_error'] = error[:200]
+                if entry['attempts'] >= OUTBOX_MAX_ATTEMPTS:
+                    entries.remove(entry)
+                    logging.error(f"❌ Outbox: {entry_id} {OUTBOX_MAX_ATTEMPTS} denemede gönderilemedi, atıldı")
+                    return False
+                entry['due_at'] = now + OUTBOX_RETRY_SECONDS
+                return True
+        return False
+
+    def dispatch(self, send: Callable[[Dict], Optional[str]], account: str = DEFAULT_ACCOUNT,
+                 now: Optional[float] = None) -> Optional[str]:
+        """
+        Lane'in hazır en öncelikli girdisini send(entry) ile gönder (Bir çağrıda en
+        fazla bir tweet: aralık korunur). Returns: send'in döndürdüğü tweet id ya da None
+        """
+        entry = self.claim(account, now)
+        if entry is None:
+            return None
+        try:
+            result = send(entry)
+            error = '' if result else 'send returned None'
+        except Exception as e:
+            result, error = None, str(e)
+        if result:
+            self.complete(entry['id'], account, now)
+        elif self._blocked_until(account, now if now is not None else datetime.now().timestamp()):
+            self.release(entry['id'])  # 429 / kota bitti: reset'te tekrar
+        else:
+            self.fail(entry['id'], error, now)
+        return result
+
+    def dispatch_lanes(self, send: Callable[[Dict], Optional[str]], now: Optional[float] = None) -> Dict[str, Optional[str]]:
+        """Bekleyen her lane'den birer tweet, lane'ler aynı anda (Her hesabın kendi istemcisi / kotası)"""
+        lanes = sorted(self.lanes())
+        if len(lanes) <= 1:
+            return {lane: self.dispatch(send, lane, now) for lane in lanes}
+        with ThreadPoolExecutor(max_workers=len(lanes), thread_name_prefix="lane") as pool:
+            results = pool.map(lambda lane: self.dispatch(send, lane, now), lanes)
+            return dict(zip(lanes, results))
+
+    # ============== OKUMA ==============
+
+    def entries(self) -> List[Dict]:
+        """Bekleyenler (Gönderim sırasıyla)"""
+        return sorted(self.store.load().get("entries", []), key=_order)
+
+    def pending_ids(self) -> Set[str]:
+        """Kuyruktaki id'ler (Aday seçiminde tekrar seçilmesin)"""
+        return {entry['id'] for entry in self.store.load().get("entries", [])}
+
+    def lanes(self) -> Set[str]:
+        """Bekleyen girdisi olan hesaplar"""
+        return {_lane(entry) for entry in self.store.load().get("entries", [])}
+
+    def next_due(self, now: Optional[float] = None) -> Optional[float]:
+        """Herhangi bir lane'de sıradaki gönderimin mümkün olduğu an (Aralık + kota dahil), boşsa None"""
+        now = now if now is not None else datetime.now().timestamp()
+        data = self.store.load()
+        ready: Dict[str, float] = {}
+        for entry in data.get("entries", []):
+            lane = _lane(entry)
+            ready[lane] = min(ready.get(lane, float('inf')), self._ready_at(entry, data))
+        if not ready:
+            return None
+        return min(max(ready_at, self._blocked_until(lane, now) or 0) for lane, ready_at in ready.items())
+
+    def __len__(self) -> int:
+        return len(self.store.load().get("entries", []))
+
+
+_outbox = None
+
+
+def get_outbox() -> Outbox:
+    global _outbox
+    if _outbox is None:
+        _outbox = Outbox(quota=get_post_quota)
+    return _outbox
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else "list"
+    outbox = get_outbox()
+    now = datetime.now().timestamp()
+    if command == "list":
+        entries = outbox.entries()
+        next_due = outbox.next_due(now)
+        print(f"📤 Outbox: {len(entries)} bekleyen tweet"
+              + (f", sıradaki {datetime.fromtimestamp(next_due):%H:%M}" if next_due else ""))
+        for entry in entries:
+            print(f"   [{_lane(entry)} {entry.get('source', 'trademark')}/{entry.get('priority', PRIORITIES['trademark'])}] {entry['id']}  "
+                  f"{datetime.fromtimestamp(entry['due_at']):%Y-%m-%d %H:%M}  deneme {entry['attempts']}  "
+                  f"{entry['text'][:50]!r}")
+        return 0
+    if command == "due":
+        next_due = outbox.next_due(now)
+        return 0 if next_due is not None and next_due <= now else 1
+    print("Kullanım: python outbox.py [list|due]")
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
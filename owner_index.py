@@ -0,0 +1,150 @@
+"""
+Owner Index - Başvuru sahibi (owner) çözümleme
+==============================================
+Aynı şirket farklı yazılıyor: "Apple Inc.", "APPLE INC", "Apple Inc. (California
+corporation)", "APPLE INC., A CALIFORNIA CORPORATION". Hepsi tek bir tamsayı
+entity ID'ye bağlanır:
+
+    raw owner --(alias cache)--> id          Görülmüş string: sıfır işlem
+    raw owner --normalize_owner--> key --> id Yeni string: bir kere normalize
+    key tokenları --(token index)--> id       Sıra farkı ("SMITH, JOHN" / "JOHN SMITH")
+
+Alias cache ve entity listesi owner_index.json'da kalıcı; analizler (top
+şirketler, dedup) string yerine ID üzerinde çalışır.
+"""
+
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from state_store import StateStore
+from companies import COMPANY_MATCHER
+
+OWNER_INDEX_FILE = "owner_index.json"
+
+# Sondaki şirket türü kelimeleri (Normalizasyonda atılır)
+LEGAL_SUFFIXES = {
+    'INC', 'INCORPORATED', 'CORP', 'CORPORATION', 'CO', 'COMPANY', 'LLC', 'LLP', 'LP',
+    'LTD', 'LIMITED', 'PLC', 'GMBH', 'AG', 'SA', 'SAS', 'SRL', 'BV', 'NV', 'KK', 'PTY',
+    'PC', 'PLLC', 'LLLP',
+}
+EMPTY_OWNERS = {'', 'UNKNOWN', 'N/A', 'NA', 'NONE'}
+
+_PAREN_RE = re.compile(r'\([^)]*\)')
+_ENTITY_CLAUSE_RE = re.compile(r',\s*(A|AN)\s+.*$')   # ", A CALIFORNIA CORPORATION"
+_SPLIT_RE = re.compile(r'[^\w&]+')                    # AT&T tek token kalsın
+
+
+def normalize_owner(raw: Optional[str]) -> str:
+    """'Apple Inc. (California corporation)' -> 'APPLE' (Boşsa '')"""
+    text = _PAREN_RE.sub(' ', (raw or '').upper()).replace('.', '')
+    text = _ENTITY_CLAUSE_RE.sub('', text)
+    tokens = [token for token in _SPLIT_RE.split(text) if token]
+    while len(tokens) > 1 and tokens[-1] in LEGAL_SUFFIXES:
+        tokens.pop()
+    if len(tokens) > 1 and tokens[0] == 'THE':
+        tokens = tokens[1:]
+    key = ' '.join(tokens)
+    return '' if key in EMPTY_OWNERS or ''.join(tokens) in EMPTY_OWNERS else key  # "N/A" -> "N A"
+
+
+def _display_name(raw: str) -> str:
+    return ' '.join(_PAREN_RE.sub(' ', raw).split()).rstrip(',')
+
+
+class OwnerIndex:
+    """Raw owner -> entity ID (Kalıcı alias cache + token index)"""
+
+    def __init__(self, path: str = OWNER_INDEX_FILE):
+        self.path = path
+        self.store = StateStore(path, default=lambda: {"entities": [], "aliases": {}})
+        self._load(self.store.load())
+
+    def _load(self, data: Dict):
+        self.entities: List[Dict] = data.get("entities", [])      # entities[id]
+        self.aliases: Dict[str, Optional[int]] = data.get("aliases", {})
+        self._by_key = {entity['key']: entity['id'] for entity in self.entities}
+        self._tokens: Dict[str, Set[int]] = defaultdict(set)
+        for entity in self.entities:
+            self._index_tokens(entity)
+        self._companies: Dict[int, Optional[str]] = {}
+
+    def _index_tokens(self, entity: Dict):
+        for token in entity['key'].split():
+            self._tokens[token].add(entity['id'])
+
+    # ============== ÇÖZÜMLEME ==============
+
+    def _match_key(self, key: str) -> Optional[int]:
+        """Aynı key ya da aynı token kümesi (Sıra farkı) olan entity"""
+        if key in self._by_key:
+            return self._by_key[key]
+        tokens = set(key.split())
+        postings = [self._tokens.get(token, set()) for token in tokens]
+        if not postings:
+            return None
+        for entity_id in set.intersection(*postings):
+            if set(self.entities[entity_id]['key'].split()) == tokens:
+                return entity_id
+        return None
+
+    def _assign(self, raw: str):
+        key = normalize_owner(raw)
+        if not key:
+            self.aliases[raw] = None
+            return
+        entity_id = self._match_key(key)
+        if entity_id is None:
+            entity_id = len(self.entities)
+            entity = {'id': entity_id, 'key': key, 'name': _display_name(raw)}
+            self.entities.append(entity)
+            self._by_key[key] = entity_id
+            self._index_tokens(entity)
+        self.aliases[raw] = entity_id
+
+    def resolve_many(self, raws: Iterable[Optional[str]]) -> List[Optional[int]]:
+        """
+        Owner stringlerini ID'lere çevir. Bilinmeyen stringler tek lock altında
+        (diskteki son hal üzerine) eklenir, ID'ler process'ler arası tutarlı kalır.
+        """
+        raws = list(raws)
+        missing = list(dict.fromkeys(raw for raw in raws if raw and raw not in self.aliases))  # Sıralı (İlk görülen isim)
+        if missing:
+            with self.store.transaction() as data:
+                self._load(data)
+                for raw in missing:
+                    if raw not in self.aliases:
+                        self._assign(raw)
+                data["entities"] = self.entities
+                data["aliases"] = self.aliases
+        return [self.aliases.get(raw) if raw else None for raw in raws]
+
+    def resolve(self, raw: Optional[str]) -> Optional[int]:
+        return self.resolve_many([raw])[0]
+
+    # ============== SORGULAR ==============
+
+    def name(self, entity_id: int) -> str:
+        return self.entities[entity_id]['name']
+
+    def company(self, entity_id: int) -> Optional[str]:
+        """Entity bilinen bir şirket mi? (Entity başına bir kere hesaplanır)"""
+        if entity_id not in self._companies:
+            self._companies[entity_id] = COMPANY_MATCHER.first(self.entities[entity_id]['key'].lower(), 'companies')
+        return self._companies[entity_id]
+
+    def search(self, text: str) -> List[int]:
+        """Tüm tokenları içeren entity'ler (Token index üzerinden)"""
+        tokens = normalize_owner(text).split()
+        if not tokens:
+            return []
+        return sorted(set.intersection(*(self._tokens.get(token, set()) for token in tokens)))
+
+    def top(self, entity_ids: Iterable[Optional[int]], n: int = 3) -> List[Tuple[str, int]]:
+        """En çok başvuru yapan n entity: [(isim, adet)]"""
+        counts: Dict[int, int] = defaultdict(int)
+        for entity_id in entity_ids:
+            if entity_id is not None:
+                counts[entity_id] += 1
+        best = sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:n]
+        return [(self.name(entity_id), count) for entity_id, count in best]
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Phonetic - Ses benzeri marka isimleri ("NYKEE" ~ NIKE, "KWIK" ~ QUICK)
+======================================================================
+Yazımı farklı ama okunuşu aynı isimler trigram indeksinden kaçıyor
+("NYKEE" ile "NIKE" tek trigram paylaşmıyor). Her token sadeleştirilmiş
+Double Metaphone anahtarına çevrilir (birincil + alternatif okunuş):
+
+    NIKE / NYKEE / NYKE   -> NK
+    QUICK / KWIK          -> KK
+    COCA-COLA / KOKA KOLA -> KKKL
+
+Anahtar -> marka dict'i ile arama token başına O(1). Anahtar sesli
+harfleri atar, çok kaba: NK = NIKE ama NICK, NIKKY de. Sinyal için ayrıca:
+
+    - Markanın birincil okunuşu tutmalı (CHANEL'in "K" alternatifi CANOLY'yi getirmez)
+    - Uzunluk farkı <= MAX_LENGTH_DIFF, yazım benzerliği >= SOUNDALIKE_MIN_RATIO
+    - Yazım iskeletinin (spelling_skeleton) ilk harfi aynı; kısa anahtarlarda
+      (<= SHORT_KEY_LENGTH ses) iskeletin tamamı: NYKEE/NIKE -> "nik", NIKKY -> "niki"
+    - Token sözlük kelimesi değil (companies.COMMON_WORDS) ve sahibin kendi
+      adı gibi okunmuyor (RAEDIATE - Radiate Authentic Energy LLC)
+
+    FAMOUS_PHONETIC_INDEX  FAMOUS_MARKS + tek kelimelik KNOWN_COMPANIES
+    build_history_index    Geçmiş kayıtların isimleri (Sadece CLI: aynı okunan isim grupları)
+
+KWIK-GPT: KWIK ile QUICK aynı anahtarda (KK) ama QUICK bir marka değil;
+GPT zaten AI kelimesi olarak puanlanıyor.
+
+Kullanım:
+    python phonetic.py "NYKEE"        # Tek isim
+    python phonetic.py rescan [gün]   # Geçmişi ses benzeri ünlü markalar için tara
+"""
+
+import re
+import sys
+from collections import defaultdict
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from companies import FAMOUS_MARKS, KNOWN_COMPANIES
+from lookalike import (Lookalike, compact, is_common_word, leet_normalize, split_tokens, token_pairs,
+                       MIN_TOKEN_LENGTH)
+from owner_index import normalize_owner
+
+SOUNDALIKE_MIN_RATIO = 0.62   # Yazım benzerliği alt sınırı ("NYKEE"/"NIKE" 0.67, "RELAX"/"ROLEX" 0.6)
+MAX_LENGTH_DIFF = 1           # "HONATTY" ~ "HONDA", "RAEDIATE" ~ "REDDIT" gibi uzunluğu tutmayanlar elenir
+MAX_KEY_LENGTH = 6            # Uzun isimlerde ilk 6 ses yeterli
+MIN_KEY_LENGTH = 2            # Tek sesli anahtarlar her şeyle eşleşir
+SHORT_KEY_LENGTH = 2          # Bu kadar kısa anahtarda (NK) yazım iskeleti birebir tutmalı
+
+# Yazım iskeleti: aynı sesi veren yazımlar tek biçime (Sesli harfler korunur)
+SKELETON_RULES = (
+    (re.compile(r'cc(?=[ei])'), 'ch'),    # GUCCI -> guchi
+    (re.compile(r'ph'), 'f'),
+    (re.compile(r'ck'), 'k'),
+    (re.compile(r'qu?'), 'k'),
+    (re.compile(r'c(?![ehiy])'), 'k'),    # COCA -> koka
+)
+_DOUBLE_RE = re.compile(r'(.)\1+')
+
+VOWELS = set('aeiouy')
+SILENT_STARTS = ('gn', 'kn', 'pn', 'wr', 'ps')
+
+
+# ============== ANAHTAR ==============
+
+def phonetic_keys(word: str) -> Tuple[str, str]:
+    """
+    Sadeleştirilmiş Double Metaphone: (birincil, alternatif) anahtar.
+    Leet normalize edilir ("NYK3" -> "nyke"), harf dışı karakterler atılır.
+    """
+    text = leet_normalize(word)
+    if not text:
+        return '', ''
+    if text.startswith(SILENT_STARTS):
+        text = text[1:]
+    elif text.startswith('x'):
+        text = 's' + text[1:]
+    elif text.startswith('wh'):
+        text = 'w' + text[2:]
+
+    primary: List[str] = []
+    alternate: List[str] = []
+
+    def add(main: str, alt: Optional[str] = None):
+        primary.append(main)
+        alternate.append(main if alt is None else alt)
+
+    n = len(text)
+    i = 0
+    while i < n:
+        ch = text[i]
+        nxt = text[i + 1] if i + 1 < n else ''
+        after = text[i + 2] if i + 2 < n else ''
+
+        if ch == nxt and ch != 'c':  # Çift harf tek ses
+            i += 1
+            continue
+        if ch in VOWELS:
+            if i == 0:
+                add('A')
+        elif ch == 'b':
+            if not (i == n - 1 and i > 0 and text[i - 1] == 'm'):  # "dumb"
+                add('P')
+        elif ch == 'c':
+            if nxt == 'h':
+                add('X', 'K')
+                i += 1
+            elif nxt == 'i' and after == 'a':
+                add('X')
+            elif nxt in ('i', 'e', 'y'):
+                add('S')
+            else:
+                add('K')
+                if nxt in ('k', 'q', 'c'):
+                    i += 1
+        elif ch == 'd':
+            if nxt == 'g' and after in ('e', 'i', 'y'):
+                add('J')
+                i += 1
+            else:
+                add('T')
+        elif ch == 'g':
+            if nxt == 'h':
+                if i == 0 or after in VOWELS:
+                    add('K')
+                i += 1  # "night" gibi sessiz GH
+            elif nxt == 'n' and (after == '' or (after == 's' and i + 3 == n)):
+                pass    # "sign", "signs"
+            elif nxt in ('e', 'i', 'y'):
+                add('J', 'K')
+            else:
+                add('K')
+        elif ch == 'h':
+            if (i == 0 or text[i - 1] in VOWELS) and nxt in VOWELS:
+                add('H')
+        elif ch == 'k':
+            add('K')
+        elif ch == 'p':
+            if nxt == 'h':
+                add('F')
+                i += 1
+            else:
+                add('P')
+        elif ch == 'q':
+            add('K')
+            if nxt == 'u':  # "quick" -> KK (u sesi W değil)
+                i += 1
+        elif ch == 's':
+            if nxt == 'h':
+                add('X')
+                i += 1
+            elif nxt == 'c' and after == 'h':
+                add('SK')
+                i += 2
+            elif nxt == 'i' and after in ('o', 'a'):
+                add('X', 'S')
+            else:
+                add('S')
+        elif ch == 't':
+            if nxt == 'h':
+                add('0', 'T')
+                i += 1
+            elif nxt == 'i' and after in ('o', 'a'):
+                add('X')
+            elif nxt == 'c' and after == 'h':
+                pass    # "match": ses CH'den gelir
+            else:
+                add('T')
+        elif ch == 'v':
+            add('F')
+        elif ch == 'w':
+            if i == 0 and nxt in VOWELS:  # Ortadaki W sessiz ("KWIK" -> KK)
+                add('W', 'F')
+        elif ch == 'x':
+            add('KS')
+        elif ch == 'z':
+            add('S')
+        else:           # f, j, l, m, n, r
+            add(ch.upper())
+        i += 1
+
+    return ''.join(primary)[:MAX_KEY_LENGTH], ''.join(alternate)[:MAX_KEY_LENGTH]
+
+
+def spelling_skeleton(word: str) -> str:
+    """'NYKEE' / 'NIKE' -> 'nik', 'NIKKY' -> 'niki', 'KOKA KOLA' / 'COCA-COLA' -> 'kokakola'"""
+    text = leet_normalize(word)
+    if not text:
+        return ''
+    text = text[0] + text[1:].replace('y', 'i')
+    for pattern, replacement in SKELETON_RULES:
+        text = pattern.sub(replacement, text)
+    text = _DOUBLE_RE.sub(r'\1', text)
+    if len(text) > 3 and text.endswith('e'):  # Sessiz e
+        text = text[:-1]
+    return text
+
+
+# ============== İNDEKS ==============
+
+class PhoneticIndex:
+    """Fonetik anahtar -> marka listesi (Sorgu token başına dict lookup)"""
+
+    def __init__(self, marks: Iterable[str] = ()):
+        self._marks: Dict[str, List[str]] = defaultdict(list)
+        self._seen = set()
+        for mark in marks:
+            self.add(mark)
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def add(self, mark: str):
+        key = compact(mark)
+        if len(key) < MIN_TOKEN_LENGTH or key in self._seen:
+            return
+        self._seen.add(key)
+        for code in set(phonetic_keys(mark)):
+            if len(code) >= MIN_KEY_LENGTH:
+                self._marks[code].append(mark)
+
+    def lookup(self, text: str) -> List[str]:
+        """Aynı okunan markalar (Birincil ya da alternatif anahtar ortak)"""
+        found = []
+        for code in set(phonetic_keys(text)):
+            for mark in self._marks.get(code, ()):
+                if mark not in found:
+                    found.append(mark)
+        return found
+
+    def clusters(self, min_size: int = 2) -> List[List[str]]:
+        """Aynı anahtarı paylaşan isim grupları (Büyükten küçüğe)"""
+        groups = [marks for marks in self._marks.values() if len(marks) >= min_size]
+        return sorted(groups, key=lambda marks: (-len(marks), marks[0]))
+
+
+def _vocabulary() -> List[str]:
+    """Ünlü markalar + tek kelimelik bilinen şirketler (Çok kelimeliler resmi unvan)"""
+    return FAMOUS_MARKS + [company for company in KNOWN_COMPANIES if ' ' not in company]
+
+
+FAMOUS_PHONETIC_INDEX = PhoneticIndex(_vocabulary())
+
+# Puanı etkileyen parametreler (scoring.rules_version hash'ine girer; yeni eşik buraya da)
+SCORING_PARAMS = {
+    'min_ratio': SOUNDALIKE_MIN_RATIO,
+    'max_length_diff': MAX_LENGTH_DIFF,
+    'max_key_length': MAX_KEY_LENGTH,
+    'min_key_length': MIN_KEY_LENGTH,
+    'short_key_length': SHORT_KEY_LENGTH,
+    'skeleton': [(pattern.pattern, replacement) for pattern, replacement in SKELETON_RULES],
+    'vocabulary': _vocabulary(),
+}
+
+
+def _owner_sounds(owner: str) -> Set[str]:
+    """Sahibin entity adındaki kelimelerin okunuşları (owner_index.normalize_owner)"""
+    sounds = set()
+    for word in normalize_owner(owner).split():
+        if len(word) >= MIN_TOKEN_LENGTH:
+            sounds.update(phonetic_keys(word))
+    return sounds
+
+
+def find_soundalike(name: str, owner: str = '', index: PhoneticIndex = FAMOUS_PHONETIC_INDEX) -> Optional[Lookalike]:
+    """Okunuşu ünlü bir markaya benziyor mu? En iyi eşleşme ya da None"""
+    owner_key = compact(owner)
+    owner_sounds = _owner_sounds(owner)
+    tokens = split_tokens(name)
+    best = None
+    # Bitişik ikililer ("RED BUL" -> "REDBUL") sadece çok kelimeli markalarla karşılaştırılır
+    for token, paired in [(token, False) for token in tokens] + [(pair, True) for pair in token_pairs(tokens)]:
+        token_key = leet_normalize(token)
+        if len(token_key) < MIN_TOKEN_LENGTH or is_common_word(token):
+            continue
+        token_codes = phonetic_keys(token_key)
+        if token_codes[0] in owner_sounds:
+            continue  # Sahibin kendi adı gibi okunuyor
+        skeleton = spelling_skeleton(token_key)
+        for mark in index.lookup(token_key):
+            famous_key = compact(mark)
+            if compact(token) == famous_key:
+                continue  # Markanın kendisi
+            if famous_key in owner_key:
+                continue  # Sahibi zaten o şirket
+            if paired and len(split_tokens(mark)) < 2:
+                continue
+            if abs(len(token_key) - len(famous_key)) > MAX_LENGTH_DIFF:
+                continue
+            mark_code = phonetic_keys(mark)[0]
+            if mark_code not in token_codes:
+                continue  # Sadece markanın alternatif okunuşu tutuyor
+            mark_skeleton = spelling_skeleton(mark)
+            if skeleton[:1] != mark_skeleton[:1]:
+                continue
+            if len(mark_code) <= SHORT_KEY_LENGTH and skeleton != mark_skeleton:
+                continue
+            ratio = SequenceMatcher(None, token_key, leet_normalize(mark)).ratio()
+            if ratio < SOUNDALIKE_MIN_RATIO:
+                continue
+            if best is None or ratio > best.similarity:
+                best = Lookalike(mark, round(ratio, 3), token)
+    return best
+
+
+def build_history_index(records: Iterable[Dict]) -> PhoneticIndex:
+    """Geçmiş kayıtların isimlerinden indeks (Ses benzeri eski başvurular)"""
+    return PhoneticIndex(tm.get('mark_name') for tm in records if tm.get('mark_name'))
+
+
+def rescan(records: Iterable[Dict]) -> List[Tuple[Dict, Lookalike]]:
+    """Batch mod: ünlü markalara ses benzeri kayıtlar (İsim+owner başına bir kere)"""
+    memo: Dict[Tuple[str, str], Optional[Lookalike]] = {}
+    hits = []
+    for tm in records:
+        pair = (tm.get('mark_name') or '', tm.get('owner') or '')
+        if pair not in memo:
+            memo[pair] = find_soundalike(*pair)
+        if memo[pair]:
+            hits.append((tm, memo[pair]))
+    return hits
+
+
+# ============== CLI ==============
+
+def main():
+    if len(sys.argv) < 2:
+        print('Kullanım: python phonetic.py "MARKA ADI" | rescan [gün]')
+        return 1
+
+    from record_store import RecordStore
+    from history_manager import HOT_DAYS
+
+    if sys.argv[1] == "rescan":
+        days = int(sys.argv[2]) if len(sys.argv) > 2 else HOT_DAYS
+        records = RecordStore().window(days=days)
+        hits = rescan(records)
+        print(f"👂 {len(records)} kayıt tarandı, {len(hits)} ses benzeri:")
+        for tm, match in hits:
+            print(f"   {tm.get('serial_number')}  {tm.get('mark_name')} ~ {match.mark} ({match.similarity}) - {tm.get('owner')}")
+        clusters = build_history_index(records).clusters(min_size=3)[:10]
+        if clusters:
+            print("🔁 Geçmişte aynı okunan isim grupları:")
+            for marks in clusters:
+                print(f"   {', '.join(marks[:6])}{' ...' if len(marks) > 6 else ''}")
+        return 0
+
+    name = sys.argv[1]
+    history_index = build_history_index(RecordStore().window(days=HOT_DAYS))
+    print(f"👂 {name}  {phonetic_keys(name)}")
+    print(f"   Ünlü markalar: {FAMOUS_PHONETIC_INDEX.lookup(name)}")
+    print(f"   Geçmiş ({len(history_index)} isim): {history_index.lookup(name)[:10]}")
+    print(f"   Soundalike sinyali: {find_soundalike(name)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
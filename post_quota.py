@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Post Quota - X hesabının paylaşılan gönderim kotası
+===================================================
+main_v2, sec_bot ve tech_news aynı hesaptan birbirinden habersiz tweet
+atıyordu; post_tweet rate limit header'larını loglayıp geçiyordu, kota
+ancak 429 gelince fark ediliyordu. Artık her create_tweet cevabının
+header'ları buraya yazılır, outbox dispatch kota bitmişse gönderimi
+reset zamanına erteler (Hata sayılmaz, deneme hakkı yemez).
+
+    x-rate-limit-*          Endpoint penceresi (15 dk)
+    x-user-limit-24hour-*   Kullanıcı başına günlük tweet limiti
+    x-app-limit-24hour-*    Uygulama başına günlük limit
+
+Kota hesap başına tutulur (accounts.py): bir hesabın dolan kotası diğer
+hesapların lane'lerini durdurmaz.
+
+Header gelmeyen başarılı gönderimde bilinen pencerelerin kalanı yerel
+olarak düşürülür; header'sız 429'da RATE_LIMIT_FALLBACK_SECONDS beklenir.
+
+Kullanım:
+    python post_quota.py            # Hesap başına pencereler ve kalan kota
+"""
+
+import sys
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Mapping, Optional
+
+from state_store import StateStore
+from accounts import DEFAULT_ACCOUNT, get_accounts
+
+QUOTA_FILE = "x_quota.json"
+QUOTA_WINDOWS = ("x-rate-limit", "x-user-limit-24hour", "x-app-limit-24hour")
+QUOTA_RESET_GRACE = 5              # Saniye, reset'ten sonra bu kadar daha bekle (Saat farkı)
+RATE_LIMIT_FALLBACK_SECONDS = 900  # Header'sız 429: 15 dk bekle
+
+
+def _int(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class PostQuota:
+    def __init__(self, account: str = DEFAULT_ACCOUNT, path: str = QUOTA_FILE):
+        self.account = account
+        self.path = path
+        self.store = StateStore(path, default=lambda: {"accounts": {}})
+
+    def _windows(self, data: Dict) -> Dict[str, Dict]:
+        """Bu hesabın pencereleri (Tek hesaplı eski formattaki 'windows' main'e taşınır)"""
+        accounts = data.setdefault("accounts", {})
+        if "windows" in data:
+            accounts.setdefault(DEFAULT_ACCOUNT, {"windows": data.pop("windows")})
+        return accounts.setdefault(self.account, {}).setdefault("windows", {})
+
+    def observe(self, headers: Optional[Mapping], limited: bool = False, now: Optional[float] = None) -> bool:
+        """
+        Cevap header'larını kaydet (requests header'ları büyük/küçük harf duyarsız).
+        limited: 429 geldi (Header'da bitmiş pencere yoksa yedek bekleme yazılır)
+        Returns: header'larda en az bir pencere var mıydı
+        """
+        now = now if now is not None else datetime.now().timestamp()
+        headers = headers or {}
+        seen = False
+        with self.store.transaction() as data:
+            windows = self._windows(data)
+            for window in QUOTA_WINDOWS:
+                remaining = _int(headers.get(f"{window}-remaining"))
+                reset_at = _int(headers.get(f"{window}-reset"))
+                if remaining is None or reset_at is None:
+                    continue
+                windows[window] = {'limit': _int(headers.get(f"{window}-limit")), 'remaining': remaining,
+                                   'reset_at': reset_at, 'seen_at': now}
+                seen = True
+            if limited and self._blocked_until(windows, now) is None:
+                windows["x-rate-limit"] = {'limit': None, 'remaining': 0,
+                                           'reset_at': now + RATE_LIMIT_FALLBACK_SECONDS, 'seen_at': now}
+            blocked = self._blocked_until(windows, now)
+        if blocked:
+            logging.warning(f"⏸️ X kotası doldu ({self.account}), gönderimler {datetime.fromtimestamp(blocked):%H:%M}'e kadar ertelenir")
+        return seen
+
+    def record_post(self, headers: Optional[Mapping] = None, now: Optional[float] = None):
+        """Başarılı gönderim: header varsa onları yaz, yoksa kalanları yerel olarak düşür"""
+        if self.observe(headers, now=now):
+            return
+        now = now if now is not None else datetime.now().timestamp()
+        with self.store.transaction() as data:
+            for window in self._windows(data).values():
+                if window['reset_at'] > now:
+                    window['remaining'] = max(0, window['remaining'] - 1)
+
+    @staticmethod
+    def _blocked_until(windows: Dict, now: float) -> Optional[float]:
+        blocked = [w['reset_at'] + QUOTA_RESET_GRACE for w in windows.values()
+                   if w['remaining'] <= 0 and w['reset_at'] + QUOTA_RESET_GRACE > now]
+        return max(blocked) if blocked else None
+
+    def blocked_until(self, now: Optional[float] = None) -> Optional[float]:
+        """Kota bitmişse gönderimin açılacağı zaman, değilse None"""
+        now = now if now is not None else datetime.now().timestamp()
+        return self._blocked_until(self.windows(), now)
+
+    def windows(self) -> Dict[str, Dict]:
+        return self._windows(self.store.load())
+
+
+_post_quotas: Dict[str, PostQuota] = {}
+_post_quotas_lock = threading.Lock()
+
+
+def get_post_quota(account: str = DEFAULT_ACCOUNT) -> PostQuota:
+    if account not in _post_quotas:
+        with _post_quotas_lock:  # Outbox lane thread'leri
+            if account not in _post_quotas:
+                _post_quotas[account] = PostQuota(account)
+    return _post_quotas[account]
+
+
+def main():
+    now = datetime.now().timestamp()
+    for account in get_accounts():
+        quota = get_post_quota(account)
+        windows = quota.windows()
+        print(f"📊 {account}")
+        if not windows:
+            print("   henüz header görülmedi")
+            continue
+        for name, window in sorted(windows.items()):
+            state = "sıfırlandı" if window['reset_at'] <= now else f"{window['remaining']}/{window['limit'] or '?'} kaldı"
+            print(f"   {name:<22} {state}  (reset {datetime.fromtimestamp(window['reset_at']):%Y-%m-%d %H:%M})")
+        blocked = quota.blocked_until(now)
+        print(f"   ⏸️ Gönderim {datetime.fromtimestamp(blocked):%H:%M}'e kadar kapalı" if blocked else "   ✅ Gönderim açık")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
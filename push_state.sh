@@ -0,0 +1,50 @@
+#!/bin/bash
+
+# State paketini (state_bundle + history_archive) commit edip push et.
+# Çağıran state kilidini (state_lock.sh) tutar: araya giren push sadece state
+# dışı bir commit olabilir (Kod değişikliği), commit onun üstüne rebase edilip
+# tekrar denenir. Uzaktaki state değiştiyse üzerine yazılmaz: run başarısız
+# olur, sonraki cron uzaktaki güncel state'ten başlar (Yerel state ile
+# birleştirmek gönderilmiş outbox girdilerini geri getirebilir).
+# Kullanım: ./push_state.sh "Commit mesajı"
+
+cd "$(dirname "$0")"
+
+MESSAGE="${1:-Auto: Update bot state [skip ci]}"
+BRANCH="${GITHUB_REF_NAME:-$(git rev-parse --abbrev-ref HEAD)}"
+MAX_ATTEMPTS=5
+STATE_PATHS="state_bundle history_archive"
+
+# Tüm değişen state + log kuyrukları tek sıkıştırılmış pakette (Önceki snapshot'a göre delta)
+python state_snapshot.py save || exit 1
+git add -A state_bundle
+# Arşiv blokları değişmez, her biri bir kere commit edilir
+if [ -d history_archive ]; then
+    git add history_archive
+fi
+if git diff --staged --quiet; then
+    echo "No changes to commit"
+    exit 0
+fi
+git commit -q -m "$MESSAGE"
+
+for attempt in $(seq 1 $MAX_ATTEMPTS); do
+    if git push origin "HEAD:$BRANCH"; then
+        exit 0
+    fi
+    echo "Push rejected ($attempt/$MAX_ATTEMPTS), checking origin/$BRANCH..."
+    sleep $((attempt * 3))
+    git fetch -q --depth=1 origin "$BRANCH" || continue
+    if ! git diff --quiet HEAD^ FETCH_HEAD -- $STATE_PATHS; then
+        echo "❌ State on origin/$BRANCH changed since restore, not overwriting it (Next run starts from it)"
+        exit 1
+    fi
+    if ! git rebase -q --autostash --onto FETCH_HEAD HEAD^; then
+        git rebase --abort
+        echo "❌ Rebase on origin/$BRANCH failed"
+        exit 1
+    fi
+done
+
+echo "❌ Push failed after $MAX_ATTEMPTS attempts"
+exit 1
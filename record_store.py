@@ -0,0 +1,111 @@
+"""
+Record Store - Taranan her kayıt TEK yerde
+==========================================
+Eskiden her kayıt iki kere yazılıyordu: tam hali daily_cache.json'a,
+kırpılmış hali history.json'a. Artık tek depo (history.json + arşiv) var,
+üstünde iki görünüm:
+    today()       -> filter_and_select için bugünün kayıtları
+    window(days)  -> Analyzer için son X gün
+Tarama imleci (last_serial) de aynı dosyada, aynı atomic yazmada tutulur.
+Kayıtlar girerken bir kere puanlanır (scoring.score_records); kurallar
+değişince rescore_stale() sadece eski damgalı kayıtları yeniden puanlar.
+Owner da girişte entity ID'ye çözülür (owner_index.OwnerIndex -> owner_id).
+"""
+
+import os
+import logging
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from history_manager import HistoryManager, normalize_record, migrate_legacy_record
+from state_store import StateStore
+from scoring import score_records, rescore_stale, is_stale, rules_version
+from owner_index import OwnerIndex
+
+LEGACY_DAILY_CACHE_FILE = "daily_cache.json"
+LEGACY_MIGRATED_KEY = "legacy_cache_migrated"  # history.json meta: daily_cache.json bir kez taşındı
+
+
+class RecordStore:
+    def __init__(self, history: Optional[HistoryManager] = None,
+                 legacy_cache_file: str = LEGACY_DAILY_CACHE_FILE,
+                 owners: Optional[OwnerIndex] = None):
+        self.history = history or HistoryManager()
+        self.owners = owners or OwnerIndex()
+        self.legacy_cache_file = legacy_cache_file
+        self._migrate_legacy_cache()
+
+    # ============== YAZMA ==============
+
+    def ingest(self, trademarks: List[Dict], last_serial: Optional[int]):
+        """Yeni kayıtları puanla, kayıtları ve tarama imlecini tek yazmada ekle"""
+        score_records(trademarks)
+        self.resolve_owners(trademarks)
+        meta = {'last_serial': last_serial, 'cursor_date': date.today().isoformat()} if last_serial else None
+        self.history.append_to_history(trademarks, meta=meta)
+
+    def resolve_owners(self, trademarks: List[Dict]) -> List[Dict]:
+        """owner_id alanı eksik kayıtları entity ID'ye bağla (Yerinde)"""
+        missing = [tm for tm in trademarks if 'owner_id' not in tm]
+        for tm, owner_id in zip(missing, self.owners.resolve_many(tm.get('owner') for tm in missing)):
+            tm['owner_id'] = owner_id
+        return trademarks
+
+    def rescore_stale(self, workers: Optional[int] = None) -> int:
+        """Kurallar değiştiyse sıcak katmandaki eski damgalı kayıtları yeniden puanla
+        (Arşiv blokları değişmez, onlar okunurken puanlanır)"""
+        version = rules_version()
+        if not any(is_stale(tm, version) for tm in self.history.load_meta().get('trademarks', [])):
+            return 0
+        with self.history.store.transaction(strict=True) as data:
+            count = rescore_stale(data.get('trademarks', []), workers=workers)
+        logging.info(f"🔁 Kurallar değişmiş (v{version}): {count} kayıt yeniden puanlandı")
+        return count
+
+    # ============== GÖRÜNÜMLER ==============
+
+    @property
+    def last_serial(self) -> Optional[int]:
+        return self.history.load_meta().get('last_serial')
+
+    def today(self) -> List[Dict]:
+        """Bugün taranan kayıtlar (Eski daily cache'in karşılığı)"""
+        return self.today_with_cursor()[0]
+
+    def today_with_cursor(self) -> Tuple[List[Dict], Optional[int]]:
+        """Bugünün kayıtları + last_serial (Tek dosya okuması)"""
+        data = self.history.load_meta()
+        today_str = date.today().isoformat()
+        records = [migrate_legacy_record(tm) for tm in data.get('trademarks', [])
+                   if (tm.get('scanned_at') or '')[:10] == today_str]
+        return records, data.get('last_serial')
+
+    def window(self, days: int = 7) -> List[Dict]:
+        """Son X günün kayıtları (Gerekirse arşiv blokları da açılır, eski puan/owner_id bellekte tamamlanır)"""
+        records = self.history.get_recent_data(days=days)
+        rescore_stale(records)
+        return self.resolve_owners(records)
+
+    # ============== GEÇİŞ ==============
+
+    def _migrate_legacy_cache(self):
+        """Eski daily_cache.json'daki imleci ve kayıtları bir kereliğine depoya taşı
+        (history.json bozuksa StateCorruptError: eski imleçle üzerine yazılmaz)"""
+        if not os.path.exists(self.legacy_cache_file):
+            return
+        meta = self.history.load_meta()
+        if meta.get(LEGACY_MIGRATED_KEY) or meta.get('last_serial'):
+            return  # Zaten taşınmış
+
+        cache = StateStore(self.legacy_cache_file).load()
+        last_serial = cache.get('last_serial')
+        if not last_serial:
+            return
+
+        records = score_records([normalize_record(tm, scanned_at=tm.get('scraped_at'))
+                                 for tm in cache.get('trademarks', [])])
+        self.resolve_owners(records)
+        self.history.append_to_history(records, meta={'last_serial': last_serial,
+                                                      'cursor_date': cache.get('date'),
+                                                      LEGACY_MIGRATED_KEY: True})
+        logging.info(f"📦 daily_cache.json depoya taşındı: {len(records)} kayıt, son serial {last_serial}")
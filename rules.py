@@ -0,0 +1,233 @@
+"""
+Rules - Declarative puanlama/filtre kuralları (rules.json)
+==========================================================
+Puan ağırlıkları, sıkıcı/AI/tech/cool kelimeleri, tech class'lar,
+TrademarkFilter listeleri ve find_interesting kategorileri tek dosyada.
+Dosya derlenmiş matcher'lara çevrilir:
+
+    KeywordMatcher  Kelime listesi -> tek trie regex (Ortak önekler tek dal,
+                    metin tek geçişte taranır; listede ilk eşleşenin indeksi)
+    PatternMatcher  Regex listesi -> tek sıralı alternation (Listede ilk
+                    eşleşen pattern'in eşleşen metni, tek regex çağrısı)
+
+Derlenmiş kurallar içerik hash'i ile önbellekte tutulur (Aynı içerik bir kere
+derlenir). get_rules() en fazla RULES_CHECK_INTERVAL saniyede bir dosyanın
+mtime'ına bakar; değiştiyse yeniden yükler, uzun çalışan process restart
+istemez. Bozuk dosya loglanır, son geçerli kurallar kullanılmaya devam eder.
+
+rules.json'daki score_rules:
+    known_company     Apple, Google vs (Owner)
+    ai_keyword        AI, GPT, Neural (Tam kelime, isim)
+    tech_keyword      Crypto, Quantum, Cyber (İsim veya goods)
+    cool_keyword      Game, Studio, Hyper (İsim)
+    lookalike_brand   G00GLE, NETFL1X (Ünlü marka taklidi)
+    soundalike_brand  NYKEE, KOKA KOLA (Okunuşu ünlü marka)
+    tech_class        Software, Electronics class'ları
+    boring_match      Hukuk bürosu, emlak, kilise (Direkt eler)
+    short_name        <= 5 harf
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+RULES_FILE = os.getenv("RULES_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "rules.json"))
+RULES_CHECK_INTERVAL = 2.0    # Saniye (mtime kontrolü sıklığı)
+COMPILED_CACHE_SIZE = 8       # Önbellekteki derlenmiş sürüm sayısı
+
+
+# ============== MATCHER'LAR ==============
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """['game', 'gaming'] -> 'gam(?:e|ing)' (Ortak önekler tek dal)"""
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def emit(node: Dict) -> str:
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            body = f'(?:{body})?'  # Kelime burada da bitebilir (Greedy: önce uzun)
+        return body
+
+    return emit(trie)
+
+
+class KeywordMatcher:
+    """
+    Kelime listesi için tek derlenmiş regex. Lookahead ile her pozisyondaki en
+    uzun kelime yakalanır, aynı noktadan başlayan kısa kelimeler (lab / labs)
+    önek tablosundan eklenir; sonuç 'kw in text' döngüsüyle birebir aynı.
+    """
+
+    def __init__(self, keywords: Iterable[str], whole_word: bool = False):
+        self.keywords: List[str] = list(keywords)
+        self._priority: Dict[str, int] = {}
+        for i, kw in enumerate(self.keywords):
+            self._priority.setdefault(kw, i)
+        edge = r'\b' if whole_word else ''
+        self._regex = re.compile(f'(?=({edge}{_trie_pattern(self._priority)}{edge}))') if self.keywords else None
+        self._prefixes: Dict[str, List[re.Pattern]] = {
+            kw: [re.compile(re.escape(other) + edge) for other in self._priority if other != kw and kw.startswith(other)]
+            for kw in self._priority
+        }
+
+    def first(self, *texts: str) -> Optional[int]:
+        """Metinlerden herhangi birinde geçen, listede ilk sıradaki kelimenin indeksi"""
+        if self._regex is None:
+            return None
+        best = None
+        for text in texts:
+            if not text:
+                continue
+            for m in self._regex.finditer(text):
+                kw = m.group(1)
+                found = [self._priority[kw]]
+                for prefix in self._prefixes[kw]:
+                    short = prefix.match(text, m.start(1))
+                    if short:
+                        found.append(self._priority[short.group(0)])
+                priority = min(found)
+                if best is None or priority < best:
+                    best = priority
+                    if best == 0:
+                        return 0
+        return best
+
+    def first_keyword(self, *texts: str) -> Optional[str]:
+        index = self.first(*texts)
+        return self.keywords[index] if index is not None else None
+
+
+class PatternMatcher:
+    """Regex listesi -> tek sıralı alternation: (?=.*?(p0))|(?=.*?(p1))|..."""
+
+    def __init__(self, patterns: Iterable[str], flags: int = 0):
+        self.patterns: List[str] = list(patterns)
+        branches = '|'.join(f'(?=[\\s\\S]*?(?P<p{i}>{pattern}))' for i, pattern in enumerate(self.patterns))
+        self._regex = re.compile(f'(?:{branches})', flags) if self.patterns else None
+
+    def first(self, text: Optional[str]) -> Optional[str]:
+        """Listede ilk eşleşen pattern'in eşleşen metni (re.search sırasıyla aynı)"""
+        if not text or self._regex is None:
+            return None
+        m = self._regex.match(text)
+        return m.group(m.lastgroup) if m else None
+
+
+# ============== DERLENMİŞ KURALLAR ==============
+
+class Category(NamedTuple):
+    name: str                # "AI" (Eşleşme açıklamasında)
+    label: str               # "🤖 AI"
+    matcher: PatternMatcher
+
+
+class CompiledRules:
+    """rules.json'un derlenmiş hali (Salt okunur)"""
+
+    def __init__(self, raw: Dict, version: str):
+        self.raw = raw
+        self.version = version
+
+        self.score_rules: Dict[str, int] = dict(raw['score_rules'])
+        self.tech_classes: List[str] = list(raw['tech_classes'])
+        self.boring_patterns: List[str] = [p for group in raw['boring'].values() for p in group]
+        self.ai_keywords: List[str] = list(raw['ai_keywords'])
+        self.tech_keywords: List[str] = list(raw['tech_keywords'])
+        self.cool_keywords: List[str] = list(raw['cool_keywords'])
+
+        self.boring = KeywordMatcher(self.boring_patterns)
+        self.ai = KeywordMatcher(self.ai_keywords, whole_word=True)
+        self.tech = KeywordMatcher(self.tech_keywords)
+        self.cool = KeywordMatcher(self.cool_keywords)
+
+        self.filter_keywords = KeywordMatcher(raw['filter']['keywords'])
+        self.filter_classes = frozenset(raw['filter']['classes'])
+
+        self.categories: List[Category] = [
+            Category(cat['name'], cat['label'], PatternMatcher(cat['patterns']))
+            for cat in raw['categories']
+        ]
+
+
+def compile_rules(text: str) -> CompiledRules:
+    raw = json.loads(text)
+    canonical = json.dumps(raw, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return CompiledRules(raw, hashlib.sha1(canonical).hexdigest()[:12])
+
+
+class RulesLoader:
+    """Dosya -> CompiledRules (mtime ile hot reload, içerik hash'i ile önbellek)"""
+
+    def __init__(self, path: str = RULES_FILE, check_interval: float = RULES_CHECK_INTERVAL):
+        self.path = path
+        self.check_interval = check_interval
+        self._rules: Optional[CompiledRules] = None
+        self._mtime: Optional[int] = None
+        self._checked_at = 0.0
+        self._compiled: Dict[str, CompiledRules] = {}   # sha1(metin) -> derlenmiş
+
+    def _compile(self, text: str) -> CompiledRules:
+        key = hashlib.sha1(text.encode('utf-8')).hexdigest()
+        if key not in self._compiled:
+            if len(self._compiled) >= COMPILED_CACHE_SIZE:
+                self._compiled.pop(next(iter(self._compiled)))
+            self._compiled[key] = compile_rules(text)
+        return self._compiled[key]
+
+    def get(self) -> CompiledRules:
+        now = time.monotonic()
+        if self._rules is not None and now - self._checked_at < self.check_interval:
+            return self._rules
+        self._checked_at = now
+
+        mtime = None
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+            if self._rules is not None and mtime == self._mtime:
+                return self._rules
+            with open(self.path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            rules = self._compile(text)
+        except (OSError, ValueError, KeyError, TypeError, re.error) as e:
+            if self._rules is None:
+                raise
+            logging.error(f"❌ {self.path} geçersiz, önceki kurallar kullanılıyor: {e}")
+            self._mtime = mtime
+            return self._rules
+
+        if self._rules is not None and rules.version != self._rules.version:
+            logging.info(f"🔄 Kurallar yeniden yüklendi: {self._rules.version} -> {rules.version}")
+        self._rules, self._mtime = rules, mtime
+        return rules
+
+
+_loader = RulesLoader()
+
+
+def get_rules() -> CompiledRules:
+    """Güncel derlenmiş kurallar (Dosya değiştiyse yeniden yüklenir)"""
+    return _loader.get()
+
+
+def categorize(text: Optional[str], rules: Optional[CompiledRules] = None) -> List[Tuple[Category, str]]:
+    """Metnin eşleştiği kategoriler: [(kategori, eşleşen metin)] (find_interesting)"""
+    rules = rules or get_rules()
+    text = (text or '').upper()
+    found = []
+    for category in rules.categories:
+        match = category.matcher.first(text)
+        if match:
+            found.append((category, match))
+    return found
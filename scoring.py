@@ -0,0 +1,355 @@
+"""
+Scoring - Trademark önem puanı
+==============================
+Kurallar (score_rules + kelime listeleri) rules.json'da (rules.get_rules,
+dosya değişince yeniden yüklenir), iki motor:
+    calculate_importance_score(tm)  -> Tek kayıt (Referans implementasyon)
+    score_batch(trademarks)         -> Vektörel batch (NumPy), birebir aynı sonuç
+
+Kayıtlar depoya girerken bir kere puanlanır (score_records) ve kuralların
+hash'i (rules_version) ile damgalanır. Kurallar değişince sadece damgası eski
+kayıtlar paralel batch ile yeniden puanlanır (rescore_stale).
+
+Batch motoru kolonları bir kere normalize edip tek string'e birleştirir, her
+kelimeyi tüm batch'te tek aramayla bulup (kelime x kayıt) boolean mask'larına
+çevirir; "listede ilk eşleşen" kuralı argmax ile çıkar. Tam kelime eşleşmesi
+(\\b...\\b) için metin ve anahtar kelimeye kelime sınırlarında işaret karakteri
+eklenir, böylece regex yerine düz substring araması yeterli olur. Bellek için
+batch parçalara bölünür.
+"""
+
+import os
+import re
+import json
+import hashlib
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+import lookalike
+import phonetic
+from companies import COMPANY_MATCHER, KNOWN_COMPANIES
+from lookalike import find_lookalike
+from phonetic import find_soundalike
+from rules import get_rules
+from weird_filter import WeirdFilter
+
+
+def brand_mimic(name: str, owner: str) -> Optional[Tuple[str, str]]:
+    """Ünlü marka taklidi: (score_rules anahtarı, sebep) ya da None. Önce yazım, sonra okunuş"""
+    lookalike = find_lookalike(name, owner)
+    if lookalike:
+        return 'lookalike_brand', f"👀 {lookalike.mark.title()} Lookalike"
+    soundalike = find_soundalike(name, owner)
+    if soundalike:
+        return 'soundalike_brand', f"👂 {soundalike.mark.title()} Soundalike"
+    return None
+
+
+def calculate_importance_score(tm: Dict) -> tuple[int, List[str]]:
+    """
+    Trademark'a puan ver
+    Returns: (score, reasons)
+    """
+    rules = get_rules()
+    score_rules = rules.score_rules
+    score = 0
+    reasons = []
+    
+    name = (tm.get('mark_name') or '').lower().strip()
+    owner = (tm.get('owner') or '').lower()
+    goods = (tm.get('goods_services') or '').lower()
+    int_class = str(tm.get('international_class', '')).zfill(3)
+    
+    # 0. Geçersiz isimler
+    if not name or name == 'none' or len(name) < 2:
+        return -999, ['❌ Geçersiz isim']
+    
+    # 1. Bilinen Şirketler (+50)
+    # Tek derlenmiş regex, tam kelime eşleşmesi (örn: "Intel" -> "Intelligent" eşleşmesin)
+    company = COMPANY_MATCHER.first(owner, 'companies')
+    if company:
+        score += score_rules['known_company']
+        reasons.append(f"🏢 {company.title()}")
+            
+    # 2. Sıkıcı mı? (-100)
+    # Her kelime listesi tek derlenmiş trie regex (Listede ilk eşleşen kazanır)
+    pattern = rules.boring.first_keyword(name, owner)
+    if pattern:
+        score += score_rules['boring_match']
+        reasons.append(f"❌ {pattern}")
+        return score, reasons # Direkt dön, boşa işlem yapma
+    
+    # 3. AI Keywords (+25) - Tam kelime (Cleaner AIR vs AI karışmasın)
+    kw = rules.ai.first_keyword(name)
+    if kw:
+        score += score_rules['ai_keyword']
+        reasons.append(f"🤖 {kw.upper()}")
+            
+    # 4. Tech Keywords (+15)
+    kw = rules.tech.first_keyword(name, goods)
+    if kw:
+        score += score_rules['tech_keyword']
+        reasons.append(f"💡 {kw.title()}")
+
+    # 5. Cool/Trendy Keywords (+10)
+    kw = rules.cool.first_keyword(name)
+    if kw:
+        score += score_rules['cool_keyword']
+        reasons.append(f"✨ {kw.title()}")
+
+    # 6. Ünlü marka benzeri (+20 yazım / +15 okunuş)
+    mimic = brand_mimic(name, owner)
+    if mimic:
+        score += score_rules[mimic[0]]
+        reasons.append(mimic[1])
+            
+    # 7. Tech Classes (+10)
+    if int_class in rules.tech_classes:
+        score += score_rules['tech_class']
+        reasons.append(f"🏷️ Tech Class ({int_class})")
+        
+    # 8. Kısa İsim (+5)
+    if len(name) <= 5 and name.isalpha():
+        score += score_rules['short_name']
+        reasons.append("📝 Short Name")
+        
+    return score, reasons
+
+
+# ============== BATCH MOTORU ==============
+
+BATCH_CHUNK_SIZE = 100_000    # Parça başına kayıt (Mask matrisi belleği için)
+BOUNDARY_MARK = '\x01'         # Kelime sınırı işareti
+ROW_SEPARATOR = '\x02'         # Kolon birleştirme ayracı (Hiçbir kelimede yok, eşleşme satır aşamaz)
+_BOUNDARY_RE = re.compile(r'\b')
+
+INVALID_REASONS = ['❌ Geçersiz isim']
+
+
+def _mark_boundaries(text: str) -> str:
+    """'cool ai' -> '\x01cool\x01 \x01ai\x01' (\\bKW\\b araması == substring araması)"""
+    return _BOUNDARY_RE.sub(BOUNDARY_MARK, text)
+
+
+class _Column:
+    """
+    Bir metin kolonu tek string olarak (Satırlar ayraçla birleşik).
+    Bir kelimenin tüm geçişleri tek aramada bulunur, pozisyonlar satıra çevrilir.
+    """
+
+    def __init__(self, texts: List[str]):
+        self.n = len(texts)
+        self.starts = list(accumulate((len(text) + 1 for text in texts), initial=0))
+        self.joined = ROW_SEPARATOR.join(texts)
+
+    def contains(self, keyword: str) -> np.ndarray:
+        """Satır bazında 'keyword in text' mask'ı (Eşleşen satırın geri kalanı atlanır)"""
+        find, starts, n = self.joined.find, self.starts, self.n
+        rows = []
+        pos = find(keyword)
+        while pos != -1:
+            row = bisect_right(starts, pos) - 1
+            rows.append(row)
+            pos = find(keyword, starts[row + 1]) if row + 1 < n else -1
+        mask = np.zeros(n, dtype=bool)
+        mask[rows] = True
+        return mask
+
+
+def _first_match(columns: List[_Column], keywords: List[str]) -> np.ndarray:
+    """
+    Her kayıt için listede İLK eşleşen kelimenin indeksi (Yoksa -1).
+    Mask matrisi: (kelime sayısı x batch), argmax ilk True'yu verir.
+    """
+    n = columns[0].n
+    if not keywords or n == 0:
+        return np.full(n, -1, dtype=np.int64)
+    masks = np.empty((len(keywords), n), dtype=bool)
+    for i, kw in enumerate(keywords):
+        mask = columns[0].contains(kw)
+        for col in columns[1:]:
+            mask |= col.contains(kw)
+        masks[i] = mask
+    first = masks.argmax(axis=0)
+    return np.where(masks.any(axis=0), first, -1)
+
+
+def _score_chunk(trademarks: List[Dict], rules) -> Tuple[np.ndarray, List[List[str]]]:
+    n = len(trademarks)
+    score_rules = rules.score_rules
+    names_list = [(tm.get('mark_name') or '').lower().strip() for tm in trademarks]
+    owners_list = [(tm.get('owner') or '').lower() for tm in trademarks]
+
+    names = np.array(names_list, dtype=str)
+    classes = np.array([str(tm.get('international_class', '')).zfill(3) for tm in trademarks], dtype=str)
+    name_len = np.char.str_len(names)
+
+    name_col = _Column(names_list)
+    owner_col = _Column(owners_list)
+    goods_col = _Column([(tm.get('goods_services') or '').lower() for tm in trademarks])
+    marked_name_col = _Column([_mark_boundaries(name) for name in names_list])
+
+    # 0. Geçersiz isimler
+    invalid = (name_len < 2) | (names == 'none')
+
+    # 1. Bilinen Şirketler: owner'lar çok tekrar ediyor, her benzersiz owner bir kere
+    owner_companies = {owner: COMPANY_MATCHER.first(owner, 'companies') for owner in set(owners_list)}
+    company = [owner_companies[owner] for owner in owners_list]
+    has_company = np.fromiter((c is not None for c in company), dtype=bool, count=n)
+
+    # 2-5. Kelime kuralları (İlk eşleşen indeks)
+    boring = _first_match([name_col, owner_col], rules.boring_patterns)
+    ai = _first_match([marked_name_col], [_mark_boundaries(kw) for kw in rules.ai_keywords])
+    tech = _first_match([name_col, goods_col], rules.tech_keywords)
+    cool = _first_match([name_col], rules.cool_keywords)
+
+    # 6. Ünlü marka benzeri (İsim+owner çifti başına bir kere)
+    pair_mimics = {pair: brand_mimic(*pair) for pair in set(zip(names_list, owners_list))}
+    mimic = [pair_mimics[pair] for pair in zip(names_list, owners_list)]
+    mimic_points = np.fromiter((score_rules[m[0]] if m else 0 for m in mimic), dtype=np.int64, count=n)
+
+    # 7-8. Sınıf ve kısa isim
+    tech_class = np.isin(classes, rules.tech_classes)
+    short_name = (name_len <= 5) & np.char.isalpha(names)
+
+    is_boring = boring >= 0
+    not_boring = ~is_boring
+    scores = (
+        has_company * score_rules['known_company']
+        + is_boring * score_rules['boring_match']
+        + (not_boring & (ai >= 0)) * score_rules['ai_keyword']
+        + (not_boring & (tech >= 0)) * score_rules['tech_keyword']
+        + (not_boring & (cool >= 0)) * score_rules['cool_keyword']
+        + not_boring * mimic_points
+        + (not_boring & tech_class) * score_rules['tech_class']
+        + (not_boring & short_name) * score_rules['short_name']
+    ).astype(np.int64)
+    scores[invalid] = -999
+
+    # Sebepler (Tekli motorla aynı sıra ve metin)
+    invalid, has_company, is_boring, tech_class, short_name = (
+        invalid.tolist(), has_company.tolist(), is_boring.tolist(), tech_class.tolist(), short_name.tolist())
+    boring, ai, tech, cool = boring.tolist(), ai.tolist(), tech.tolist(), cool.tolist()
+    reasons = []
+    for i in range(n):
+        if invalid[i]:
+            reasons.append(list(INVALID_REASONS))
+            continue
+        r = []
+        if has_company[i]:
+            r.append(f"🏢 {company[i].title()}")
+        if is_boring[i]:
+            r.append(f"❌ {rules.boring_patterns[boring[i]]}")
+            reasons.append(r)
+            continue
+        if ai[i] >= 0:
+            r.append(f"🤖 {rules.ai_keywords[ai[i]].upper()}")
+        if tech[i] >= 0:
+            r.append(f"💡 {rules.tech_keywords[tech[i]].title()}")
+        if cool[i] >= 0:
+            r.append(f"✨ {rules.cool_keywords[cool[i]].title()}")
+        if mimic[i]:
+            r.append(mimic[i][1])
+        if tech_class[i]:
+            r.append(f"🏷️ Tech Class ({classes[i]})")
+        if short_name[i]:
+            r.append("📝 Short Name")
+        reasons.append(r)
+    return scores, reasons
+
+
+def score_batch(trademarks: Iterable[Dict], chunk_size: int = BATCH_CHUNK_SIZE) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Çok sayıda kaydı vektörel puanla.
+    Returns: (scores: int64 array, reasons: object array of list) - calculate_importance_score ile birebir aynı
+    """
+    trademarks = trademarks if isinstance(trademarks, list) else list(trademarks)
+    scores = np.empty(len(trademarks), dtype=np.int64)
+    reasons = np.empty(len(trademarks), dtype=object)
+    rules = get_rules()  # Tüm parçalar aynı kural sürümüyle
+    for start in range(0, len(trademarks), chunk_size):
+        chunk_scores, chunk_reasons = _score_chunk(trademarks[start:start + chunk_size], rules)
+        end = start + len(chunk_scores)
+        scores[start:end] = chunk_scores
+        for offset, chunk_reason in enumerate(chunk_reasons):  # Liste listesi 2D array'e dönmesin
+            reasons[start + offset] = chunk_reason
+    return scores, reasons
+
+
+# ============== INGEST PUANLAMA ==============
+
+RESCORE_CHUNK_SIZE = 20_000      # Process başına parça
+RESCORE_PARALLEL_MIN = 40_000    # Bundan azı için process açmaya değmez
+
+# rules.json'da puanı etkileyen bölümler (filter / categories değişince yeniden puanlama gerekmez)
+SCORE_SECTIONS = ('score_rules', 'tech_classes', 'boring', 'ai_keywords', 'tech_keywords', 'cool_keywords')
+
+_weird_filter = WeirdFilter()
+_versions: Dict[str, str] = {}   # rules.version -> rules_version (Dosya değişmedikçe tek hesap)
+
+
+def rules_version() -> str:
+    """
+    Puanı etkileyen tüm kuralların kısa hash'i (Kural değişince değişir).
+    Listeler sırasıyla girer: KNOWN_COMPANIES'te önce gelen şirket reason'da kazanır
+    """
+    compiled = get_rules()
+    if compiled.version not in _versions:
+        rules = {
+            'rules': {section: compiled.raw[section] for section in SCORE_SECTIONS},
+            'companies': list(KNOWN_COMPANIES),
+            'lookalike': lookalike.SCORING_PARAMS,
+            'phonetic': phonetic.SCORING_PARAMS,
+            'weird_funny': _weird_filter.funny_keywords,
+            'weird_block': _weird_filter.block_keywords,
+        }
+        payload = json.dumps(rules, sort_keys=True, ensure_ascii=False).encode('utf-8')
+        _versions[compiled.version] = hashlib.sha1(payload).hexdigest()[:12]
+    return _versions[compiled.version]
+
+
+def is_stale(tm: Dict, version: Optional[str] = None) -> bool:
+    """Kayıt hiç puanlanmamış ya da eski kurallarla puanlanmış mı?"""
+    return tm.get('rules_version') != (version or rules_version())
+
+
+def _score_fields(records: List[Dict]) -> List[Dict]:
+    """Kayıtların puan alanları (Process'ler arası sadece bunlar taşınır)"""
+    version = rules_version()
+    scores, reasons = score_batch(records)
+    weird = _weird_filter.check_batch((tm.get('mark_name'), tm.get('goods_services')) for tm in records)
+    return [
+        {'score': score, 'reasons': reason, 'is_weird': w['is_weird'],
+         'weird_score': w['score'], 'weird_reason': w['reason'], 'rules_version': version}
+        for score, reason, w in zip(scores.tolist(), reasons, weird)
+    ]
+
+
+def score_records(records: List[Dict]) -> List[Dict]:
+    """Kayıtlara puan + weird + rules_version alanlarını yaz (Yerinde)"""
+    for tm, fields in zip(records, _score_fields(records)):
+        tm.update(fields)
+    return records
+
+
+def rescore_stale(records: List[Dict], workers: Optional[int] = None) -> int:
+    """
+    Damgası eski kayıtları yeniden puanla (Yerinde). Büyük listelerde parçalar
+    process havuzuna dağıtılır. Returns: yeniden puanlanan kayıt sayısı
+    """
+    version = rules_version()
+    stale = [tm for tm in records if is_stale(tm, version)]
+    if len(stale) < RESCORE_PARALLEL_MIN or workers == 1:
+        score_records(stale)
+        return len(stale)
+
+    chunks = [stale[i:i + RESCORE_CHUNK_SIZE] for i in range(0, len(stale), RESCORE_CHUNK_SIZE)]
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        for chunk, fields_list in zip(chunks, pool.map(_score_fields, chunks)):
+            for tm, fields in zip(chunk, fields_list):
+                tm.update(fields)
+    return len(stale)
@@ -1,13 +1,13 @@
 import requests
 import xml.etree.ElementTree as ET
 from bs4 import BeautifulSoup
-import os
-import json
 import time
 import re
 import logging
 from datetime import datetime
-from main_v2 import post_tweet, get_x_client, KNOWN_TICKERS
+from main_v2 import dispatch_outbox, KNOWN_TICKERS
+from outbox import get_outbox
+from state_store import StateStore
 
 # --- CONFIG ---
 SEC_RSS_URL = "https://www.sec.gov/cgi-bin/browse-edgar?action=getcurrent&type=D&output=atom"
@@ -29,22 +29,16 @@ logger.addHandler(console)
 class SECMonitor:
     def __init__(self):
         self.headers = {'User-Agent': USER_AGENT}
+        self.state_store = StateStore(STATE_FILE)
         self.last_link = self.load_state()
 
     def load_state(self):
-        if os.path.exists(STATE_FILE):
-            try:
-                with open(STATE_FILE, 'r') as f:
-                    data = json.load(f)
-                    return data.get('last_link')
-            except:
-                pass
-        return None
+        return self.state_store.load().get('last_link')
 
     def save_state(self, link):
         try:
-            with open(STATE_FILE, 'w') as f:
-                json.dump({'last_link': link, 'updated_at': datetime.now().isoformat()}, f)
+            with self.state_store.transaction() as data:
+                data.update({'last_link': link, 'updated_at': datetime.now().isoformat()})
         except Exception as e:
             logger.error(f"State save error: {e}")
 
@@ -214,6 +208,7 @@ class SECMonitor:
             return
 
         logger.info(f"{len(new_entries)} yeni bildirim var. Detaylar çekiliyor...")
+        alerts = []
         
         # Eskiden yeniye işle
         for f in reversed(new_entries):
@@ -257,14 +252,15 @@ class SECMonitor:
             # Özel şirketlerde ticker olmaz ama yine de check edelim
             
             logger.info(f"Yayınlanıyor: {company_name} - {amount}")
-            try:
-                post_tweet(tweet)
-                time.sleep(5) # Flood yapma
-            except Exception as e:
-                logger.error(f"Tweet error: {e}")
+            alerts.append({'id': f"sec:{f['link']}", 'text': tweet})
                 
             new_last_link = f['link']
             
+        # Ortak outbox'a yaz (Flood / kota kontrolü dispatch'te), hazır olanı hemen gönder
+        if alerts:
+            get_outbox().schedule(alerts, source='sec')
+            dispatch_outbox()
+            
         # En son işlenen linki kaydet
         self.save_state(new_last_link)
         logger.info("SEC taraması tamamlandı.")
@@ -0,0 +1,165 @@
+"""
+Serializer katmanı - State dosyaları için takılabilir format
+============================================================
+Format adı: "<codec>[+<compression>]"
+    json            Kompakt JSON (varsayılan, insan okuyabilir)
+    json+gzip       Sıkıştırılmış JSON
+    msgpack         Binary (pip install msgpack gerekir)
+    pickle          Binary (stdlib)
+    ...+gzip / ...+zlib
+
+Okuma formatı otomatik algılar (gzip magic / binary header / düz JSON),
+yani format değiştirmek eski dosyaları bozmaz. Pickle hariç: state
+dosyaları public repoda duruyor, pickle çözmek kod çalıştırmak demek.
+Pickle dosyası sadece fmt="pickle" açıkça verilince okunur.
+
+orjson varsa JSON onunla yazılır; str olmayan dict key'leri stdlib json
+gibi string'e çevrilir, orjson'ın reddettiği değerde stdlib'e düşülür
+(Codec seçimi çıktıyı değiştirmez). Seçim:
+    FILINGWATCH_STATE_FORMAT=msgpack+gzip python main_v2.py run
+"""
+
+import os
+import gzip
+import json
+import zlib
+import pickle
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+DEFAULT_FORMAT = os.getenv("FILINGWATCH_STATE_FORMAT", "json")
+
+# Binary codec'ler için 3 byte'lık header (JSON header'sız kalır)
+BINARY_MAGIC = b"FW"
+GZIP_MAGIC = b"\x1f\x8b"
+ZLIB_MAGIC = b"\x78"
+
+
+# ============== CODEC'LER ==============
+
+def _json_dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:  # orjson.JSONEncodeError (Örn. 64 bit'i aşan int)
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _json_loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode('utf-8'))
+
+
+def _msgpack_dumps(obj: Any) -> bytes:
+    if msgpack is None:
+        raise RuntimeError("msgpack formatı için: pip install msgpack")
+    return msgpack.packb(obj, use_bin_type=True)
+
+
+def _msgpack_loads(data: bytes) -> Any:
+    if msgpack is None:
+        raise RuntimeError("msgpack formatı için: pip install msgpack")
+    return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+def _pickle_dumps(obj: Any) -> bytes:
+    return pickle.dumps(obj, protocol=4)
+
+
+def _pickle_loads(data: bytes) -> Any:
+    return pickle.loads(data)
+
+
+# name -> (header byte, dumps, loads). JSON'un header'ı yok (b"").
+CODECS: Dict[str, Tuple[bytes, Callable[[Any], bytes], Callable[[bytes], Any]]] = {
+    "json": (b"", _json_dumps, _json_loads),
+    "msgpack": (b"M", _msgpack_dumps, _msgpack_loads),
+    "pickle": (b"P", _pickle_dumps, _pickle_loads),
+}
+
+COMPRESSORS: Dict[str, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    "gzip": (lambda b: gzip.compress(b, compresslevel=6, mtime=0), gzip.decompress),
+    "zlib": (lambda b: zlib.compress(b, 6), zlib.decompress),
+}
+
+
+class Serializer:
+    """Tek bir format (codec + opsiyonel sıkıştırma)"""
+
+    def __init__(self, fmt: str = DEFAULT_FORMAT):
+        codec, _, compression = fmt.partition("+")
+        if codec not in CODECS:
+            raise ValueError(f"Bilinmeyen codec: {codec} (Seçenekler: {', '.join(CODECS)})")
+        if compression and compression not in COMPRESSORS:
+            raise ValueError(f"Bilinmeyen sıkıştırma: {compression} (Seçenekler: {', '.join(COMPRESSORS)})")
+        self.fmt = fmt
+        self.codec = codec
+        self.compression = compression or None
+
+    def dumps(self, obj: Any) -> bytes:
+        header, dumps, _ = CODECS[self.codec]
+        payload = (BINARY_MAGIC + header if header else b"") + dumps(obj)
+        if self.compression:
+            payload = COMPRESSORS[self.compression][0](payload)
+        return payload
+
+    def loads(self, data: bytes) -> Any:
+        return loads(data, self.fmt)
+
+    def __repr__(self):
+        return f"Serializer({self.fmt!r})"
+
+
+def loads(data: bytes, fmt: Optional[str] = None) -> Any:
+    """
+    Formatı otomatik algılayarak çöz.
+    fmt: pickle codec'li format verilmedikçe pickle header'lı veri reddedilir
+    """
+    allow_pickle = bool(fmt) and fmt.partition("+")[0] == "pickle"
+    if data[:2] == GZIP_MAGIC:
+        data = gzip.decompress(data)
+    elif data[:1] == ZLIB_MAGIC:
+        data = zlib.decompress(data)
+
+    if data[:2] == BINARY_MAGIC:
+        header = data[2:3]
+        if header == CODECS["pickle"][0] and not allow_pickle:
+            raise ValueError("Pickle verisi otomatik çözülmez (Güvenli değil) - fmt='pickle' ile okuyun")
+        for _, (codec_header, _, codec_loads) in CODECS.items():
+            if codec_header and codec_header == header:
+                return codec_loads(data[3:])
+        raise ValueError(f"Bilinmeyen binary header: {header!r}")
+
+    return _json_loads(data)
+
+
+_serializers: Dict[str, Serializer] = {}
+
+
+def get_serializer(fmt: str = None) -> Serializer:
+    """Format adına göre (cache'li) serializer döndür"""
+    fmt = fmt or DEFAULT_FORMAT
+    if fmt not in _serializers:
+        _serializers[fmt] = Serializer(fmt)
+    return _serializers[fmt]
+
+
+def available_formats() -> list:
+    """Bu ortamda kullanılabilen tüm formatlar"""
+    codecs = [c for c in CODECS if c != "msgpack" or msgpack is not None]
+    formats = []
+    for codec in codecs:
+        formats.append(codec)
+        formats.extend(f"{codec}+{comp}" for comp in COMPRESSORS)
+    return formats
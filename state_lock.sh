@@ -0,0 +1,63 @@
+#!/bin/bash
+
+# State kilidi: daily bot ve outbox dispatch aynı state'i iki kopyadan yazmasın.
+# Kilit uzak repoda bir ref (LOCK_REF, boş ağaçlı tek commit). Alma ve bırakma
+# --force-with-lease ile karşılaştır-ve-değiştir: iki runner aynı anda alamaz.
+# LOCK_TTL'den eski kilit (Runner öldü, release çalışmadı) devralınır; job
+# timeout'ları LOCK_TTL'den kısa tutulmalı.
+# Kullanım:
+#   ./state_lock.sh acquire [bekleme_sn]   # exit 0: alındı, 1: dolu (Süre içinde boşalmadı)
+#   ./state_lock.sh release                # Sadece bu runner'ın aldığı kilidi bırakır
+
+cd "$(dirname "$0")"
+
+LOCK_REF="refs/heads/state-lock"
+LOCK_TTL="${STATE_LOCK_TTL:-3600}"
+LOCK_FILE="${RUNNER_TEMP:-/tmp}/filingwatch_state_lock"
+POLL_SECONDS=15
+
+try_acquire() {
+    local current age tree sha
+    current=$(git ls-remote origin "$LOCK_REF" | cut -f1)
+    if [ -n "$current" ]; then
+        git fetch -q --depth=1 origin "$LOCK_REF" || return 1
+        age=$(( $(date +%s) - $(git log -1 --format=%ct FETCH_HEAD) ))
+        if [ "$age" -lt "$LOCK_TTL" ]; then
+            echo "State locked by '$(git log -1 --format=%s FETCH_HEAD)' (${age}s)"
+            return 1
+        fi
+        echo "Taking over stale state lock '$(git log -1 --format=%s FETCH_HEAD)' (${age}s)"
+    fi
+    tree=$(git mktree < /dev/null)
+    sha=$(git -c user.name='FilingWatch Bot' -c user.email='bot@filingwatch.com' \
+        commit-tree "$tree" -m "${GITHUB_WORKFLOW:-local} run ${GITHUB_RUN_ID:-$$}")
+    # current boşsa ref hiç olmamalı; doluysa hâlâ aynı (Devralınan) kilit olmalı
+    git push -q --force-with-lease="$LOCK_REF:$current" origin "$sha:$LOCK_REF" || return 1
+    echo "$sha" > "$LOCK_FILE"
+    echo "🔒 State lock acquired"
+}
+
+case "$1" in
+    acquire)
+        deadline=$(( $(date +%s) + ${2:-0} ))
+        until try_acquire; do
+            if [ "$(date +%s)" -ge "$deadline" ]; then
+                exit 1
+            fi
+            sleep $POLL_SECONDS
+        done
+        ;;
+    release)
+        [ -f "$LOCK_FILE" ] || exit 0
+        if git push -q --force-with-lease="$LOCK_REF:$(cat "$LOCK_FILE")" origin ":$LOCK_REF"; then
+            echo "🔓 State lock released"
+        else
+            echo "State lock was taken over, not releasing"
+        fi
+        rm -f "$LOCK_FILE"
+        ;;
+    *)
+        echo "Kullanım: ./state_lock.sh [acquire [bekleme_sn]|release]"
+        exit 2
+        ;;
+esac
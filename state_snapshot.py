@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+State Snapshot - Tüm bot durumunu tek sıkıştırılmış pakette tut
+================================================================
+Her 6 saatte bir commit edilen state dosyaları (history, posted, log...) büyüdükçe
+checkout ve push yavaşlıyordu. Bu mod hepsini state_bundle/ altında toplar:
+
+    state_bundle/manifest.json     Zincir: base + delta listesi
+    state_bundle/base-<ts>.json.gz Tam durum
+    state_bundle/delta-<ts>.json.gz Bir önceki snapshot'a göre fark
+
+Delta: JSON alanları anahtar bazında, listeler "baştan düş + sona ekle" olarak
+kodlanır (history, posted ve log tam olarak böyle büyür). Zincir çok uzarsa ya da
+boyut bütçesi aşılırsa yeni base yazılır; base bile sığmıyorsa sıcak history
+penceresi daraltılır (eski kayıtlar değişmez arşiv bloklarına gider).
+
+Kullanım:
+    python state_snapshot.py restore   # Başlangıçta: paketten dosyaları geri yükle
+    python state_snapshot.py save      # Sonda: yeni delta (veya base) yaz
+    python state_snapshot.py info
+"""
+
+import os
+import sys
+import glob
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from serializers import get_serializer
+from state_store import StateStore
+from history_manager import HistoryManager, HISTORY_FILE, HOT_DAYS
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+BUNDLE_DIR = "state_bundle"
+MANIFEST_FILE = "manifest.json"
+BUNDLE_FORMAT = "json+gzip"
+
+# Pakete giren dosyalar (history_archive/ blokları değişmez, ayrıca commit edilir)
+STATE_FILES = ["scraper_state.json", "posted_tweets.json", HISTORY_FILE, "sec_state.json", "candidate_queue.json",
+               "owner_index.json", "llm_cache.json", "outbox.json", "x_quota.json",
+               "media_cache.json"]
+LOG_FILES = ["bot_scheduler.log", "filingwatch.log", "sec_bot.log"]
+LOG_TAIL_BYTES = 256 * 1024  # Loglardan sadece son 256 KB
+
+SNAPSHOT_BUDGET_BYTES = int(os.getenv("SNAPSHOT_BUDGET_BYTES", 2 * 1024 * 1024))
+MAX_DELTAS = 40              # ~10 gün (günde 4 çalışma)
+MIN_HOT_DAYS = 7             # Bütçe için sıcak pencere en fazla buraya kadar daraltılır
+
+
+# ============== TOPLA / YAZ ==============
+
+def _read_log_tail(path: str) -> List[str]:
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        f.seek(max(0, size - LOG_TAIL_BYTES))
+        data = f.read()
+    lines = data.decode('utf-8', errors='replace').splitlines(keepends=True)
+    if size > LOG_TAIL_BYTES and lines:
+        lines = lines[1:]  # Yarım kalan ilk satırı at
+    return lines
+
+
+def collect_state(root: str = ".") -> Dict[str, Any]:
+    """Diskteki durumu {dosya: içerik} olarak topla"""
+    state = {}
+    for name in STATE_FILES:
+        path = os.path.join(root, name)
+        if os.path.exists(path):
+            state[name] = StateStore(path).load(strict=True)  # Bozuk dosya pakete varsayılan olarak girmesin
+    for name in LOG_FILES:
+        path = os.path.join(root, name)
+        if os.path.exists(path):
+            state[name] = _read_log_tail(path)
+    return state
+
+
+def write_state(state: Dict[str, Any], root: str = "."):
+    """Paketteki durumu diske yaz"""
+    for name, content in state.items():
+        path = os.path.join(root, name)
+        if name in LOG_FILES:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.writelines(content)
+        else:
+            StateStore(path).replace(content)
+
+
+# ============== DELTA ==============
+
+def _list_delta(old: List, new: List) -> Optional[Dict]:
+    """new == old[drop:] + append ise {'drop', 'append'} döndür"""
+    if not new:
+        return {"drop": len(old), "append": []}
+    start = 0
+    while True:
+        try:
+            start = old.index(new[0], start)
+        except ValueError:
+            return {"drop": len(old), "append": new} if not old else None
+        overlap = len(old) - start
+        if overlap <= len(new) and old[start:] == new[:overlap]:
+            return {"drop": start, "append": new[overlap:]}
+        start += 1
+
+
+def diff(old: Any, new: Any) -> Optional[Dict]:
+    """old -> new farkı (Değişiklik yoksa None)"""
+    if old == new:
+        return None
+    if isinstance(old, dict) and isinstance(new, dict):
+        changes = {}
+        for key, value in new.items():
+            if key not in old:
+                changes[key] = {"set": value}
+            else:
+                op = diff(old[key], value)
+                if op is not None:
+                    changes[key] = op
+        op = {"dict": changes}
+        removed = [key for key in old if key not in new]
+        if removed:
+            op["del"] = removed
+        return op
+    if isinstance(old, list) and isinstance(new, list):
+        op = _list_delta(old, new)
+        if op is not None:
+            return {"list": op}
+    return {"set": new}
+
+
+def apply(old: Any, op: Dict) -> Any:
+    if "set" in op:
+        return op["set"]
+    if "list" in op:
+        return old[op["list"]["drop"]:] + op["list"]["append"]
+    result = dict(old)
+    for key, child in op["dict"].items():
+        result[key] = apply(result.get(key), child)
+    for key in op.get("del", []):
+        result.pop(key, None)
+    return result
+
+
+# ============== PAKET ==============
+
+class SnapshotBundle:
+    def __init__(self, bundle_dir: str = BUNDLE_DIR, budget: int = SNAPSHOT_BUDGET_BYTES):
+        self.bundle_dir = bundle_dir
+        self.budget = budget
+        self.serializer = get_serializer(BUNDLE_FORMAT)
+        self.manifest_store = StateStore(os.path.join(bundle_dir, MANIFEST_FILE), fmt="json")
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.bundle_dir, name)
+
+    def _read(self, name: str) -> Any:
+        with open(self._path(name), 'rb') as f:
+            return self.serializer.loads(f.read())
+
+    def _write(self, prefix: str, obj: Any) -> Tuple[str, int]:
+        name = f"{prefix}-{datetime.now().strftime('%Y%m%dT%H%M%S%f')}.json.gz"
+        payload = self.serializer.dumps(obj)
+        tmp_path = self._path(name) + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, self._path(name))
+        return name, len(payload)
+
+    def load(self) -> Tuple[Dict[str, Any], Dict]:
+        """Base + deltaları sırayla uygula"""
+        manifest = self.manifest_store.load()
+        if not manifest.get("base"):
+            return {}, manifest
+        state = self._read(manifest["base"])
+        for delta in manifest.get("deltas", []):
+            state = apply(state, self._read(delta["file"]))
+        return state, manifest
+
+    def total_size(self, manifest: Dict) -> int:
+        return manifest.get("base_size", 0) + sum(d["size"] for d in manifest.get("deltas", []))
+
+    def save(self, root: str = ".") -> Dict:
+        """Yeni snapshot: delta yaz, gerekirse yeni base'e geç"""
+        os.makedirs(self.bundle_dir, exist_ok=True)
+        previous, manifest = self.load()
+        current = collect_state(root)
+
+        if manifest.get("base"):
+            op = diff(previous, current)
+            if op is None:
+                logger.info("📸 Snapshot: Değişiklik yok")
+                return manifest
+            name, size = self._write("delta", op)
+            manifest.setdefault("deltas", []).append({"file": name, "size": size,
+                                                      "created_at": datetime.now().isoformat()})
+            logger.info(f"📸 Delta yazıldı: {name} ({size / 1024:.1f} KB)")
+
+            if len(manifest["deltas"]) <= MAX_DELTAS and self.total_size(manifest) <= self.budget:
+                self.manifest_store.save(manifest)
+                return manifest
+
+        return self._rebase(manifest, current, root)
+
+    def _rebase(self, manifest: Dict, current: Dict[str, Any], root: str) -> Dict:
+        """Yeni base yaz; bütçeyi aşıyorsa sıcak history penceresini daralt"""
+        hot_days = HOT_DAYS
+        while True:
+            name, size = self._write("base", current)
+            if size <= self.budget or hot_days <= MIN_HOT_DAYS:
+                break
+            os.remove(self._path(name))
+            hot_days = max(MIN_HOT_DAYS, hot_days // 2)
+            logger.warning(f"⚠️ Snapshot bütçesi aşıldı ({size / 1024:.0f} KB), sıcak pencere {hot_days} güne iniyor")
+            HistoryManager(os.path.join(root, HISTORY_FILE), hot_days=hot_days).archive_cold_records()
+            current = collect_state(root)
+
+        if size > self.budget:
+            logger.warning(f"⚠️ Base yine de bütçeden büyük: {size / 1024:.0f} KB > {self.budget / 1024:.0f} KB")
+
+        # Eski zinciri temizle
+        old_files = [manifest.get("base")] + [d["file"] for d in manifest.get("deltas", [])]
+        manifest = {"base": name, "base_size": size, "deltas": [], "created_at": datetime.now().isoformat()}
+        self.manifest_store.save(manifest)
+        for old in filter(None, old_files):
+            if os.path.exists(self._path(old)):
+                os.remove(self._path(old))
+        logger.info(f"📸 Yeni base yazıldı: {name} ({size / 1024:.1f} KB)")
+        return manifest
+
+    def restore(self, root: str = ".") -> bool:
+        state, manifest = self.load()
+        if not state:
+            logger.info("📸 Snapshot yok, restore atlandı")
+            return False
+        write_state(state, root)
+        logger.info(f"📸 Restore: {len(state)} dosya ({len(manifest.get('deltas', []))} delta)")
+        return True
+
+    def info(self):
+        manifest = self.manifest_store.load()
+        print(f"Base: {manifest.get('base')} ({manifest.get('base_size', 0) / 1024:.1f} KB)")
+        print(f"Delta: {len(manifest.get('deltas', []))} adet")
+        print(f"Toplam: {self.total_size(manifest) / 1024:.1f} KB / Bütçe {self.budget / 1024:.0f} KB")
+        stray = set(os.path.basename(p) for p in glob.glob(self._path("*.json.gz")))
+        stray -= {manifest.get("base")} | {d["file"] for d in manifest.get("deltas", [])}
+        if stray:
+            print(f"Zincir dışı dosyalar: {', '.join(sorted(stray))}")
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else "info"
+    bundle = SnapshotBundle()
+    if command == "save":
+        bundle.save()
+    elif command == "restore":
+        bundle.restore()
+    elif command == "info":
+        bundle.info()
+    else:
+        print("Kullanım: python state_snapshot.py [save|restore|info]")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
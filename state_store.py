@@ -0,0 +1,152 @@
+"""
+State Store - Tüm durum dosyaları için ortak katman
+====================================================
+- Atomic yazma: geçici dosyaya yaz + fsync + os.replace (yarım dosya görülmez)
+- Advisory lock: <dosya>.lock üzerinde flock (cron, Actions ve sec_bot aynı anda çalışabilir)
+- Versiyonlu kayıt: her yazmada '_version' artar, eşzamanlı güncelleme yakalanır
+- Format: serializers.py (varsayılan kompakt JSON, FILINGWATCH_STATE_FORMAT ile değişir)
+"""
+
+import os
+import time
+import logging
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: lock yok, sadece atomic yazma
+    fcntl = None
+
+from serializers import get_serializer
+
+VERSION_KEY = "_version"
+WRITTEN_AT_KEY = "_written_at"
+
+
+class StateCorruptError(Exception):
+    """Dosya var ama okunamıyor (Sessizce sıfırlamak yerine yükselt)"""
+
+
+class StaleStateError(Exception):
+    """Okunandan sonra dosya başka bir process tarafından değiştirilmiş"""
+
+
+class StateStore:
+    """Tek bir durum dosyası (Lock + Atomic + Version)"""
+
+    def __init__(self, path: str, default: Optional[Callable[[], Dict]] = None,
+                 fmt: Optional[str] = None, lock_timeout: float = 30.0):
+        self.path = path
+        self.default = default or dict
+        self.serializer = get_serializer(fmt)
+        self.lock_timeout = lock_timeout
+
+    # ============== LOCK ==============
+
+    @contextmanager
+    def lock(self, exclusive: bool = True):
+        """<path>.lock üzerinde advisory lock (timeout'lu)"""
+        if fcntl is None:
+            yield
+            return
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd = os.open(self.path + ".lock", os.O_RDWR | os.O_CREAT, 0o644)
+        mode = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+        deadline = time.time() + self.lock_timeout
+        try:
+            while True:
+                try:
+                    fcntl.flock(fd, mode | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.time() >= deadline:
+                        raise TimeoutError(f"Lock alınamadı: {self.path}")
+                    time.sleep(0.05)
+            yield
+        finally:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            finally:
+                os.close(fd)
+
+    # ============== OKUMA / YAZMA ==============
+
+    def _read(self, strict: bool) -> Dict:
+        if not os.path.exists(self.path):
+            return self.default()
+        try:
+            with open(self.path, 'rb') as f:
+                data = self.serializer.loads(f.read())
+            if not isinstance(data, dict):
+                raise ValueError(f"Beklenen dict, gelen {type(data).__name__}")
+            return data
+        except Exception as e:
+            if strict:
+                raise StateCorruptError(f"{self.path} okunamadı: {e}") from e
+            logging.error(f"⚠️ State okunamadı ({self.path}): {e} - varsayılan kullanılıyor")
+            return self.default()
+
+    def _write(self, data: Dict):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(self.path) + ".", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(self.serializer.dumps(data))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def load(self, strict: bool = False) -> Dict:
+        """Shared lock ile oku. strict=True ise bozuk dosyada StateCorruptError"""
+        with self.lock(exclusive=False):
+            return self._read(strict)
+
+    def save(self, data: Dict, expected_version: Optional[int] = None):
+        """Exclusive lock ile atomic yaz. expected_version verilirse çakışmada StaleStateError"""
+        with self.lock(exclusive=True):
+            current = self._read(strict=False) if os.path.exists(self.path) else {}
+            current_version = current.get(VERSION_KEY, 0)
+            if expected_version is not None and current_version != expected_version:
+                raise StaleStateError(
+                    f"{self.path}: beklenen v{expected_version}, diskteki v{current_version}"
+                )
+            self._stamp(data, current_version)
+            self._write(data)
+
+    @contextmanager
+    def transaction(self, strict: bool = False):
+        """Oku-değiştir-yaz bloğu boyunca exclusive lock tut"""
+        with self.lock(exclusive=True):
+            data = self._read(strict)
+            current_version = data.get(VERSION_KEY, 0)
+            yield data
+            self._stamp(data, current_version)
+            self._write(data)
+
+    def replace(self, data: Dict):
+        """Veriyi olduğu gibi yaz (Version artırmadan - snapshot restore için)"""
+        with self.lock(exclusive=True):
+            self._write(data)
+
+    def update(self, fn: Callable[[Dict], Any]) -> Any:
+        """Kısa yol: store.update(lambda d: d.update(...))"""
+        with self.transaction() as data:
+            return fn(data)
+
+    @staticmethod
+    def _stamp(data: Dict, previous_version: int):
+        data[VERSION_KEY] = previous_version + 1
+        data[WRITTEN_AT_KEY] = datetime.now().isoformat()
+
+    @staticmethod
+    def version_of(data: Dict) -> int:
+        return data.get(VERSION_KEY, 0)
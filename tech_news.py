@@ -3,10 +3,12 @@ from bs4 import BeautifulSoup
 import logging
 import sys
 import os
-# Import existing Twitter client
-# Import existing Twitter client
-from main_v2 import post_tweet, get_x_client
-from openai import OpenAI
+import hashlib
+# Ortak outbox (Kota / aralık tüm botlarla paylaşılır)
+from main_v2 import dispatch_outbox
+from outbox import get_outbox
+from llm_cache import get_llm_cache
+from clients import using
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -22,19 +24,24 @@ class TechNewsBot:
         }
 
     def _generate_ai_hook(self, prompt_template: str, content: str) -> str:
-        """Helper to call OpenAI"""
+        """Helper to call OpenAI (llm_cache ile önbellekli)"""
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key: return None
         
-        try:
-            client = OpenAI(api_key=api_key)
-            resp = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt_template.format(content=content)}],
-                max_tokens=100,
-                temperature=0.8
-            )
+        def complete(prompt: str) -> str:
+            with using('openai') as client:  # Paylaşılan client (clients.py)
+                resp = client.chat.completions.create(
+                    model="gpt-4o-mini",
+                    messages=[{"role": "user", "content": prompt}],
+                    max_tokens=100,
+                    temperature=0.8
+                )
             return resp.choices[0].message.content.strip()
+
+        try:
+            # Aynı haber/ürün tekrar gelirse (Retry, çakışan çalışma) API'a gitme
+            return get_llm_cache().get_or_create("gpt-4o-mini", prompt_template, {'content': content},
+                                                 complete, max_tokens=100, temperature=0.8)
         except Exception as e:
             logger.error(f"AI Generation Error: {e}")
             return None
@@ -218,14 +225,15 @@ class TechNewsBot:
         if tweet_text:
             # Tweet at
             try:
-                # post_tweet fonksiyonunu main_v2'den çağırıyoruz
-                # Not: post_tweet içinde 'print' var, loglama için yeterli.
+                # Ortak outbox'a yaz; kota / aralık uygunsa hemen gider, değilse dispatch'te
                 # Safe check for length
                 if len(tweet_text) > 280:
                     tweet_text = tweet_text[:277] + "..."
                     
                 logger.info(f"Tweetleniyor:\n{tweet_text}")
-                post_tweet(tweet_text) # Gerçek tweet
+                key = hashlib.sha1(tweet_text.encode('utf-8')).hexdigest()[:12]
+                get_outbox().schedule([{'id': f"news:{source}:{key}", 'text': tweet_text}], source='news')
+                dispatch_outbox()
             except Exception as e:
                 logger.error(f"Tweet atma hatası: {e}")
         else:
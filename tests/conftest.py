@@ -0,0 +1,15 @@
+"""Offline testler: modüller repo kökünden import edilir, state dosyaları tmp dizine yazılır"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """State dosyaları (Göreli yollar) geçici dizinde"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
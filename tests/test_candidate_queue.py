@@ -0,0 +1,88 @@
+import json
+import threading
+import time
+
+import pytest
+
+import candidate_queue
+from candidate_queue import CandidateQueue
+from scoring import rules_version, score_records
+
+
+def _records(*names):
+    return score_records([{'serial_number': str(99000001 + i), 'mark_name': name, 'owner': 'Acme Inc.',
+                           'goods_services': 'Downloadable AI software', 'international_class': '009'}
+                          for i, name in enumerate(names)])
+
+
+def _fail(*args, **kwargs):
+    raise AssertionError("beklenmeyen çağrı")
+
+
+def test_peek_reuses_sorted_lanes(workdir, monkeypatch):
+    queue = CandidateQueue()
+    queue.push(_records("NEURAL GPT", "CLOUD AI", "ACME"))
+    first = queue.peek(2)
+    assert first
+
+    monkeypatch.setattr(queue.store, "load", _fail)
+    monkeypatch.setattr(candidate_queue, "score_records", _fail)
+    assert queue.peek(2) == first
+
+
+def test_rescored_entries_are_saved(workdir, monkeypatch):
+    CandidateQueue().push(_records("NEURAL GPT", "CLOUD AI"))
+    with open(candidate_queue.CANDIDATE_QUEUE_FILE) as f:
+        data = json.load(f)
+    for entry in data['normal']:
+        entry['record']['rules_version'] = "eski"
+    with open(candidate_queue.CANDIDATE_QUEUE_FILE, "w") as f:
+        json.dump(data, f)
+
+    assert CandidateQueue().peek(2)
+    with open(candidate_queue.CANDIDATE_QUEUE_FILE) as f:
+        saved = json.load(f)
+    assert {entry['record']['rules_version'] for entry in saved['normal']} == {rules_version()}
+
+    monkeypatch.setattr(candidate_queue, "score_records", _fail)  # Diğer run tekrar puanlamaz
+    assert CandidateQueue().peek(2)
+
+
+def test_remove_updates_memory_and_file(workdir):
+    queue = CandidateQueue()
+    queue.push(_records("NEURAL GPT", "CLOUD AI"))
+    serial = queue.peek(1)[0]['serial_number']
+
+    queue.remove([serial])
+    assert serial not in {tm['serial_number'] for tm in queue.peek(10)}
+    assert serial not in {tm['serial_number'] for tm in CandidateQueue().peek(10)}
+
+
+@pytest.mark.parametrize("lane", ["normal", "weird"])
+def test_expired_entries_are_skipped(workdir, lane):
+    queue = CandidateQueue(ttl_hours=0)
+    queue.push(_records("NEURAL GPT", "BANANA HAMMOCK"))
+    assert queue.peek(10, lane=lane) == []
+
+
+def test_lazy_queue_created_once_across_threads(workdir, monkeypatch):
+    import main_v2  # Import'ta log dosyası açar: tmp dizinde
+
+    created = []
+
+    class SlowQueue(CandidateQueue):
+        def __init__(self, *args, **kwargs):
+            created.append(self)
+            time.sleep(0.05)  # Yarış penceresi
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(main_v2, "_candidate_queue", None)
+    monkeypatch.setattr(main_v2, "CandidateQueue", SlowQueue)
+    monkeypatch.setattr(main_v2, "get_record_store", lambda: type("Store", (), {"today": lambda self: []})())
+    seen = []
+    threads = [threading.Thread(target=lambda: seen.append(main_v2.get_candidate_queue())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(created) == 1 and all(queue is created[0] for queue in seen)
@@ -0,0 +1,75 @@
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+import requests
+import tweepy
+
+from clients import ClientRegistry, _TimeoutSession, is_auth_error
+
+
+def _auth_error():
+    response = requests.Response()
+    response.status_code = 401
+    response.reason = "Unauthorized"
+    response._content = b'{"title": "Unauthorized", "detail": "Unauthorized", "status": 401}'
+    return tweepy.Unauthorized(response)
+
+
+@pytest.fixture
+def registry():
+    built = []
+    return ClientRegistry({'openai': lambda: built.append(object()) or built[-1],
+                           'x': lambda account="main": (account, len(built))}), built
+
+
+def test_non_auth_error_keeps_client(registry):
+    clients, built = registry
+    with pytest.raises(TimeoutError):
+        with clients.using("openai") as client:
+            raise TimeoutError("yavaş")
+    with clients.using("openai") as again:
+        assert again is client
+    assert len(built) == 1
+
+
+def test_auth_error_rebuilds_client(registry):
+    clients, built = registry
+    error = _auth_error()
+    assert is_auth_error(error)
+    with pytest.raises(tweepy.Unauthorized):
+        with clients.using("openai") as client:
+            raise error
+    with clients.using("openai") as again:
+        assert again is not client
+    assert len(built) == 2
+
+
+def test_account_clients_are_separate(registry):
+    clients, _ = registry
+    assert clients.get("x:weird")[0] == "weird"
+    assert clients.get("x") == ("main", 0) and clients.get("x") is clients.get("x")
+
+
+def test_timeout_session_keeps_last_headers():
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("x-rate-limit-remaining", "16")
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        session = _TimeoutSession(5)
+        assert session.last_headers is None
+        session.get(f"http://127.0.0.1:{server.server_port}/2/tweets")
+        assert session.last_headers["x-rate-limit-remaining"] == "16"
+    finally:
+        server.shutdown()
+        server.server_close()
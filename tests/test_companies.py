@@ -0,0 +1,41 @@
+import random
+import re
+
+from companies import COMPANY_MATCHER, KNOWN_COMPANIES, KNOWN_TICKERS
+
+
+def _old_first(owner, vocabulary):
+    """Eski döngü: sözlük sırasıyla tam kelime regex'i"""
+    for company in vocabulary:
+        if re.search(r'\b' + re.escape(company.lower()) + r'\b', owner.lower()):
+            return company
+    return None
+
+
+def _owners():
+    rng = random.Random(7)
+    names = list(KNOWN_COMPANIES) + list(KNOWN_TICKERS)
+    fillers = ["INC.", "LLC", "HOLDINGS", "INTELLIGENT", "SNAPPY", "THE", "&", "-", "CORP", "METAL"]
+    owners = ["Apple Inc.", "Intelligent Systems LLC", "Snap Inc.", "SNAP INC / META PLATFORMS",
+              "Coca-Cola Company", "McDonald's Corp", "Targeted Ads LLC", ""]
+    for _ in range(500):
+        words = rng.sample(names, 2) + rng.sample(fillers, 2)
+        rng.shuffle(words)
+        owners.append(" ".join(words))
+    return owners
+
+
+def _old_match(owner):
+    company = _old_first(owner, KNOWN_COMPANIES)
+    ticker_company = _old_first(owner, KNOWN_TICKERS)
+    if not company and not ticker_company:
+        return None
+    return (company or ticker_company,
+            KNOWN_COMPANIES[company] if company else None,
+            KNOWN_TICKERS[ticker_company] if ticker_company else None)
+
+
+def test_company_matcher_matches_old_loop():
+    for owner in _owners():
+        match = COMPANY_MATCHER.match(owner)
+        assert (tuple(match) if match else None) == _old_match(owner), owner
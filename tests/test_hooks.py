@@ -0,0 +1,100 @@
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+import llm_cache
+from clients import reset_clients
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def fake_llm(workdir, monkeypatch, request):
+    """fake_llm_server.py: varsayılan batch'te her 2. hook geçersiz (indirect parametreyle başka argümanlar)"""
+    port = _free_port()
+    args = getattr(request, "param", ["--bad-every", "2"])
+    server = subprocess.Popen([sys.executable, os.path.join(ROOT, "fake_llm_server.py"), "--port", str(port), *args],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.monotonic() + 10
+        while True:
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline or server.poll() is not None:
+                    pytest.fail("fake_llm_server başlamadı")
+                time.sleep(0.05)
+        monkeypatch.setenv("OPENAI_BASE_URL", f"http://127.0.0.1:{port}/v1")
+        monkeypatch.setenv("OPENAI_API_KEY", "test")
+        monkeypatch.setattr(llm_cache, "_llm_cache", None)  # Önbellek tmp dizinde
+        reset_clients('openai')
+        yield
+    finally:
+        reset_clients('openai')
+        server.terminate()
+        server.wait(timeout=5)
+
+
+def _candidates():
+    return [{'serial_number': str(99000001 + i), 'mark_name': name, 'owner': 'Acme Inc.',
+             'goods_services': 'Downloadable software', 'category': category}
+            for i, (name, category) in enumerate([("NEURAL GPT", "normal"), ("CLOUD AI", "normal"),
+                                                  ("BANANA HAMMOCK", "weird"), ("ZEN AI", "normal")])]
+
+
+def test_invalid_batch_hooks_fall_back_to_single_requests(fake_llm, monkeypatch):
+    import main_v2
+
+    candidates = _candidates()
+    single = []
+    generate_hook = main_v2.generate_hook
+    monkeypatch.setattr(main_v2, "AI_BATCH_HOOKS", True)
+    monkeypatch.setattr(main_v2, "generate_hook", lambda tm: single.append(tm['serial_number']) or generate_hook(tm))
+
+    hooks = main_v2.prefetch_hooks(candidates, budget=20)
+
+    assert sorted(single) == [candidates[1]['serial_number'], candidates[3]['serial_number']]
+    assert all(hooks[tm['serial_number']] for tm in candidates)
+
+    # Batch'te geçerli dönenler tekil anahtarla önbellekte: ikinci çalışma istek atmaz
+    monkeypatch.setattr(main_v2, "_complete", pytest.fail)
+    monkeypatch.setattr(main_v2, "_complete_json", pytest.fail)
+    monkeypatch.setattr(llm_cache, "_llm_cache", None)
+    assert main_v2.prefetch_hooks(candidates, budget=20) == hooks
+
+
+@pytest.mark.parametrize("fake_llm", [["--delay", "2"]], indirect=True)
+@pytest.mark.parametrize("batch", [True, False])
+def test_over_budget_hooks_fall_back_to_classic_format(fake_llm, monkeypatch, batch):
+    import main_v2
+
+    candidates = _candidates()
+    single = []
+    generate_hook = main_v2.generate_hook
+    monkeypatch.setattr(main_v2, "AI_BATCH_HOOKS", batch)
+    monkeypatch.setattr(main_v2, "generate_hook", lambda tm: single.append(tm['serial_number']) or generate_hook(tm))
+
+    started = time.monotonic()
+    hooks = main_v2.prefetch_hooks(candidates, budget=0.5)
+    elapsed = time.monotonic() - started
+
+    assert hooks == {tm['serial_number']: None for tm in candidates}
+    assert 0.5 <= elapsed < 1.5  # Batch de bütçeye dahil
+    assert len(single) == (0 if batch else len(candidates))  # Geç kalan batch'ten sonra tekil istek yok
+    assert "NEW TRADEMARK FILED" in main_v2.format_tweet(candidates[0], hooks)  # Klasik format
+
+    for thread in threading.enumerate():  # Geç kalan istekler tmp dizinde bitsin
+        if thread.name.startswith("hook_"):
+            thread.join(timeout=10)
@@ -0,0 +1,47 @@
+from llm_cache import LLMCache, cache_key
+
+
+def _cache():
+    return LLMCache(path="llm_cache.json")
+
+
+def test_lookup_does_not_write(workdir, monkeypatch):
+    cache = _cache()
+    cache.put("k", "hook")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("get dosyaya yazmamalı")
+
+    monkeypatch.setattr(cache.store, "transaction", fail)
+    assert cache.get("k") == "hook"
+    assert cache.get("yok") is None
+
+
+def test_repeated_miss_counted_once(workdir):
+    cache = _cache()
+    key = cache_key("m", "{mark}", {'mark': "ACME"})
+    assert cache.get(key) is None  # prefetch bakışı
+    calls = []
+    value = cache.get_or_create("m", "{mark}", {'mark': "ACME"}, lambda prompt: calls.append(prompt) or "hook")
+
+    assert value == "hook" and calls == ["ACME"]
+    assert cache.counters == {'hits': 0, 'misses': 1, 'expired': 0}
+    assert _cache().get(key) == "hook"
+
+
+def test_flush_persists_stats_and_recency(workdir):
+    _cache().put("k", "hook")
+    cache = _cache()
+    created = cache.store.load()["entries"]["k"]['used_at']
+    cache.get("k")
+    cache.get("yok")
+    assert cache.store.load()["stats"] == {'hits': 0, 'misses': 0, 'expired': 0}
+
+    cache.flush()
+    data = cache.store.load()
+    assert data["stats"] == {'hits': 1, 'misses': 1, 'expired': 0}
+    assert data["entries"]["k"]['used_at'] >= created
+
+    version = cache.store.version_of(data)
+    cache.flush()  # Bekleyen yok -> yazma yok
+    assert cache.store.version_of(cache.store.load()) == version
@@ -0,0 +1,34 @@
+import pytest
+
+from lookalike import TrigramIndex, find_lookalike, leet_normalize
+
+
+@pytest.mark.parametrize("name, mark", [
+    ("G00GLE AI", "GOOGLE"),
+    ("NETFL1X", "NETFLIX"),
+    ("GOOOGLE", "GOOGLE"),
+    ("AMAZONN PRIME", "AMAZON"),
+    ("SPOTIFYY", "SPOTIFY"),
+])
+def test_lookalikes(name, mark):
+    match = find_lookalike(name, "Unrelated Holdings LLC")
+    assert match is not None and match.mark == mark
+
+
+@pytest.mark.parametrize("name", [
+    "CHANNEL", "CH4NNEL", "NIKKI", "PRADO", "AMAZONIA", "OPEN AIR", "WINDOW CLEANING",
+    "GOOGLE", "COCA COLA", "APPLES",
+])
+def test_common_words_and_real_marks_are_not_lookalikes(name):
+    assert find_lookalike(name, "Unrelated Holdings LLC") is None
+
+
+def test_owner_of_the_brand_is_not_a_lookalike():
+    assert find_lookalike("GOOOGLE", "Google LLC") is None
+
+
+def test_trigram_index_query():
+    index = TrigramIndex(["GOOGLE", "NETFLIX", "G00GLE"])
+    assert len(index) == 2  # Leet ile aynı anahtar tek kayıt
+    assert index.query("GOOGEL", k=1)[0][0] == "GOOGLE"
+    assert leet_normalize("N3TFL1X!") == "netflixi"
@@ -0,0 +1,74 @@
+from contextlib import contextmanager
+
+import pytest
+
+import media_pipeline
+from media_pipeline import MEDIA_EXPIRY_MARGIN, MEDIA_ID_TTL_HOURS, MediaIdCache
+
+NOW = 1_700_000_000.0
+
+
+def test_hit_within_expiry_window(workdir):
+    cache = MediaIdCache()
+    cache.put("main:abc", "111", now=NOW)
+    assert cache.get("main:abc", now=NOW + MEDIA_ID_TTL_HOURS * 3600 - 1) == "111"
+    assert MediaIdCache().get("main:abc", now=NOW + 60) == "111"  # Diskten
+    assert cache.uploaded_at("111") == NOW
+
+
+def test_miss_after_expiry(workdir):
+    cache = MediaIdCache()
+    cache.put("main:abc", "111", now=NOW)
+    cache.put("main:def", "222", expires_after=86400, now=NOW)
+    assert cache.get("main:abc", now=NOW + MEDIA_ID_TTL_HOURS * 3600) is None
+    assert cache.get("main:def", now=NOW + 86400 - MEDIA_EXPIRY_MARGIN - 1) == "222"
+    assert cache.get("main:def", now=NOW + 86400 - MEDIA_EXPIRY_MARGIN) is None
+
+    cache.put("main:ghi", "333", now=NOW + 86400)  # Yazarken süresi dolanlar temizlenir
+    assert set(cache.store.load()["media"]) == {"main:ghi"}
+
+
+def test_forget(workdir):
+    cache = MediaIdCache()
+    cache.put("main:abc", "111", now=NOW)
+    cache.put("weird:abc", "222", now=NOW)
+    cache.forget("111")
+    assert cache.get("main:abc", now=NOW) is None
+    assert cache.get("weird:abc", now=NOW) == "222"
+    assert cache.uploaded_at("111") is None
+
+
+@pytest.fixture
+def uploads(workdir, monkeypatch):
+    calls = []
+
+    class FakeApi:
+        def __init__(self, name):
+            self.name = name
+
+        def media_upload(self, path):
+            calls.append(self.name)
+            return type("Media", (), {"media_id": 1000 + len(calls), "expires_after_secs": 86400})()
+
+    @contextmanager
+    def fake_using(name):
+        yield FakeApi(name)
+
+    monkeypatch.setattr(media_pipeline, "using", fake_using)
+    monkeypatch.setattr(media_pipeline, "_media_cache", None)
+    return calls
+
+
+def test_upload_cached_per_account(uploads, tmp_path):
+    image = tmp_path / "card.png"
+    image.write_bytes(b"png")
+
+    first = media_pipeline.upload_media(str(image), "main")
+    assert media_pipeline.upload_media(str(image), "main") == first  # Aynı hesap: önbellekten
+    weird = media_pipeline.upload_media(str(image), "weird")
+    assert weird != first                                              # media_id hesaba ait
+    assert uploads == ["x_v1", "x_v1:weird"]
+
+    media_pipeline.get_media_cache().forget(first)                     # X reddetti
+    assert media_pipeline.upload_media(str(image), "main") not in (first, weird)
+    assert uploads == ["x_v1", "x_v1:weird", "x_v1"]
@@ -0,0 +1,61 @@
+import pytest
+
+import outbox
+from candidate_queue import CandidateQueue
+from near_dup import NearDupIndex
+from scoring import rules_version
+
+GOODS = "Downloadable software using artificial intelligence for generating text and images"
+
+
+def test_near_identical_marks_are_flagged():
+    index = NearDupIndex()
+    index.add("1", "BRIGHTPATH", GOODS)
+    assert index.find("Brightpath!", "Apparel, namely shirts") == "1"  # İsim aynı
+    assert index.find("BRIGHTPATH AI", GOODS) == "1"                  # İsim benzer + goods aynı
+    assert index.add_if_new("2", "BRIGHTPATH AI", GOODS + " and video") == "1"
+    assert len(index) == 1
+
+
+def test_different_marks_are_not_flagged():
+    index = NearDupIndex()
+    index.add("1", "BRIGHTPATH", GOODS)
+    assert index.find("ZEN CLOUD", GOODS) is None
+    assert index.find("BRIGHTPATH AI", "Clothing, namely shirts, hats and socks") is None
+    assert index.add_if_new("2", "ORBIT LABS", "Coffee; tea; cocoa") is None
+    assert index.find(None, GOODS) is None and len(index) == 2
+
+
+def _record(serial, name, score):
+    return {'serial_number': serial, 'mark_name': name, 'owner': 'Acme Inc.', 'goods_services': GOODS,
+            'score': score, 'reasons': ['AI'], 'is_weird': False, 'weird_score': 0,
+            'rules_version': rules_version()}
+
+
+@pytest.fixture
+def main_v2(workdir, monkeypatch):
+    import main_v2  # Import'ta log dosyası açar: tmp dizinde
+    monkeypatch.setattr(main_v2, "_candidate_queue", CandidateQueue())
+    monkeypatch.setattr(outbox, "_outbox", None)
+    return main_v2
+
+
+def test_filter_and_select_skips_near_dup_within_lookahead(main_v2):
+    main_v2.get_candidate_queue().push([
+        _record("1", "BRIGHTPATH", 90),
+        _record("2", "BRIGHTPATH AI", 80),   # 1'in kopyası
+        _record("3", "ZEN CLOUD", 70),
+        _record("4", "ORBIT LABS", 60),
+    ])
+    selected = main_v2.filter_and_select(max_tweets=2)
+    assert [tm['serial_number'] for tm in selected] == ["1", "3"]
+
+
+def test_filter_and_select_drops_copies_of_posted(main_v2):
+    main_v2.posted_store.save({"serial_numbers": ["0"], "tweets": [
+        {"serial": "0", "mark": "BRIGHTPATH", "goods": GOODS, "text": "..."}]})
+    queue = main_v2.get_candidate_queue()
+    queue.push([_record("1", "BRIGHTPATH", 90), _record("3", "ZEN CLOUD", 70)])
+
+    assert [tm['serial_number'] for tm in main_v2.filter_and_select(max_tweets=2)] == ["3"]
+    assert [tm['serial_number'] for tm in queue.peek(10)] == ["3"]  # Paylaşılmışın kopyası kuyruktan çıktı
@@ -0,0 +1,84 @@
+import outbox
+from outbox import Outbox, OUTBOX_CLAIM_SECONDS, OUTBOX_MAX_ATTEMPTS, OUTBOX_RETRY_SECONDS
+from post_quota import PostQuota, QUOTA_RESET_GRACE
+
+NOW = 1_800_000_000.0
+
+
+def _outbox(quotas=None):
+    quota = (lambda account: quotas.setdefault(account, PostQuota(account))) if quotas is not None else None
+    return Outbox(gap=(0, 0), quota=quota)
+
+
+def _schedule(box, *ids, account='main', now=NOW):
+    return box.schedule([{'id': i, 'text': f"tweet {i}", 'account': account} for i in ids], now=now)
+
+
+def test_claim_locks_entry_until_released(workdir):
+    box = _outbox()
+    _schedule(box, "a")
+
+    assert box.claim(now=NOW)['id'] == "a"
+    assert box.claim(now=NOW + 1) is None                          # İkinci dispatch aynı tweeti almaz
+    assert box.claim(now=NOW + OUTBOX_CLAIM_SECONDS + 1)['id'] == "a"  # Çöken dispatch'in kilidi düşer
+
+    box.release("a")
+    assert box.claim(now=NOW + OUTBOX_CLAIM_SECONDS + 2)['id'] == "a"
+    assert box.entries()[0]['attempts'] == 0
+
+
+def test_failed_send_retries_then_drops(workdir):
+    box = _outbox()
+    _schedule(box, "a")
+
+    now = NOW
+    for attempt in range(1, OUTBOX_MAX_ATTEMPTS + 1):
+        assert box.dispatch(lambda entry: None, now=now) is None
+        if attempt < OUTBOX_MAX_ATTEMPTS:
+            entry = box.entries()[0]
+            assert entry['attempts'] == attempt and entry['claimed_at'] is None
+            assert box.claim(now=now + 1) is None                  # Retry zamanı gelmedi
+            now = entry['due_at']
+    assert len(box) == 0
+
+
+def test_quota_exhaustion_releases_without_attempt(workdir):
+    quotas = {}
+    box = _outbox(quotas)
+    _schedule(box, "a")
+    reset_at = NOW + 900
+
+    def send(entry):  # 429: kota bitti
+        quotas['main'].observe({'x-rate-limit-remaining': '0', 'x-rate-limit-reset': str(int(reset_at))},
+                               limited=True, now=NOW)
+        return None
+
+    assert box.dispatch(send, now=NOW) is None
+    entry = box.entries()[0]
+    assert entry['attempts'] == 0 and entry['claimed_at'] is None
+    assert box.claim(now=NOW + 1) is None
+    assert box.next_due(NOW) == reset_at + QUOTA_RESET_GRACE
+    assert box.claim(now=reset_at + QUOTA_RESET_GRACE + 1)['id'] == "a"
+
+
+def test_exhausted_lane_does_not_block_others(workdir):
+    quotas = {}
+    box = _outbox(quotas)
+    _schedule(box, "a", account='main')
+    _schedule(box, "b", account='weird')
+    quotas.setdefault('main', PostQuota('main')).observe(
+        {'x-user-limit-24hour-remaining': '0', 'x-user-limit-24hour-reset': str(int(NOW + 3600))}, now=NOW)
+
+    sent = []
+    results = box.dispatch_lanes(lambda entry: sent.append(entry['id']) or f"tweet-{entry['id']}", now=NOW)
+    assert results == {'main': None, 'weird': "tweet-b"}
+    assert sent == ["b"] and [entry['id'] for entry in box.entries()] == ["a"]
+
+
+def test_due_command(workdir, monkeypatch):
+    box = _outbox()
+    monkeypatch.setattr(outbox, "_outbox", box)
+    monkeypatch.setattr("sys.argv", ["outbox.py", "due"])
+    assert outbox.main() == 1
+    _schedule(box, "a", now=0)
+    assert outbox.main() == 0
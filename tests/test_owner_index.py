@@ -0,0 +1,44 @@
+import pytest
+
+from owner_index import OwnerIndex, normalize_owner
+
+APPLE_VARIANTS = ["Apple Inc.", "APPLE, INC.", "APPLE INC", "Apple Inc. (California corporation)",
+                  "APPLE INC., A CALIFORNIA CORPORATION", "The Apple Inc."]
+
+
+@pytest.mark.parametrize("raw, key", [
+    ("Apple Inc.", "APPLE"),
+    ("APPLE, INC.", "APPLE"),
+    ("Nike, Inc.", "NIKE"),
+    ("AT&T Corp.", "AT&T"),
+    ("Smith Law Firm PLLC", "SMITH LAW FIRM"),
+    ("N/A", ""),
+    (None, ""),
+])
+def test_normalize_owner(raw, key):
+    assert normalize_owner(raw) == key
+
+
+def test_variants_resolve_to_one_id(workdir):
+    index = OwnerIndex()
+    ids = index.resolve_many(APPLE_VARIANTS)
+    assert len(set(ids)) == 1 and ids[0] is not None
+    assert index.resolve("SMITH, JOHN") == index.resolve("John Smith")  # Token sırası farkı
+
+
+def test_unrelated_owners_get_distinct_ids(workdir):
+    index = OwnerIndex()
+    ids = index.resolve_many(["Apple Inc.", "Apple Records Ltd.", "Nike, Inc.", "Snap Inc.", "John Smith"])
+    assert len(set(ids)) == 5
+    assert index.resolve_many(["", None, "Unknown"]) == [None, None, None]
+
+
+def test_ids_stable_after_save_and_load(workdir):
+    raws = APPLE_VARIANTS + ["Nike, Inc.", "Snap Inc.", "John Smith"]
+    first = OwnerIndex().resolve_many(raws)
+
+    reloaded = OwnerIndex()
+    assert reloaded.aliases  # Diskten yüklendi
+    assert reloaded.resolve_many(raws) == first
+    assert reloaded.resolve("NIKE INC") == first[raws.index("Nike, Inc.")]  # Yeni yazım, eski ID
+    assert OwnerIndex().resolve("Tesla, Inc.") == len(set(first))          # Yeni entity sona eklenir
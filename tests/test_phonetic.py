@@ -0,0 +1,48 @@
+import pytest
+
+from phonetic import PhoneticIndex, find_soundalike, phonetic_keys, spelling_skeleton, rescan
+
+UNRELATED = "Unrelated Holdings LLC"
+
+
+@pytest.mark.parametrize("name, mark", [
+    ("NYKEE", "NIKE"),
+    ("KOKA KOLA", "COCA-COLA"),
+    ("RED BUL ENERGY", "RED BULL"),
+    ("ADDIDAS", "ADIDAS"),
+    ("GUCHI", "GUCCI"),
+    ("SPOTIFI", "SPOTIFY"),
+    ("DIZNEY", "DISNEY"),
+])
+def test_soundalikes(name, mark):
+    match = find_soundalike(name, UNRELATED)
+    assert match is not None and match.mark == mark
+
+
+@pytest.mark.parametrize("name, owner", [
+    ("NIKKY", "Nicole, Inc."),                                   # İsim, kısa anahtar (NK) iskeleti tutmuyor
+    ("CANOLY", "CHEN, JIANBO"),                                  # CHANEL'in sadece alternatif okunuşu
+    ("HONATTY", "Jiujiang Shanuan Trading Co., Ltd."),           # Uzunluk farkı
+    ("RAEDIATE", "Radiate Authentic Energy LLC"),                # Sahibin kendi adı
+    ("NIKKI", UNRELATED),
+    ("KWIK-GPT", UNRELATED),                                     # QUICK marka değil
+    ("NIKE", UNRELATED),                                         # Markanın kendisi
+    ("NYKEE", "Nike, Inc."),                                     # Sahibi o şirket
+    ("RED BULLDOG", UNRELATED),
+])
+def test_not_soundalikes(name, owner):
+    assert find_soundalike(name, owner) is None
+
+
+def test_phonetic_keys():
+    assert phonetic_keys("KWIK") == phonetic_keys("QUICK") == ("KK", "KK")
+    assert phonetic_keys("NYKEE")[0] == phonetic_keys("NIKE")[0] == "NK"
+    assert spelling_skeleton("NYKEE") == spelling_skeleton("NIKE") == "nik"
+    assert spelling_skeleton("NIKKY") == "niki"
+
+
+def test_rescan_and_history_clusters():
+    records = [{'mark_name': 'NYKEE', 'owner': 'A'}, {'mark_name': 'NYKEE', 'owner': 'A'},
+               {'mark_name': 'NIKKY', 'owner': 'Nicole, Inc.'}]
+    assert [tm['mark_name'] for tm, _ in rescan(records)] == ['NYKEE', 'NYKEE']
+    assert PhoneticIndex(['NYKEE', 'NIKE', 'NYKE']).clusters(min_size=3) == [['NYKEE', 'NIKE', 'NYKE']]
@@ -0,0 +1,83 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from history_manager import HistoryManager
+from record_store import RecordStore, LEGACY_MIGRATED_KEY
+from state_store import StateCorruptError
+
+
+def _record(serial, days_ago=0, name="ACME"):
+    return {'serial_number': str(serial), 'mark_name': name, 'owner': 'Acme Inc.',
+            'scanned_at': (datetime.now() - timedelta(days=days_ago)).isoformat()}
+
+
+def _write_legacy_cache(last_serial):
+    with open("daily_cache.json", "w") as f:
+        json.dump({"date": "2026-01-16", "last_serial": last_serial,
+                   "trademarks": [_record(99000001)]}, f)
+
+
+def test_legacy_cache_migrates_once(workdir):
+    _write_legacy_cache(99000001)
+    store = RecordStore()
+    assert store.last_serial == 99000001
+    assert store.history.load_meta()[LEGACY_MIGRATED_KEY] is True
+
+    store.ingest([_record(99000050)], last_serial=99000050)
+    _write_legacy_cache(99000001)  # Eski dosya hâlâ repoda
+    assert RecordStore().last_serial == 99000050
+
+
+def test_corrupt_history_is_not_reset(workdir):
+    _write_legacy_cache(99000001)
+    RecordStore().ingest([_record(99000050), _record(99000051)], last_serial=99000051)
+
+    with open("history.json", "wb") as f:
+        f.write(b'{"trademarks": [')  # Yarım yazılmış dosya
+    with pytest.raises(StateCorruptError):
+        RecordStore().ingest([_record(99000052)], last_serial=99000052)
+
+    store = RecordStore.__new__(RecordStore)
+    store.history = HistoryManager()
+    with pytest.raises(StateCorruptError):
+        store.history.append_to_history([_record(99000052)], meta={'last_serial': 99000052})
+    with open("history.json", "rb") as f:
+        assert f.read() == b'{"trademarks": ['
+
+
+def test_archive_is_idempotent_after_crash(workdir):
+    history = HistoryManager(hot_days=30)
+    history.append_to_history([_record(99000001, days_ago=40), _record(99000002, days_ago=1)])
+    assert [tm['serial_number'] for tm in history.load_history()] == ['99000002']
+    assert history.in_archive('99000001')
+
+    # Bloklar yazıldı ama sıcak dosya eski halinde kaldı (Yarım taşıma)
+    with history.store.transaction(strict=True) as data:
+        data['trademarks'].append(_record(99000001, days_ago=40))
+    history = HistoryManager(hot_days=30)
+    history.archive_cold_records()
+
+    assert [tm['serial_number'] for tm in history.load_history()] == ['99000002']
+    assert len(history._load_index()) == 1
+    assert [tm['serial_number'] for tm in history.iter_all_records()] == ['99000001', '99000002']
+
+
+def test_archived_lookup_opens_block_once(workdir, monkeypatch):
+    history = HistoryManager(hot_days=30)
+    history.append_to_history([_record(99000000 + i, days_ago=40) for i in range(1, 500)]
+                              + [_record(99000600, days_ago=1)])
+    history = HistoryManager(hot_days=30)
+    assert history.find_archived('99000250')['serial_number'] == '99000250'
+
+    read_block = history._read_block
+    monkeypatch.setattr(history, "_read_block", lambda block_file: pytest.fail("blok tekrar açıldı"))
+    assert all(history.in_archive(str(99000000 + i)) for i in range(1, 500))
+    assert not history.in_archive('99000600') and not history.in_archive('99000700')
+    assert history.find_archived('abc') is None
+
+    monkeypatch.setattr(history, "_read_block", read_block)
+    history.append_to_history([_record(99000499, days_ago=40), _record(99000601, days_ago=40)])
+    assert len(history._load_index()) == 2  # Sadece arşivde olmayan yeni blok
+    assert history.in_archive('99000601')
@@ -0,0 +1,66 @@
+import random
+import re
+
+import pytest
+
+from rules import KeywordMatcher, PatternMatcher, get_rules
+
+
+def _old_first(keywords, texts, whole_word=False):
+    """Eski döngü: listede ilk sıradaki, metinlerden birinde geçen kelime"""
+    for i, kw in enumerate(keywords):
+        for text in texts:
+            if not text:
+                continue
+            if whole_word:
+                if re.search(r'\b' + re.escape(kw) + r'\b', text):
+                    return i
+            elif kw in text:
+                return i
+    return None
+
+
+def _texts(keywords, seed):
+    rng = random.Random(seed)
+    fragments = list(keywords) + ["air", "labrador", "superb", "x", "-", " ", "gam", "studios", "ai-"]
+    texts = ["", "cleaner air co", "the lab labs", "gaming studio", "openai gpt", "machine  learning"]
+    for _ in range(300):
+        texts.append("".join(rng.choice(fragments) + rng.choice(["", " ", "-"]) for _ in range(rng.randint(1, 4))))
+    return texts
+
+
+def _lists():
+    rules = get_rules()
+    return [
+        ("ai", rules.ai_keywords, True),
+        ("tech", rules.tech_keywords, False),
+        ("cool", rules.cool_keywords, False),
+        ("boring", rules.boring_patterns, False),
+        ("filter", rules.raw['filter']['keywords'], False),
+    ]
+
+
+@pytest.mark.parametrize("name, keywords, whole_word", _lists(), ids=lambda v: v if isinstance(v, str) else "")
+def test_keyword_matcher_matches_substring_loop(name, keywords, whole_word):
+    matcher = KeywordMatcher(keywords, whole_word=whole_word)
+    texts = _texts(keywords, seed=len(keywords))
+    for text in texts:
+        assert matcher.first(text) == _old_first(keywords, [text], whole_word), text
+    for a, b in zip(texts, reversed(texts)):
+        assert matcher.first(a, b) == _old_first(keywords, [a, b], whole_word), (a, b)
+
+
+def test_keyword_matcher_overlapping_prefixes():
+    matcher = KeywordMatcher(['labs', 'game', 'lab', 'gaming'])
+    assert matcher.first_keyword("my lab") == 'lab'
+    assert matcher.first_keyword("my labs") == 'labs'
+    assert matcher.first_keyword("gaming lab") == 'lab'
+    assert KeywordMatcher([]).first("anything") is None
+
+
+def test_pattern_matcher_uses_list_order():
+    patterns = [r'\bBANK\b', r'\bAI\b', r'CRYPTO']
+    matcher = PatternMatcher(patterns)
+    for text in ["CRYPTO AI BANK", "AI CRYPTO", "NOTHING", "AIR CRYPTOS"]:
+        expected = next((m.group(0) for m in (re.search(p, text) for p in patterns) if m), None)
+        assert matcher.first(text) == expected
@@ -0,0 +1,69 @@
+import json
+import os
+import random
+
+import scoring
+from scoring import calculate_importance_score, score_batch
+
+CACHE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "daily_cache.json")
+
+
+def _records(n=600, seed=3):
+    rng = random.Random(seed)
+    rules = scoring.get_rules()
+    words = (rules.ai_keywords + rules.tech_keywords + rules.cool_keywords + rules.boring_patterns[:10]
+             + ["G00GLE", "NYKEE", "KOKA KOLA", "CHANNEL", "ACME", "ZEN", "x", "AIR", "NONE"])
+    owners = ["Apple Inc.", "Intelligent Systems LLC", "Snap Inc.", "Nike, Inc.", "John Smith",
+              "Smith Law Firm PLLC", "", None, "TESLA, INC.", "Acme Holdings"]
+    with open(CACHE_FILE) as f:  # Gerçek kayıtlar
+        cached = json.load(f)["trademarks"][:200]
+    records = [{k: tm.get(k) for k in ("mark_name", "owner", "goods_services", "international_class")}
+               for tm in cached]
+    for _ in range(n):
+        name = " ".join(rng.choice(words) for _ in range(rng.randint(0, 3)))
+        records.append({
+            "mark_name": rng.choice([name, name.lower(), name.upper(), None]),
+            "owner": rng.choice(owners),
+            "goods_services": rng.choice(["", "Downloadable software", "blockchain wallets", None]),
+            "international_class": rng.choice(["9", "042", "25", 35, None]),
+        })
+    return records
+
+
+def test_score_batch_matches_single_engine():
+    records = _records()
+    scores, reasons = score_batch(records, chunk_size=128)  # Parça sınırları da denensin
+    for tm, score, reason in zip(records, scores.tolist(), reasons):
+        assert (score, reason) == tuple(calculate_importance_score(tm)), tm
+
+
+def test_score_batch_empty():
+    scores, reasons = score_batch([])
+    assert len(scores) == 0 and len(reasons) == 0
+
+
+def _fresh_version(monkeypatch):
+    monkeypatch.setattr(scoring, "_versions", {})
+    return scoring.rules_version()
+
+
+def test_rules_version_tracks_company_order(monkeypatch):
+    base = _fresh_version(monkeypatch)
+    reordered = dict(reversed(list(scoring.KNOWN_COMPANIES.items())))
+    monkeypatch.setattr(scoring, "KNOWN_COMPANIES", reordered)
+    assert _fresh_version(monkeypatch) != base
+
+
+def test_rules_version_tracks_mimic_thresholds(monkeypatch):
+    base = _fresh_version(monkeypatch)
+    monkeypatch.setitem(scoring.phonetic.SCORING_PARAMS, "max_length_diff", 2)
+    assert _fresh_version(monkeypatch) != base
+    monkeypatch.undo()
+    monkeypatch.setitem(scoring.lookalike.SCORING_PARAMS, "min_similarity", 0.5)
+    assert _fresh_version(monkeypatch) != base
+
+
+def test_scoring_params_follow_module_constants():
+    assert scoring.phonetic.SCORING_PARAMS["max_length_diff"] == scoring.phonetic.MAX_LENGTH_DIFF
+    assert scoring.phonetic.SCORING_PARAMS["min_ratio"] == scoring.phonetic.SOUNDALIKE_MIN_RATIO
+    assert scoring.lookalike.SCORING_PARAMS["min_similarity"] == scoring.lookalike.LOOKALIKE_MIN_SIMILARITY
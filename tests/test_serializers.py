@@ -0,0 +1,41 @@
+import json
+
+import pytest
+
+import serializers
+
+SAMPLE = {"serial": "99123456", "score": 42.5, "tags": ["weird", None, True],
+          "owner": "Şirket Ünlü", "nested": {"a": [1, 2, {"b": {}}]}}
+
+
+@pytest.mark.parametrize("fmt", serializers.available_formats())
+def test_round_trip(fmt):
+    ser = serializers.get_serializer(fmt)
+    payload = ser.dumps(SAMPLE)
+    assert ser.loads(payload) == SAMPLE
+
+
+@pytest.mark.parametrize("fmt", [f for f in serializers.available_formats() if not f.startswith("pickle")])
+def test_auto_detect(fmt):
+    assert serializers.loads(serializers.get_serializer(fmt).dumps(SAMPLE)) == SAMPLE
+
+
+@pytest.mark.parametrize("fmt", ["pickle", "pickle+gzip", "pickle+zlib"])
+def test_pickle_needs_explicit_format(fmt):
+    payload = serializers.get_serializer(fmt).dumps(SAMPLE)
+    with pytest.raises(ValueError):
+        serializers.loads(payload)
+    with pytest.raises(ValueError):
+        serializers.get_serializer("json").loads(payload)
+    assert serializers.loads(payload, fmt="pickle") == SAMPLE
+
+
+def test_json_matches_stdlib_key_handling():
+    data = {1: "int", None: "none", 2.5: "float", False: "bool", "big": 2 ** 70}
+    expected = json.loads(json.dumps(data))
+    assert serializers.loads(serializers.get_serializer("json").dumps(data)) == expected
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        serializers.Serializer("yaml")
@@ -0,0 +1,50 @@
+import pytest
+
+from state_snapshot import SnapshotBundle, apply, diff
+
+CASES = [
+    ({"a": 1}, {"a": 1}),
+    ({"a": 1, "b": 2}, {"a": 2, "c": [1]}),                   # set + del + yeni anahtar
+    ({"log": ["l1", "l2", "l3"]}, {"log": ["l2", "l3", "l4"]}),  # baştan düş + sona ekle
+    ({"log": ["l1", "l2"]}, {"log": []}),                        # hepsini düş
+    ({"log": []}, {"log": ["l1"]}),                              # boş listeye ekle
+    ({"log": ["a", "b", "a", "b"]}, {"log": ["a", "b", "c"]}),   # tekrar eden ilk eleman
+    ({"log": ["a", "b"]}, {"log": ["b", "a"]}),                  # sıralama değişti: set
+    ({"f.json": {"trademarks": [{"s": "1"}], "_version": 3}},
+     {"f.json": {"trademarks": [{"s": "1"}, {"s": "2"}], "_version": 4}}),
+]
+
+
+@pytest.mark.parametrize("old, new", CASES)
+def test_diff_apply_round_trip(old, new):
+    op = diff(old, new)
+    if old == new:
+        assert op is None
+    else:
+        assert apply(old, op) == new
+
+
+def test_list_drop_and_append_encoding():
+    op = diff(["l1", "l2", "l3"], ["l2", "l3", "l4", "l5"])
+    assert op == {"list": {"drop": 1, "append": ["l4", "l5"]}}
+
+
+def test_bundle_save_restore(workdir):
+    root = workdir / "root"
+    root.mkdir()
+    (root / "sec_state.json").write_text('{"seen": ["a"]}')
+    (root / "bot_scheduler.log").write_text("line 1\n")
+
+    bundle = SnapshotBundle(str(workdir / "bundle"))
+    bundle.save(str(root))
+    (root / "sec_state.json").write_text('{"seen": ["a", "b"]}')
+    (root / "bot_scheduler.log").write_text("line 1\nline 2\n")
+    manifest = bundle.save(str(root))
+    assert len(manifest["deltas"]) == 1
+
+    restored = workdir / "restored"
+    restored.mkdir()
+    assert bundle.restore(str(restored))
+    assert (restored / "bot_scheduler.log").read_text() == "line 1\nline 2\n"
+    state, _ = bundle.load()
+    assert state["sec_state.json"]["seen"] == ["a", "b"]
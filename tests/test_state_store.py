@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+from state_store import StateStore, StateCorruptError, StaleStateError, VERSION_KEY
+
+
+def _corrupt(path):
+    with open(path, "wb") as f:
+        f.write(b'{"last_serial": 9953')
+
+
+def test_strict_load_raises_on_corrupt_file(workdir):
+    _corrupt("state.json")
+    store = StateStore("state.json", default=lambda: {"last_serial": 1})
+    with pytest.raises(StateCorruptError):
+        store.load(strict=True)
+    assert store.load() == {"last_serial": 1}  # strict=False: varsayılan (Diske yazılmaz)
+
+
+def test_strict_transaction_leaves_corrupt_file_alone(workdir):
+    _corrupt("state.json")
+    store = StateStore("state.json")
+    with pytest.raises(StateCorruptError):
+        with store.transaction(strict=True) as data:
+            data["last_serial"] = 1
+    with open("state.json", "rb") as f:
+        assert f.read() == b'{"last_serial": 9953'
+
+
+def test_non_dict_payload_is_corrupt(workdir):
+    with open("state.json", "w") as f:
+        f.write("[1, 2]")
+    with pytest.raises(StateCorruptError):
+        StateStore("state.json").load(strict=True)
+
+
+def test_missing_file_uses_default(workdir):
+    assert StateStore("missing.json", default=lambda: {"a": 1}).load(strict=True) == {"a": 1}
+
+
+def test_versions_and_stale_write(workdir):
+    store = StateStore("state.json")
+    store.save({"n": 1})
+    with store.transaction() as data:
+        data["n"] += 1
+    data = store.load(strict=True)
+    assert data["n"] == 2 and data[VERSION_KEY] == 2
+
+    with pytest.raises(StaleStateError):
+        store.save({"n": 3}, expected_version=1)
+    store.save({"n": 3}, expected_version=2)
+    assert StateStore.version_of(store.load()) == 3
+    assert [name for name in os.listdir(".") if name.endswith(".tmp")] == []
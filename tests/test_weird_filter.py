@@ -0,0 +1,63 @@
+import json
+import os
+import random
+import re
+
+from weird_filter import WeirdFilter
+
+CACHE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "daily_cache.json")
+
+
+def _old_check(wf, mark_name, goods):
+    """Eski döngü: her kelime için ayrı \\b regex taraması"""
+    score = 0
+    reason = []
+    mark_upper = mark_name.upper()
+    for bad_word in wf.block_keywords:
+        if re.search(r'\b' + re.escape(bad_word) + r'\b', mark_upper):
+            return {"is_weird": False, "score": -100, "reason": "Blocked Content"}
+    for word in wf.funny_keywords:
+        if re.search(r'\b' + re.escape(word) + r'\b', mark_upper):
+            score += 30
+            reason.append(f"Keyword: {word}")
+    if len(mark_upper.split()) > 6:
+        score += 20
+        reason.append("Long Slogan")
+    if "!" in mark_upper or "?" in mark_upper:
+        score += 15
+        reason.append("Punctuation")
+    if re.search(r'(.)\1{2,}', mark_upper):
+        score += 15
+        reason.append("Repeated Chars")
+    return {"is_weird": score >= 40, "score": score, "reason": ", ".join(reason)}
+
+
+def _marks(wf):
+    with open(CACHE_FILE) as f:  # Gerçek kayıtlar
+        marks = [(tm.get("mark_name") or "", tm.get("goods_services") or "") for tm in json.load(f)["trademarks"]]
+    rng = random.Random(11)
+    words = wf.funny_keywords + wf.block_keywords + ["tequila", "Tequila", "TEQUILA", "CAT_DOG", "CATS", "ZOMBIE-APE",
+                                                     "MOOON!", "SEXY", "SKILL", "APE's", "ÇAT", "x", "?", ""]
+    for _ in range(500):
+        name = " ".join(rng.choice(words) for _ in range(rng.randint(0, 8)))
+        marks.append((rng.choice([name, name.lower(), name.title()]), ""))
+    return marks
+
+
+def test_check_weirdness_matches_old_regex_loop():
+    wf = WeirdFilter()
+    marks = _marks(wf)
+    assert len(marks) > 500
+    for mark, goods in marks:
+        assert wf.check_weirdness(mark, goods) == _old_check(wf, mark, goods), mark
+    assert wf.check_batch(marks) == [_old_check(wf, mark, goods) for mark, goods in marks]
+
+
+def test_keyword_edge_cases():
+    wf = WeirdFilter()
+    assert wf.check_weirdness("TEQUILA SUNRISE!!!", "")["reason"] == "Punctuation, Repeated Chars"  # "Tequila" hiç eşleşmez
+    assert wf.check_weirdness("ZOMBIE NINJA", "")["reason"] == "Keyword: ZOMBIE, Keyword: NINJA"    # Liste sırası
+    assert wf.check_weirdness("NINJA ZOMBIE", "")["reason"] == "Keyword: ZOMBIE, Keyword: NINJA"
+    assert wf.check_weirdness("CAT_DOG", "")["score"] == 0                                          # _ kelime karakteri
+    assert wf.check_weirdness("ZOMBIE skill kill", "")["reason"] == "Blocked Content"
+    assert wf.check_batch([(None, None)]) == [_old_check(wf, "", "")]
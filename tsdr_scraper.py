@@ -13,6 +13,10 @@ from datetime import datetime
 from typing import Optional, Dict, List
 import logging
 
+from state_store import StateStore, StateCorruptError
+from companies import COMPANY_MATCHER, INTERESTING_OWNERS
+from rules import get_rules
+
 # Logging setup
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -59,24 +63,32 @@ class TSDRScraper:
         })
         logger.debug(f"New session created with UA: {ua[:30]}...")
         
-    def _load_state(self) -> dict:
-        """Scraper durumunu yükle"""
-        if os.path.exists(STATE_FILE):
-            try:
-                with open(STATE_FILE, 'r') as f:
-                    return json.load(f)
-            except:
-                pass
+    @staticmethod
+    def _default_state() -> dict:
         return {
             "last_serial": 99530000,  # Başlangıç noktası
             "highest_valid_serial": 99530000,
             "last_scan_time": None
         }
+
+    def _load_state(self) -> dict:
+        """Scraper durumunu yükle"""
+        self.state_store = StateStore(STATE_FILE, default=self._default_state)
+        try:
+            return self.state_store.load(strict=True)
+        except StateCorruptError as e:
+            # Sessizce 99530000'e dönmek yerine dur: yanlış serial'dan tarama yapmayalım
+            logger.error(f"❌ Scraper state bozuk, elle kontrol edin: {e}")
+            raise
     
     def _save_state(self):
-        """Scraper durumunu kaydet"""
-        with open(STATE_FILE, 'w') as f:
-            json.dump(self.state, f, indent=2)
+        """Scraper durumunu kaydet (Diğer process'lerin yazdıklarıyla birleştir)"""
+        with self.state_store.transaction() as data:
+            data["last_serial"] = max(data.get("last_serial", 0), self.state.get("last_serial", 0))
+            for key in ("highest_valid_serial", "last_scan_time"):
+                if self.state.get(key) is not None:
+                    data[key] = self.state[key]
+            self.state = dict(data)
     
     def _rate_limit(self):
         """Rate limiting - USPTO'yu aşırı yüklemeden"""
@@ -401,27 +413,10 @@ class TSDRScraper:
 class TrademarkFilter:
     """Trademark filtreleme sınıfı"""
     
-    # İlginç şirketler
-    INTERESTING_OWNERS = [
-        "apple", "google", "meta", "microsoft", "amazon", "nvidia", "tesla",
-        "openai", "anthropic", "alphabet", "facebook", "instagram", "whatsapp",
-        "netflix", "disney", "warner", "sony", "samsung", "huawei", "xiaomi",
-        "tiktok", "bytedance", "twitter", "spacex", "uber", "airbnb", "stripe",
-        "coinbase", "binance", "palantir", "snowflake", "databricks", "figma"
-    ]
-    
-    # İlginç keyword'ler (tam kelime olarak aranacak)
-    INTERESTING_KEYWORDS = [
-        " ai ", " ai", "ai ", "-ai", "ai-",  # AI kelimeleri
-        "gpt", "llm", "neural", "quantum", "blockchain", "crypto", "nft",
-        "metaverse", "robot", "autonomous", "drone",
-        "chatbot", "copilot", "autopilot", "self-driving", "machine learning",
-        "deep learning", "generative", "virtual reality", "augmented reality",
-        "artificial intelligence", "smart", "bot", "assistant", "vision pro"
-    ]
+    # İlginç şirketler (companies.py'deki ortak matcher ile aranır)
+    INTERESTING_OWNERS = INTERESTING_OWNERS
     
-    # Büyük international class'lar (tech/software)
-    INTERESTING_CLASSES = ["009", "035", "042", "038", "041"]  # Software, business, tech
+    # İlginç keyword'ler ve class'lar rules.json'da ("filter" bölümü, derlenmiş matcher)
     
     @classmethod
     def is_interesting(cls, trademark: Dict) -> tuple[bool, str]:
@@ -432,23 +427,25 @@ class TrademarkFilter:
         goods = (trademark.get("goods_services") or "").lower()
         int_class = trademark.get("international_class") or ""
         
-        # Owner kontrolü
-        for company in cls.INTERESTING_OWNERS:
-            if company in owner:
-                return True, f"🏢 {company.title()} şirketinden"
+        # Owner kontrolü (Ortak derlenmiş matcher, tam kelime)
+        company = COMPANY_MATCHER.first(owner, 'interesting_owners')
+        if company:
+            return True, f"🏢 {company.title()} şirketinden"
+        
+        rules = get_rules()
         
         # Keyword kontrolü (mark name'de)
-        for keyword in cls.INTERESTING_KEYWORDS:
-            if keyword in mark_name:
-                return True, f"🔑 '{keyword}' keyword'ü içeriyor"
+        keyword = rules.filter_keywords.first_keyword(mark_name)
+        if keyword:
+            return True, f"🔑 '{keyword}' keyword'ü içeriyor"
         
         # Keyword kontrolü (goods/services'de)
-        for keyword in cls.INTERESTING_KEYWORDS:
-            if keyword in goods:
-                return True, f"📦 '{keyword}' ürün/hizmetinde"
+        keyword = rules.filter_keywords.first_keyword(goods)
+        if keyword:
+            return True, f"📦 '{keyword}' ürün/hizmetinde"
         
         # Class kontrolü
-        if int_class in cls.INTERESTING_CLASSES:
+        if int_class in rules.filter_classes:
             # Sadece class yeterli değil, en az bir ilginç özellik daha olmalı
             if len(mark_name) <= 3 or any(c.isdigit() for c in mark_name):
                 return True, f"🏷️ Tech class ({int_class}) + kısa/unique isim"
@@ -2,6 +2,7 @@ from PIL import Image, ImageDraw, ImageFont
 import textwrap
 import os
 import random
+from functools import lru_cache
 
 # TEMA RENKLERİ (PREMIUM DARK MODE)
 THEME_BG = (15, 23, 42)         # Slate 900 (Deep Navy)
@@ -10,8 +11,11 @@ THEME_ACCENT = (59, 130, 246)   # Blue 500 (Electric Blue)
 THEME_SUBTEXT = (148, 163, 184) # Slate 400 (Light Grey)
 THEME_DIVIDER = (30, 41, 59)    # Slate 800
 
+CARD_SIZE = (1200, 675)         # Twitter önerilen 16:9
+
+@lru_cache(maxsize=32)
 def get_font(size, bold=False):
-    """Sistem fontlarını bul veya varsayılanı kullan"""
+    """Sistem fontlarını bul veya varsayılanı kullan (Boyut + kalınlık başına bir kez yüklenir)"""
     font_paths = [
         # macOS Fonts
         "/System/Library/Fonts/SFNSMono.ttf", # Terminal Font looks cool
@@ -45,6 +49,23 @@ def draw_tech_grid(d, w, h):
     for y in range(0, h, step):
         d.line([(0, y), (w, y)], fill=(30, 41, 59), width=1)
 
+@lru_cache(maxsize=1)
+def _background_template():
+    """Grid + accent bar çizili boş kart (Bir kez çizilir, her kart kopyasını kullanır)"""
+    W, H = CARD_SIZE
+    img = Image.new('RGB', (W, H), color=THEME_BG)
+    d = ImageDraw.Draw(img)
+    
+    # Tech Grid Pattern
+    draw_tech_grid(d, W, H)
+    
+    # Accent Bar (Top Neon Line)
+    d.rectangle([0, 0, W, 8], fill=THEME_ACCENT)
+    
+    # Sol Kenar Çubuğu (Terminal Style)
+    # d.rectangle([0, 0, 20, H], fill=THEME_ACCENT) 
+    return img
+
 def generate_trademark_card(
     mark_name: str, 
     owner: str, 
@@ -57,20 +78,11 @@ def generate_trademark_card(
     Premium Dark Mode Trademark Card
     """
     
-    # 1. Canvas (1200x675)
-    W, H = 1200, 675
-    img = Image.new('RGB', (W, H), color=THEME_BG)
+    # 1-4. Canvas (1200x675) + Tech Grid + Accent Bar: hazır şablonun kopyası
+    W, H = CARD_SIZE
+    img = _background_template().copy()
     d = ImageDraw.Draw(img)
     
-    # 2. Tech Grid Pattern
-    draw_tech_grid(d, W, H)
-    
-    # 3. Accent Bar (Top Neon Line)
-    d.rectangle([0, 0, W, 8], fill=THEME_ACCENT)
-    
-    # 4. Sol Kenar Çubuğu (Terminal Style)
-    # d.rectangle([0, 0, 20, H], fill=THEME_ACCENT) 
-    
     # --- LAYOUT HESAPLAMALARI ---
     padding_x = 80
     current_y = 100
@@ -1,5 +1,14 @@
 
 import re
+from typing import Dict, Iterable, List, Tuple
+
+# Modül seviyesinde bir kere derlenir
+WORD_RE = re.compile(r'\w+')        # \bKELIME\b kontrolü == tam token eşleşmesi
+REPEATED_RE = re.compile(r'(.)\1{2,}')  # 3 kere aynı harf
+
+BLOCKED = "block"
+FUNNY = "funny"
+
 
 class WeirdFilter:
     def __init__(self):
@@ -24,6 +33,14 @@ class WeirdFilter:
             "NAZI", "HITLER", "KKK", "TERROR", "JIHAD", "KILL", "MURDER", "RAPE"
         ]
 
+        # Tek sözlük: token -> (tür, sıra). Mark bir kere tokenize edilir,
+        # yasaklı ve komik kelimeler aynı geçişte bulunur.
+        self._vocab: Dict[str, Tuple[str, int]] = {}
+        for i, word in enumerate(self.funny_keywords):
+            self._vocab.setdefault(word, (FUNNY, i))
+        for word in self.block_keywords:
+            self._vocab[word] = (BLOCKED, 0)
+
     def check_weirdness(self, mark_name: str, goods: str) -> dict:
         """
         Markayı analiz et ve bir 'ariyet skoru' döndür.
@@ -32,17 +49,20 @@ class WeirdFilter:
         score = 0
         reason = []
         mark_upper = mark_name.upper()
-        
-        # 0. Güvenlik Kontrolü (Block List)
-        for bad_word in self.block_keywords:
-            if re.search(r'\b' + re.escape(bad_word) + r'\b', mark_upper):
+
+        # 0 + 1. Tek geçiş: Yasaklı (Block List) ve komik kelimeler
+        funny_hits = []
+        for token in set(WORD_RE.findall(mark_upper)):
+            hit = self._vocab.get(token)
+            if hit is None:
+                continue
+            if hit[0] == BLOCKED:
                 return {"is_weird": False, "score": -100, "reason": "Blocked Content"}
+            funny_hits.append(hit[1])
 
-        # 1. Kelime Eşleşmesi
-        for word in self.funny_keywords:
-            if re.search(r'\b' + re.escape(word) + r'\b', mark_upper):
-                score += 30
-                reason.append(f"Keyword: {word}")
+        for i in sorted(funny_hits):  # Liste sırasıyla (Eski davranış)
+            score += 30
+            reason.append(f"Keyword: {self.funny_keywords[i]}")
 
         # 2. Uzun Slogan Kontrolü (Genelde komik cümleler uzundur)
         # Örn: "I CAME HERE TO DRINK MILK AND KICK ASS" -> 10 kelime
@@ -57,7 +77,7 @@ class WeirdFilter:
             reason.append("Punctuation")
 
         # 4. Tekrar Eden Harfler (örn: WOOOOOW)
-        if re.search(r'(.)\1{2,}', mark_upper): # 3 kere aynı harf
+        if REPEATED_RE.search(mark_upper): # 3 kere aynı harf
             score += 15
             reason.append("Repeated Chars")
 
@@ -69,3 +89,11 @@ class WeirdFilter:
             "score": score,
             "reason": ", ".join(reason)
         }
+
+    def check_batch(self, items: Iterable[Tuple[str, str]]) -> List[dict]:
+        """
+        Çok sayıda (mark_name, goods) çiftini tek çağrıda değerlendir.
+        Sonuçlar check_weirdness ile birebir aynı, aynı sırada.
+        """
+        check = self.check_weirdness
+        return [check(mark or '', goods or '') for mark, goods in items]